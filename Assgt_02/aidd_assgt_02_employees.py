@@ -20,24 +20,40 @@
 # ProjectRegistry instance so that tests and demos are deterministic.
 
 from __future__ import annotations
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from bisect import bisect_right, insort
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import date
 
-CURRENT_YEAR = date.today().year
+TENURE_KICKER_PER_YEAR = 100.0
+
+
+def current_year() -> int:
+    return date.today().year
 
 
 # This class is the tiny “value object” for a project. It’s intentionally small and immutable so we don’t end up with
 # drifting state. The only two things we care about at this level are the project’s human-readable name and its revenue.
 # Validation is straightforward: the name must exist (not blank/whitespace) and revenue cannot be negative. We keep __str__
 # friendly because we’ll probably log or print these in the test driver. Any bigger aggregates (like total revenue) are not
-# this class’s job; those live in the registry below.
+# this class’s job; those live in the registry below. Projects are created by the thousands in bulk loads, so the class
+# uses __slots__ (no per-instance __dict__). Frozen dataclasses set fields through object.__setattr__, and pickling a
+# slotted frozen object needs the same trick, hence the small __getstate__/__setstate__ pair (workers in the payroll runner
+# receive Projects by pickle).
 @dataclass(frozen=True)
 class Project:
+    __slots__ = ("name", "revenue")
     name: str
     revenue: float
 
+    def __getstate__(self) -> Tuple[str, float]:
+        return (self.name, self.revenue)
+
+    def __setstate__(self, state: Tuple[str, float]) -> None:
+        object.__setattr__(self, "name", state[0])
+        object.__setattr__(self, "revenue", state[1])
+
     def __post_init__(self):
         if not self.name or not self.name.strip():
             raise ValueError("Project name cannot be empty.")
@@ -48,40 +64,386 @@ class Project:
         return f"Project(name={self.name}, revenue={self.revenue:,.2f})"
 
 
+# Staff pay has a tenure kicker ($100 per year of service) and the only input is start_year, so everyone who started in the
+# same year (a "cohort") gets exactly the same kicker. This service caches the kicker per cohort for the current year, so a
+# payroll run with a million Staff does one subtraction per distinct start_year and a dict lookup per person. The year is
+# read from a clock (date.today by default) once per run via refresh() (through ProjectRegistry.refresh_tenure), and
+# prepare() then fills in the kicker of every cohort in the run; when the year rolls over the cache is dropped and every
+# cohort's tenure moves up by one, so a long-running service never keeps using last year's value after New Year.
+class TenureService:
+    def __init__(self, clock: Callable[[], date] = date.today) -> None:
+        self._clock = clock
+        self._year = clock().year
+        self._kickers: Dict[Tuple[int, int], float] = {}
+
+    @property
+    def year(self) -> int:
+        return self._year
+
+    def refresh(self) -> bool:
+        # Re-read the clock. Returns True if the year changed (and the cached kickers were thrown away).
+        year = self._clock().year
+        if year == self._year:
+            return False
+        self._year = year
+        self._kickers.clear()
+        return True
+
+    def years_of_service(self, start_year: int, period: Optional[date] = None) -> int:
+        year = self._year if period is None else period.year
+        return max(0, year - start_year)
+
+    @staticmethod
+    def kicker_for(year: int, start_year: int) -> float:
+        # The rule itself, for callers that already know the year (the parallel runner's snapshot).
+        return TENURE_KICKER_PER_YEAR * max(0, year - start_year)
+
+    def kicker(self, start_year: int, period: Optional[date] = None) -> float:
+        year = self._year if period is None else period.year
+        key = (year, start_year)
+        value = self._kickers.get(key)
+        if value is None:
+            value = self.kicker_for(year, start_year)
+            self._kickers[key] = value
+        return value
+
+    def prepare(self, employees: Iterable["Employee"], period: Optional[date] = None) -> Dict[int, float]:
+        # Start-of-run hook: precompute the kicker for every start_year cohort present, so the run itself only does dict
+        # hits. Returns the start_year -> kicker table (the parallel runner ships it to its workers). Call
+        # ProjectRegistry.refresh_tenure() first so the table is for the current year.
+        cohorts = dict.fromkeys(e.start_year for e in employees)  # distinct start years, in first-seen order
+        return {start_year: self.kicker(start_year, period) for start_year in cohorts}
+
+
 # This registry exists so we have one canonical place that knows “what projects exist” and “who the general managers are”.
 # The assignment’s compensation rules depend on the sum of revenue across ALL UNIQUE projects, so we must deduplicate by a
 # normalized key. I’m normalizing by lowercasing and stripping the project name. I’m also capturing every GM that gets
 # created so we can split the 3% pool equally. The policy I’m going with is “first write wins” for project revenue: the
 # first time a project is upserted, that revenue sticks; subsequent upserts with the same normalized name will return the
 # already-existing Project object and ignore the new revenue (if you want “latest write wins” it’s a one-line change, but
-# I’m documenting the current choice so the behavior is predictable).
+# I’m documenting the current choice so the behavior is predictable). GMs are tracked in a dict keyed by emp_id rather than
+# a list: a dict keeps insertion order like the list did, but membership checks are hashed instead of a linear `__eq__` scan,
+# so registering N GMs is O(N) overall and the same person can never be counted twice in the pool split.
+#
+# The registry also owns the many-to-many allocation index (who works on which project, and for what percentage of their
+# time/credit). It is kept in both directions, project -> {emp_id: share} and emp_id -> {project: share}, so "who is on
+# project X" and "what is Y attributed" are both dict lookups. On top of that sits a small compensation cache: every cached
+# number remembers which project keys it was derived from, so when one project's revenue changes we only throw away the
+# entries for the people on that project (plus the GMs, whose pool depends on total revenue) instead of re-running payroll.
+#
+# Revenue is also versioned. Every project keeps a sorted list of effective dates with a parallel list of revenues, and an
+# "as of" lookup is a bisect over the dates (the version in force is the last one that starts on or before the period). The
+# Project stored in _projects is the version in force today, so every period-less call behaves exactly as before and a
+# version dated in the future only counts for periods on or after its date. For period
+# runs we build a per-period aggregate (revenue per project + total) once and reuse it for every employee in that period;
+# a revenue change only drops the aggregates for periods on or after its effective date.
 class ProjectRegistry:
     def __init__(self) -> None:
         self._projects: Dict[str, Project] = {}
-        self._general_managers: List["GeneralManager"] = []
+        self._general_managers: Dict[str, "GeneralManager"] = {}
+        self._members_by_project: Dict[str, Dict[str, float]] = {}
+        self._projects_by_member: Dict[str, Dict[str, float]] = {}
+        self._comp_cache: Dict[str, float] = {}
+        self._comp_deps: Dict[str, Set[str]] = {}
+        self._comp_dependents: Dict[str, Set[str]] = {}
+        self._cached_gms: Set[str] = set()
+        self._version_dates: Dict[str, List[date]] = {}
+        self._version_revenue: Dict[str, List[float]] = {}
+        self._period_aggregates: Dict[date, Tuple[Dict[str, float], float]] = {}
+        self.tenure = TenureService()
 
     @staticmethod
     def _key(name: str) -> str:
         return name.strip().lower()
 
-    def upsert_project(self, name: str, revenue: float) -> Project:
+    def upsert_project(self, name: str, revenue: float, effective: date = date.min) -> Project:
         # Insert-or-return behavior. If we’ve already seen this normalized name, we just return the existing Project so we
-        # don’t accidentally double-count revenue. Otherwise, we create a new immutable Project and store it.
+        # don’t accidentally double-count revenue. Otherwise, we create a new immutable Project and store it. The first
+        # version is effective from `effective` (by default "since forever"); periods before that see the project at 0.
         k = self._key(name)
         if k in self._projects:
             return self._projects[k]
+        proj = self._insert_project(k, name, revenue, effective)
+        self._invalidate_gms()  # a new project grows total revenue, so every GM's pool share moves
+        return proj
+
+    def upsert_projects(self, items: Iterable[Tuple[str, float]], effective: date = date.min) -> List[Project]:
+        # Batched upsert for loaders: same first-write-wins dedupe on the normalized key, but the GM cache and the period
+        # aggregates are invalidated once per batch instead of once per project.
+        out: List[Project] = []
+        inserted = False
+        for name, revenue in items:
+            k = self._key(name)
+            proj = self._projects.get(k)
+            if proj is None:
+                proj = self._insert_project(k, name, revenue, effective)
+                inserted = True
+            out.append(proj)
+        if inserted:
+            self._invalidate_gms()
+        return out
+
+    def _insert_project(self, k: str, name: str, revenue: float, effective: date) -> Project:
         proj = Project(name=name.strip(), revenue=float(revenue))
+        self._version_dates[k] = [effective]
+        self._version_revenue[k] = [proj.revenue]
+        if effective > date.today():
+            proj = Project(name=proj.name, revenue=0.0)  # not in force yet: today's view sees the project at 0
         self._projects[k] = proj
+        self._drop_period_aggregates(effective)
         return proj
 
+    @property
+    def projects(self) -> List[Project]:
+        # Every unique project (today's revenue), in the order they were first seen.
+        return list(self._projects.values())
+
+    def set_project_revenue(self, name: str, revenue: float, effective: Optional[date] = None) -> Set[str]:
+        # The explicit "latest write wins" path. Without `effective` we overwrite the version in force today in place (or,
+        # when every version starts in the future, add one starting today); with it we record (or replace) the version
+        # starting on that date. Project stays frozen, so if today's revenue changed we swap in a new instance under the
+        # same key and only invalidate the cached compensation of people whose numbers depend on this project. Returns the
+        # emp_ids that were invalidated so a caller can recompute just those.
+        k = self._key(name)
+        if k not in self._projects:
+            raise KeyError(f"Unknown project: {name!r}")
+        revenue = Project(name=self._projects[k].name, revenue=float(revenue)).revenue  # reuse Project's validation
+        dates, revenues = self._version_dates[k], self._version_revenue[k]
+        if effective is None:
+            today = date.today()
+            i = bisect_right(dates, today) - 1
+            effective = dates[i] if i >= 0 else today  # nothing in force yet: start a version today, keep the future one
+        i = bisect_right(dates, effective) - 1
+        if i >= 0 and dates[i] == effective:
+            revenues[i] = revenue
+        else:
+            insort(dates, effective)
+            revenues.insert(i + 1, revenue)
+        self._drop_period_aggregates(effective)
+        current = self.revenue_as_of(k, date.today())
+        if current == self._projects[k].revenue:
+            return set()  # only history (or the future) changed; the current view (and its caches) is untouched
+        self._projects[k] = Project(name=self._projects[k].name, revenue=current)
+        affected = set(self._comp_dependents.get(k, ())) | self._cached_gms
+        for emp_id in affected:
+            self.invalidate(emp_id)
+        return affected
+
+    def project_history(self, name: str) -> List[Tuple[date, float]]:
+        # (effective date, revenue) pairs, oldest first.
+        k = self._key(name)
+        return list(zip(self._version_dates.get(k, []), self._version_revenue.get(k, [])))
+
+    def revenue_as_of(self, name: str, period: date) -> float:
+        # Bisect for the version in force on `period`. A project that hadn't started yet contributes nothing.
+        k = self._key(name)
+        dates = self._version_dates.get(k)
+        if not dates:
+            raise KeyError(f"Unknown project: {name!r}")
+        i = bisect_right(dates, period) - 1
+        return self._version_revenue[k][i] if i >= 0 else 0.0
+
+    def _aggregates(self, period: date) -> Tuple[Dict[str, float], float]:
+        # Revenue per project key plus the total, as of one period. Built once and reused for every employee in the run.
+        agg = self._period_aggregates.get(period)
+        if agg is None:
+            by_key = {k: self.revenue_as_of(k, period) for k in self._projects}
+            agg = (by_key, sum(by_key.values()))
+            self._period_aggregates[period] = agg
+        return agg
+
+    def _drop_period_aggregates(self, effective: date) -> None:
+        # A version starting on `effective` can only change periods on or after that date.
+        for period in [p for p in self._period_aggregates if p >= effective]:
+            del self._period_aggregates[period]
+
+    def revenue_by_project(self, period: Optional[date] = None) -> Dict[str, float]:
+        # Normalized project key -> revenue (in force today, or as of `period`). A copy, safe to hand to other processes.
+        if period is None:
+            return {k: p.revenue for k, p in self._projects.items()}
+        return dict(self._aggregates(period)[0])
+
+    def allocation_index(self) -> Dict[str, Dict[str, float]]:
+        # emp_id -> {project key: share (0-1)}. A deep-enough copy that callers can't mutate the registry's index.
+        return {emp_id: dict(mine) for emp_id, mine in self._projects_by_member.items()}
+
+    def total_revenue_as_of(self, period: Optional[date] = None) -> float:
+        if period is None:
+            return self.total_revenue
+        return self._aggregates(period)[1]
+
+    def project_revenue(self, project: Project, period: Optional[date] = None) -> float:
+        # Employees hold Project objects, which are frozen snapshots. If the registry knows a newer revenue for the same
+        # normalized name we use that; a project that never went through the registry just reports its own revenue.
+        k = self._key(project.name)
+        current = self._projects.get(k)
+        if current is None:
+            return project.revenue
+        if period is None:
+            return current.revenue
+        return self._aggregates(period)[0][k]
+
+    def run_payroll(self, employees: Iterable["Employee"], periods: Iterable[date]) -> Dict[date, Dict[str, float]]:
+        # Multi-period payroll: period -> {emp_id: compensation}. Each period's aggregates are built once (or reused from
+        # an earlier run) and shared by every employee, so N employees x P periods does P aggregate builds, not N x P.
+        employees = list(employees)
+        self.refresh_tenure()
+        out: Dict[date, Dict[str, float]] = {}
+        for period in periods:
+            self.tenure.prepare(employees, period)
+            out[period] = {e.emp_id: e.calculate_compensation(self, period) for e in employees}
+        return out
+
     def get_project(self, name: str) -> Optional[Project]:
-        # Convenience for drivers: fetch by name without worrying about case or leading/trailing spaces.
+        # Convenience for drivers: fetch by name without worrying about case or leading/trailing spaces. This (or
+        # upsert_project) is also how Project instances get shared: the storage loaders, the interactive create_* helpers,
+        # the demo and the synthetic org all resolve names here, so every employee on a project holds the registry's one
+        # instance for that key instead of a copy.
         return self._projects.get(self._key(name))
 
-    def register_gm(self, gm: "GeneralManager") -> None:
-        # The GM list is purely for counting (so we can split the 3% pool fairly). We also defend against duplicates.
-        if gm not in self._general_managers:
-            self._general_managers.append(gm)
+    def register_gm(self, gm: "GeneralManager") -> bool:
+        # The GM map is purely for counting (so we can split the 3% pool fairly). Keying by emp_id defends against
+        # duplicates in O(1). Returns True only when the GM was newly added, so callers can tell a re-register apart.
+        if gm.emp_id in self._general_managers:
+            return False
+        self._general_managers[gm.emp_id] = gm
+        self._invalidate_gms()
+        return True
+
+    def register_gms(self, gms: Iterable["GeneralManager"]) -> int:
+        # Bulk version for loaders/demos. Returns how many were actually new (duplicates are skipped, not errors).
+        added = 0
+        for gm in gms:
+            if self.register_gm(gm):
+                added += 1
+        return added
+
+    def deregister_gm(self, gm: "GeneralManager") -> bool:
+        # Removing a GM shrinks the pool split for everyone else. Returns False if the GM was never registered. We only
+        # remove the exact object we were given so a different person reusing the same emp_id can't knock someone out.
+        current = self._general_managers.get(gm.emp_id)
+        if current is not gm:
+            return False
+        del self._general_managers[gm.emp_id]
+        self._invalidate_gms()
+        return True
+
+    def is_registered_gm(self, gm: "GeneralManager") -> bool:
+        return self._general_managers.get(gm.emp_id) is gm
+
+    @property
+    def general_managers(self) -> List["GeneralManager"]:
+        # Registration order is preserved (dicts keep insertion order). Copy so callers can't mutate the registry.
+        return list(self._general_managers.values())
+
+    def allocate(self, employee: "Employee", project_name: str, percent: float) -> None:
+        # Put an employee on a registered project for `percent` (0-100] of their attribution. Calling it again for the
+        # same pair replaces the old percentage. An employee's allocations can't add up to more than 100%.
+        k = self._key(project_name)
+        if k not in self._projects:
+            raise KeyError(f"Unknown project: {project_name!r}")
+        percent = float(percent)
+        if percent <= 0 or percent > 100:
+            raise ValueError("Allocation percent must be in (0, 100].")
+        share = percent / 100.0
+        current = self._projects_by_member.get(employee.emp_id, {})
+        if sum(v for pk, v in current.items() if pk != k) + share > 1.0 + 1e-9:
+            raise ValueError(f"Allocations for {employee.emp_id} would exceed 100%.")
+        self._projects_by_member.setdefault(employee.emp_id, {})[k] = share
+        self._members_by_project.setdefault(k, {})[employee.emp_id] = share
+        self.invalidate(employee.emp_id)
+
+    def unallocate(self, employee: "Employee", project_name: str) -> bool:
+        k = self._key(project_name)
+        mine = self._projects_by_member.get(employee.emp_id)
+        if not mine or k not in mine:
+            return False
+        del mine[k]
+        if not mine:
+            del self._projects_by_member[employee.emp_id]
+        members = self._members_by_project[k]
+        del members[employee.emp_id]
+        if not members:
+            del self._members_by_project[k]
+        self.invalidate(employee.emp_id)
+        return True
+
+    def allocations_for(self, employee: "Employee") -> Dict[str, float]:
+        # Project display name -> percent, in the order the allocations were made.
+        return {self._projects[k].name: share * 100.0
+                for k, share in self._projects_by_member.get(employee.emp_id, {}).items()}
+
+    def members_of(self, project_name: str) -> Dict[str, float]:
+        # emp_id -> percent for everyone explicitly allocated to this project.
+        return {emp_id: share * 100.0
+                for emp_id, share in self._members_by_project.get(self._key(project_name), {}).items()}
+
+    def attributed_revenue(self, employee: "Employee", default: Optional[Project] = None,
+                           period: Optional[date] = None) -> float:
+        # Revenue credited to one employee: the share-weighted sum over their allocations. Employees with no explicit
+        # allocations fall back to 100% of their single assigned project, which is exactly the original assignment rule.
+        mine = self._projects_by_member.get(employee.emp_id)
+        if mine:
+            if period is None:
+                return sum(share * self._projects[k].revenue for k, share in mine.items())
+            by_key = self._aggregates(period)[0]
+            return sum(share * by_key[k] for k, share in mine.items())
+        if default is None:
+            return 0.0
+        return self.project_revenue(default, period)
+
+    def compensation(self, employee: "Employee") -> float:
+        # Cached calculate_compensation. The cache only tracks registry-side inputs (revenue, allocations, GM count);
+        # if you edit something the employee owns (e.g. base_salary) call invalidate(emp_id) afterwards.
+        self.refresh_tenure()
+        emp_id = employee.emp_id
+        cached = self._comp_cache.get(emp_id)
+        if cached is not None:
+            return cached
+        value = employee.calculate_compensation(self)
+        self._comp_cache[emp_id] = value
+        if isinstance(employee, GeneralManager):
+            self._cached_gms.add(emp_id)
+        mine = self._projects_by_member.get(emp_id)
+        if mine:
+            deps = set(mine)
+        else:
+            project = getattr(employee, "project", None)
+            deps = {self._key(project.name)} if project is not None else set()
+        self._comp_deps[emp_id] = deps
+        for k in deps:
+            self._comp_dependents.setdefault(k, set()).add(emp_id)
+        return value
+
+    def invalidate(self, emp_id: str) -> None:
+        self._comp_cache.pop(emp_id, None)
+        for k in self._comp_deps.pop(emp_id, ()):
+            dependents = self._comp_dependents.get(k)
+            if dependents is not None:
+                dependents.discard(emp_id)
+        self._cached_gms.discard(emp_id)
+
+    def clear_compensation_cache(self) -> None:
+        self._comp_cache.clear()
+        self._comp_deps.clear()
+        self._comp_dependents.clear()
+        self._cached_gms.clear()
+
+    def refresh_tenure(self) -> bool:
+        # The one place that re-reads the tenure clock. Every entry point (compensation, run_payroll, the report pipeline,
+        # the parallel snapshot) goes through here, so whoever notices a year rollover first also drops the cached
+        # compensation; otherwise compensation() would keep serving last year's Staff pay. Returns True on a rollover.
+        if not self.tenure.refresh():
+            return False
+        self.clear_compensation_cache()  # new year: every Staff tenure kicker moved
+        return True
+
+    def tenure_kicker(self, start_year: int, period: Optional[date] = None) -> float:
+        return self.tenure.kicker(start_year, period)
+
+    def _invalidate_gms(self) -> None:
+        for emp_id in list(self._cached_gms):
+            self.invalidate(emp_id)
 
     @property
     def total_revenue(self) -> float:
@@ -90,24 +452,30 @@ class ProjectRegistry:
 
     @property
     def gm_count(self) -> int:
-        # Simple count for splitting the pool. If nobody registered, the GM code will defensively treat it as 1.
+        # Simple O(1) count for splitting the pool. If nobody registered, the GM code will defensively treat it as 1.
         return len(self._general_managers)
 
 
 # The Employee superclass carries only the fields and behaviors that truly every employee shares: first name, last name,
 # employee id, phone (stored in digits-only form to avoid formatting problems), and start year. It also owns simple shared
-# utilities: normalizing phone numbers and computing years of service relative to CURRENT_YEAR. We do not put base salary or
+# utilities: normalizing phone numbers and computing years of service relative to the current year. We do not put base salary or
 # project references here because not all employees have those. This class is abstract because each subtype is required to
 # implement its own compensation logic and its own string representation. Keeping the API uniform lets us throw instances
 # of any subclass into a single list and still iterate and call the same methods (polymorphism). The little helper
 # compensation_summary is there simply so you can print a consistent report line without repeating formatting everywhere.
 class Employee(ABC):
+    # Short role tag used in report lines and exported records ("GM", "PM", ...). Each subclass sets its own.
+    role_tag = ""
+    # Every class in the hierarchy declares __slots__, so instances carry fixed attribute slots instead of a __dict__.
+    # That is most of the per-employee memory on big org charts. ABC itself already declares empty slots.
+    __slots__ = ("first_name", "last_name", "emp_id", "_phone", "start_year")
+
     def __init__(self, first_name: str, last_name: str, emp_id: str, phone: str, start_year: int) -> None:
         self.first_name = first_name.strip()
         self.last_name = last_name.strip()
         self.emp_id = emp_id.strip()
         self._phone = self._normalize_phone(phone)
-        if start_year > CURRENT_YEAR:
+        if start_year > current_year():
             raise ValueError("start_year cannot be in the future.")
         self.start_year = int(start_year)
 
@@ -129,18 +497,23 @@ class Employee(ABC):
 
     @staticmethod
     def _normalize_phone(v: str) -> str:
-        # Strip everything except digits. Keeps the data layer clean and comparable.
-        return "".join(ch for ch in str(v) if ch.isdigit())
-
-    @property
-    def years_of_service(self) -> int:
-        # Used by the Staff compensation rule and handy for reporting anywhere else.
-        return max(0, CURRENT_YEAR - self.start_year)
+        # Strip everything except digits. Keeps the data layer clean and comparable. Phones coming back from storage are
+        # already digits-only, so bulk loads take the cheap isdigit() path instead of rebuilding the string char by char.
+        v = str(v)
+        if v.isdigit():
+            return v
+        return "".join(ch for ch in v if ch.isdigit())
+
+    def years_of_service(self, registry: ProjectRegistry, period: Optional[date] = None) -> int:
+        # Handy for reporting. Measured against the year the registry's TenureService already holds (or a payroll period's
+        # year), so a report over a big org chart doesn't ask the system clock once per employee.
+        return registry.tenure.years_of_service(self.start_year, period)
 
     @abstractmethod
-    def calculate_compensation(self, registry: ProjectRegistry) -> float:
+    def calculate_compensation(self, registry: ProjectRegistry, period: Optional[date] = None) -> float:
         # Every subclass has a different rule, so the base class just defines the contract.
-        # The registry gives access to the “system” state (unique projects, total revenue, GM count).
+        # The registry gives access to the “system” state (unique projects, total revenue, GM count). `period` picks the
+        # revenue versions in force on that date; None means the revenue in force today.
         ...
 
     @abstractmethod
@@ -148,9 +521,14 @@ class Employee(ABC):
         # Give each subclass control of how it should appear in a report or log line.
         ...
 
-    def compensation_summary(self, registry: ProjectRegistry) -> str:
+    @property
+    def project_label(self) -> str:
+        # Human-readable project column for reports/exports. Employees without projects (Staff) leave it blank.
+        return ""
+
+    def compensation_summary(self, registry: ProjectRegistry, period: Optional[date] = None) -> str:
         # A friendly, uniform one-liner for reports that depends on the subclass calculation.
-        total = self.calculate_compensation(registry)
+        total = self.calculate_compensation(registry, period)
         return f"{self} | Total Compensation: ${total:,.2f}"
 
 
@@ -160,33 +538,48 @@ class Employee(ABC):
 # revenue and the count of registered GMs. If a driver forgets to register a GM, we still guard against division by zero
 # (treat it as one) so the demo code won’t blow up; that said, registering GMs is expected usage.
 class GeneralManager(Employee):
+    role_tag = "GM"
+    POOL_RATE = 0.03  # share of total unique-project revenue that forms the GM pool
+    __slots__ = ("_projects", "_project_label")
+
     def __init__(self, first_name: str, last_name: str, emp_id: str, phone: str, start_year: int,
-                 projects: List[Project]) -> None:
+                 projects: Sequence[Project]) -> None:
         super().__init__(first_name, last_name, emp_id, phone, start_year)
         if not projects:
             raise ValueError("GeneralManager must be associated with at least one project.")
-        self._projects = list(projects)
+        # A tuple is immutable, so we can hand it out directly instead of copying on every access.
+        self._projects: Tuple[Project, ...] = tuple(projects)
+        # The project list never changes after construction and Project names are frozen, so the joined name string is
+        # built once here instead of on every report line.
+        self._project_label = ", ".join(p.name for p in self._projects)
 
     @property
-    def projects(self) -> List[Project]:
-        # Defensive copy because callers shouldn’t be able to mutate our internal list.
-        return list(self._projects)
+    def project_label(self) -> str:
+        return self._project_label
 
-    def calculate_compensation(self, registry: ProjectRegistry) -> float:
-        pool = 0.03 * registry.total_revenue
+    @property
+    def projects(self) -> Tuple[Project, ...]:
+        # Read-only view: callers can iterate and index but can’t mutate our internal sequence.
+        return self._projects
+
+    def calculate_compensation(self, registry: ProjectRegistry, period: Optional[date] = None) -> float:
+        pool = self.POOL_RATE * registry.total_revenue_as_of(period)
         n = max(1, registry.gm_count)
         return pool / n
 
     def __str__(self) -> str:
-        pnames = ", ".join(p.name for p in self._projects)
-        return f"[GM] {self.first_name} {self.last_name} (ID {self.emp_id}) | Projects: {pnames}"
+        return f"[GM] {self.first_name} {self.last_name} (ID {self.emp_id}) | Projects: {self._project_label}"
 
 
-# A Project Manager is tied to exactly one project. Their compensation is 5% of that project’s revenue. The registry is not
-# strictly necessary for this math since we read from the one project object we already hold, but we keep the same signature
-# to maintain a consistent API across all subclasses. The driver code becomes trivial when every employee exposes the same
-# method and return type.
+# A Project Manager is tied to exactly one project. Their compensation is 5% of that project’s revenue. We ask the registry
+# for the revenue rather than reading the Project we hold, because the registry is where revenue updates and multi-project
+# allocations live (a PM allocated 60/40 across two projects gets 5% of the weighted sum). Without allocations the result is
+# identical to the original one-project rule. The driver code stays trivial because every employee exposes the same method.
 class ProjectManager(Employee):
+    role_tag = "PM"
+    REVENUE_RATE = 0.05
+    __slots__ = ("_project",)
+
     def __init__(self, first_name: str, last_name: str, emp_id: str, phone: str, start_year: int,
                  project: Project) -> None:
         super().__init__(first_name, last_name, emp_id, phone, start_year)
@@ -196,8 +589,13 @@ class ProjectManager(Employee):
     def project(self) -> Project:
         return self._project
 
-    def calculate_compensation(self, registry: ProjectRegistry) -> float:
-        return 0.05 * self._project.revenue
+    @property
+    def project_label(self) -> str:
+        return self._project.name
+
+    def calculate_compensation(self, registry: ProjectRegistry, period: Optional[date] = None) -> float:
+        # 5% of attributed revenue: their one project by default, or their share-weighted allocations if they have any.
+        return self.REVENUE_RATE * registry.attributed_revenue(self, self._project, period)
 
     def __str__(self) -> str:
         return f"[PM] {self.first_name} {self.last_name} (ID {self.emp_id}) | Project: {self._project.name}"
@@ -205,9 +603,13 @@ class ProjectManager(Employee):
 
 # A Programmer is also tied to exactly one project, but unlike the PM, there is a base salary involved. The rule is:
 # base_salary + 1% of that project’s revenue. Base salary is guarded through a property so we can enforce non-negative
-# values at the boundary. Again, we keep the same method signature for polymorphism even though the registry is not needed
-# for the math here.
+# values at the boundary. Like the PM, the project revenue part goes through the registry so allocations and revenue updates
+# are honored.
 class Programmer(Employee):
+    role_tag = "Programmer"
+    REVENUE_RATE = 0.01
+    __slots__ = ("_base_salary", "_project")
+
     def __init__(self, first_name: str, last_name: str, emp_id: str, phone: str, start_year: int,
                  base_salary: float, project: Project) -> None:
         super().__init__(first_name, last_name, emp_id, phone, start_year)
@@ -229,8 +631,12 @@ class Programmer(Employee):
     def project(self) -> Project:
         return self._project
 
-    def calculate_compensation(self, registry: ProjectRegistry) -> float:
-        return self._base_salary + 0.01 * self._project.revenue
+    @property
+    def project_label(self) -> str:
+        return self._project.name
+
+    def calculate_compensation(self, registry: ProjectRegistry, period: Optional[date] = None) -> float:
+        return self._base_salary + self.REVENUE_RATE * registry.attributed_revenue(self, self._project, period)
 
     def __str__(self) -> str:
         return (f"[Programmer] {self.first_name} {self.last_name} (ID {self.emp_id}) | "
@@ -238,9 +644,13 @@ class Programmer(Employee):
 
 
 # Staff are the simplest case: there is no project association at all. Their compensation is their base salary plus a small
-# tenure kicker: $100 for every year of service (computed from CURRENT_YEAR − start_year, never negative). We validate base
-# salary the same way we did for Programmer so bad inputs get caught early.
+# tenure kicker: $100 for every year of service (current year − start_year, never negative), looked up per start_year
+# cohort from the registry's TenureService. We validate base salary the same way we did for Programmer so bad inputs get
+# caught early.
 class Staff(Employee):
+    role_tag = "Staff"
+    __slots__ = ("_base_salary",)
+
     def __init__(self, first_name: str, last_name: str, emp_id: str, phone: str, start_year: int,
                  base_salary: float) -> None:
         super().__init__(first_name, last_name, emp_id, phone, start_year)
@@ -257,8 +667,8 @@ class Staff(Employee):
             raise ValueError("Base salary cannot be negative.")
         self._base_salary = v
 
-    def calculate_compensation(self, registry: ProjectRegistry) -> float:
-        return self._base_salary + (100.0 * self.years_of_service)
+    def calculate_compensation(self, registry: ProjectRegistry, period: Optional[date] = None) -> float:
+        return self._base_salary + registry.tenure_kicker(self.start_year, period)
 
     def __str__(self) -> str:
         return f"[Staff] {self.first_name} {self.last_name} (ID {self.emp_id}) | Base ${self._base_salary:,.2f}"
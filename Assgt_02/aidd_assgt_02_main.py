@@ -22,11 +22,14 @@
 #   I’ll do that every time we create a GM in this script to avoid surprises.
 # - Input validation should be friendly but not overbearing: retry on empty strings or bad numbers; keep prompts concise.
 
-from typing import List
+import argparse
+from typing import List, Optional
 from aidd_assgt_02_employees import (
     ProjectRegistry, Project,
     GeneralManager, ProjectManager, Programmer, Staff
 )
+import aidd_assgt_02_storage as storage
+from aidd_assgt_02_report import CsvSink, JsonlSink, TerminalSink, write_report
 
 
 # I’m going to add a couple of tiny input helpers so the main flow doesn’t drown in try/except boilerplate. The idea is:
@@ -193,23 +196,42 @@ def add_demo(registry: ProjectRegistry) -> List:
 
 # The reporting function is intentionally boring (and that’s good). The whole point of the OO design is that the loop here
 # is trivial: for each employee, call the same method and print. The registry is shared to keep the compensation logic
-# consistent. I’m also printing the aggregate registry stats at the end so it’s obvious how the GM pool is derived.
-def print_comp_report(employees: List, registry: ProjectRegistry) -> None:
+# consistent. I’m also printing the aggregate registry stats at the end so it’s obvious how the GM pool is derived. For big
+# lists, workers > 1 has the process-pool runner in aidd_assgt_02_payroll.py compute the numbers (in order). Either way the
+# report streams through aidd_assgt_02_report.py instead of one print() per line, which also lets the same pass write
+# CSV/JSONL copies of the report and add up the payroll totals.
+def print_comp_report(employees: List, registry: ProjectRegistry, workers: int = 1,
+                      csv_path: Optional[str] = None, jsonl_path: Optional[str] = None) -> None:
     print("\n================ Compensation Report ================")
-    for e in employees:
-        # Using the convenience wrapper on Employee to keep formatting consistent.
-        print(e.compensation_summary(registry))
+    sinks = [TerminalSink()]
+    if csv_path:
+        sinks.append(CsvSink(csv_path))
+    if jsonl_path:
+        sinks.append(JsonlSink(jsonl_path))
+    totals = write_report(employees, registry, sinks, workers=workers)
     print("====================================================\n")
     print(f"Total unique project revenue in registry: ${registry.total_revenue:,.2f}")
     print(f"Registered General Managers: {registry.gm_count}")
+    print(f"Employees reported: {totals.count:,} | Total payroll: ${totals.total_compensation:,.2f}")
 
 
 # The main loop ties everything together. We create the registry, keep a single list, present a simple menu, and let the
 # user either add employees one-by-one or drop in the demo. When they quit, we ensure there’s at least one of each type by
 # auto-adding the demo if the list is empty (that way the assignment’s “print all” requirement is always satisfied).
 def main() -> None:
+    parser = argparse.ArgumentParser(description="KSD personnel prototype")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to compute the compensation report")
+    parser.add_argument("--load", metavar="PATH", help="start from saved data (CSV directory, .jsonl, or .db)")
+    parser.add_argument("--save", metavar="PATH", help="save projects and employees here before the report")
+    parser.add_argument("--report-csv", metavar="PATH", help="also write the compensation report as CSV")
+    parser.add_argument("--report-jsonl", metavar="PATH", help="also write the compensation report as JSON Lines")
+    args = parser.parse_args()
+
     registry = ProjectRegistry()
     employees: List = []
+    if args.load:
+        registry, employees = storage.load(args.load)
+        print(f"Loaded {len(employees):,} employees and {len(registry.projects):,} projects from {args.load}")
 
     try:
         while True:
@@ -236,7 +258,11 @@ def main() -> None:
         print("\nNo employees created. Adding demo dataset to satisfy assignment criteria.")
         employees.extend(add_demo(registry))
 
-    print_comp_report(employees, registry)
+    if args.save:
+        storage.save(args.save, registry, employees)
+        print(f"Saved {len(employees):,} employees to {args.save}")
+
+    print_comp_report(employees, registry, workers=args.workers, csv_path=args.report_csv, jsonl_path=args.report_jsonl)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+# Parallel payroll runner for the KSD personnel prototype. The report in aidd_assgt_02_main.py is one loop in one process,
+# which is perfect for the demo but slow once the employee list gets into the hundreds of thousands. The compensation math
+# itself is embarrassingly parallel: every employee only needs a handful of registry-wide numbers (total revenue, GM count,
+# revenue per project, and the allocation shares). So the plan here is:
+# - take ONE snapshot of those aggregates up front (RegistrySnapshot), so workers never touch the live registry,
+# - ship the snapshot to each worker process once (pool initializer), not once per chunk,
+# - cut the employee list into contiguous shards, let the pool compute + format each shard,
+# - and stream the formatted lines back in the original order (executor.map preserves order).
+# With workers=1 we skip the pool entirely so small runs don't pay process start-up costs.
+#
+# Run `python aidd_assgt_02_payroll.py --employees 200000 --max-workers 8` for a scaling benchmark (1..N workers).
+
+from __future__ import annotations
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aidd_assgt_02_employees import (
+    ProjectRegistry, Project, Employee, TenureService,
+    GeneralManager, ProjectManager, Programmer, Staff
+)
+
+DEFAULT_CHUNK_SIZE = 5_000
+
+
+# A frozen, picklable stand-in for ProjectRegistry. It implements exactly the methods the employee classes call from
+# calculate_compensation (total_revenue_as_of, gm_count, attributed_revenue, project_revenue, tenure_kicker), so the same
+# compensation code runs unchanged inside a worker. The snapshot is pinned to one period (and one tenure year); the `period`
+# arguments are accepted only so the signatures line up with the real registry. Tenure travels as plain data, the resolved
+# year plus the start_year -> kicker table of the employees in the run, never the TenureService (whose clock may be a
+# lambda, which can't be pickled).
+class RegistrySnapshot:
+    def __init__(self, registry: ProjectRegistry, period: Optional[date] = None,
+                 employees: Sequence[Employee] = ()) -> None:
+        self.period = period
+        self.revenue_by_key: Dict[str, float] = registry.revenue_by_project(period)
+        self.total_revenue: float = sum(self.revenue_by_key.values())
+        self.gm_count: int = registry.gm_count
+        self.allocations: Dict[str, Dict[str, float]] = registry.allocation_index()
+        registry.refresh_tenure()
+        self.tenure_year: int = period.year if period is not None else registry.tenure.year
+        self.kickers: Dict[int, float] = registry.tenure.prepare(employees, period)
+
+    def total_revenue_as_of(self, period: Optional[date] = None) -> float:
+        return self.total_revenue
+
+    def project_revenue(self, project: Project, period: Optional[date] = None) -> float:
+        return self.revenue_by_key.get(ProjectRegistry._key(project.name), project.revenue)
+
+    def tenure_kicker(self, start_year: int, period: Optional[date] = None) -> float:
+        value = self.kickers.get(start_year)
+        if value is None:  # a cohort the snapshot wasn't built with
+            value = self.kickers[start_year] = TenureService.kicker_for(self.tenure_year, start_year)
+        return value
+
+    def attributed_revenue(self, employee: Employee, default: Optional[Project] = None,
+                           period: Optional[date] = None) -> float:
+        mine = self.allocations.get(employee.emp_id)
+        if mine:
+            return sum(share * self.revenue_by_key[k] for k, share in mine.items())
+        if default is None:
+            return 0.0
+        return self.project_revenue(default)
+
+
+# The per-shard work. Both take the snapshot explicitly, so the in-process path (workers=1) just passes it in.
+def _format_shard(employees: Sequence[Employee], snapshot: RegistrySnapshot) -> List[str]:
+    return [e.compensation_summary(snapshot, snapshot.period) for e in employees]
+
+
+def _compensate_shard(employees: Sequence[Employee], snapshot: RegistrySnapshot) -> List[float]:
+    return [e.calculate_compensation(snapshot, snapshot.period) for e in employees]
+
+
+# Worker-side state. The initializer stores the snapshot in a module global of the worker process so each shard only has to
+# carry its employees across the process boundary. Only pool worker processes ever set it; the parent never does.
+_worker_snapshot: Optional[RegistrySnapshot] = None
+
+
+def _init_worker(snapshot: RegistrySnapshot) -> None:
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+
+def _run_in_worker(shard_fn, employees: Sequence[Employee]) -> List:
+    return shard_fn(employees, _worker_snapshot)
+
+
+def _shards(employees: Sequence[Employee], chunk_size: int) -> Iterator[Sequence[Employee]]:
+    for start in range(0, len(employees), chunk_size):
+        yield employees[start:start + chunk_size]
+
+
+# The public entry points. Both yield results in the same order as `employees`; workers=None uses every core.
+# iter_report_lines: formatted report lines (compute + format both happen in the workers).
+def iter_report_lines(employees: Sequence[Employee], registry: ProjectRegistry, workers: Optional[int] = 1,
+                      period: Optional[date] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    return _run_shards(_format_shard, employees, registry, workers, period, chunk_size)
+
+
+# iter_compensations: just the numbers, for callers that format themselves (the report sinks in aidd_assgt_02_report.py).
+def iter_compensations(employees: Sequence[Employee], registry: ProjectRegistry, workers: Optional[int] = 1,
+                       period: Optional[date] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[float]:
+    return _run_shards(_compensate_shard, employees, registry, workers, period, chunk_size)
+
+
+def _run_shards(shard_fn, employees: Sequence[Employee], registry: ProjectRegistry, workers: Optional[int],
+                period: Optional[date], chunk_size: int) -> Iterator:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1.")
+    employees = list(employees)
+    snapshot = RegistrySnapshot(registry, period, employees)
+    return _stream_shards(shard_fn, employees, snapshot, workers, chunk_size)
+
+
+def _stream_shards(shard_fn, employees: Sequence[Employee], snapshot: RegistrySnapshot, workers: int,
+                   chunk_size: int) -> Iterator:
+    if workers == 1:
+        for shard in _shards(employees, chunk_size):
+            yield from shard_fn(shard, snapshot)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot,)) as pool:
+        for results in pool.map(partial(_run_in_worker, shard_fn), _shards(employees, chunk_size)):
+            yield from results
+
+
+# Synthetic org for the benchmark: a fixed number of projects, ~1% GMs, and the rest split between PMs, Programmers and
+# Staff. Deterministic (no randomness) so runs are comparable.
+def build_synthetic_org(n_employees: int, n_projects: int = 200) -> Tuple[ProjectRegistry, List[Employee]]:
+    registry = ProjectRegistry()
+    projects = [registry.upsert_project(f"Project {i:04d}", 100_000 + 1_000 * i) for i in range(n_projects)]
+    employees: List[Employee] = []
+    for i in range(n_employees):
+        proj = projects[i % n_projects]
+        start_year = 2000 + (i % 20)
+        phone = f"317555{i % 10_000:04d}"
+        kind = i % 100
+        if kind == 0:
+            gm = GeneralManager("Gen", f"Manager{i}", f"GM{i:07d}", phone, start_year,
+                                [proj, projects[(i + 1) % n_projects]])
+            registry.register_gm(gm)
+            employees.append(gm)
+        elif kind < 20:
+            employees.append(ProjectManager("Proj", f"Manager{i}", f"PM{i:07d}", phone, start_year, proj))
+        elif kind < 60:
+            employees.append(Programmer("Pro", f"Grammer{i}", f"PR{i:07d}", phone, start_year,
+                                        base_salary=80_000 + (i % 50) * 500, project=proj))
+        else:
+            employees.append(Staff("Sta", f"Ff{i}", f"ST{i:07d}", phone, start_year, base_salary=50_000 + (i % 30) * 250))
+    return registry, employees
+
+
+def benchmark(n_employees: int, max_workers: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[int, float]:
+    # Times a full report (compute + format, lines drained but not printed) for 1..max_workers workers.
+    registry, employees = build_synthetic_org(n_employees)
+    timings: Dict[int, float] = {}
+    for workers in range(1, max_workers + 1):
+        t0 = time.perf_counter()
+        count = sum(1 for _ in iter_report_lines(employees, registry, workers=workers, chunk_size=chunk_size))
+        timings[workers] = time.perf_counter() - t0
+        if count != n_employees:  # a real check, not an assert, so it still runs under python -O
+            raise RuntimeError(f"Expected {n_employees:,} report lines with {workers} workers, got {count:,}.")
+    base = timings[1]
+    print(f"{n_employees:,} employees, chunk size {chunk_size:,}")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    for workers, secs in timings.items():
+        print(f"{workers:>8} {secs:>10.3f} {base / secs:>7.2f}x")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the parallel payroll runner.")
+    parser.add_argument("--employees", type=int, default=100_000, help="synthetic employee count")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="benchmark 1..N workers")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="employees per shard")
+    args = parser.parse_args()
+    benchmark(args.employees, args.max_workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
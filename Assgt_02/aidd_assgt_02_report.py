@@ -0,0 +1,173 @@
+# Streaming compensation report for the KSD personnel prototype. print_comp_report in the driver prints one line per
+# employee with one print() call each, and every line is built through str(employee). That is fine for a demo, but for a
+# payroll of millions it means millions of tiny stdout writes, and the only output is text on a terminal.
+#
+# This module turns the report into a single pass over the employees:
+# - each employee becomes one ReportRow (role, id, name, project label, base salary, compensation),
+# - the rows are fanned out to one or more sinks (terminal text, CSV, JSON Lines) that buffer and write in chunks,
+# - ReportTotals accumulates headcount and payroll per role in the same pass.
+# Nothing keeps the rows around, so memory stays flat no matter how many employees there are. The GM project column comes
+# from GeneralManager.project_label, which is joined once per GM, not once per line.
+
+from __future__ import annotations
+import csv
+import io
+import json
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from aidd_assgt_02_employees import ProjectRegistry, Employee
+from aidd_assgt_02_payroll import iter_compensations
+
+DEFAULT_BUFFER_ROWS = 2_000
+REPORT_FIELDS = ["role", "emp_id", "first_name", "last_name", "projects", "base_salary", "compensation"]
+
+
+# One line of the report. Keeps a reference to the employee so the terminal sink can reuse the existing str() format.
+@dataclass
+class ReportRow:
+    employee: Employee
+    compensation: float
+
+    def as_record(self) -> Dict:
+        e = self.employee
+        return {"role": e.role_tag, "emp_id": e.emp_id, "first_name": e.first_name, "last_name": e.last_name,
+                "projects": e.project_label, "base_salary": getattr(e, "base_salary", None),
+                "compensation": round(self.compensation, 2)}
+
+
+# Running totals, filled in while the rows stream past.
+@dataclass
+class ReportTotals:
+    count: int = 0
+    total_compensation: float = 0.0
+    by_role: Dict[str, List[float]] = field(default_factory=dict)  # role -> [headcount, payroll]
+
+    def add(self, row: ReportRow) -> None:
+        self.count += 1
+        self.total_compensation += row.compensation
+        bucket = self.by_role.setdefault(row.employee.role_tag, [0, 0.0])
+        bucket[0] += 1
+        bucket[1] += row.compensation
+
+
+def iter_report_rows(employees: Iterable[Employee], registry: ProjectRegistry,
+                     period: Optional[date] = None) -> Iterator[ReportRow]:
+    for e in employees:
+        yield ReportRow(e, e.calculate_compensation(registry, period))
+
+
+# Sinks share a tiny protocol: open(), write(row), close(totals). Each one keeps a list of pending strings and writes them
+# to its stream in one call every `buffer_rows` rows, which is where the syscall savings come from. File sinks only open
+# their file in open(), so a sink that is built but never run (or a report that fails before it starts) holds no handle;
+# write_report closes every sink it opened, even when a row fails.
+class _BufferedSink(ABC):
+    def __init__(self, stream: Optional[TextIO], buffer_rows: int = DEFAULT_BUFFER_ROWS,
+                 owns_stream: bool = False) -> None:
+        self.stream = stream
+        self.buffer_rows = buffer_rows
+        self.owns_stream = owns_stream
+        self._pending: List[str] = []
+
+    def open(self) -> None:
+        pass
+
+    def write(self, row: ReportRow) -> None:
+        self._pending.append(self.format(row))
+        if len(self._pending) >= self.buffer_rows:
+            self.flush()
+
+    @abstractmethod
+    def format(self, row: ReportRow) -> str:
+        # Each sink decides how one row looks in its output (a text line, a CSV row, a JSON object).
+        ...
+
+    def flush(self) -> None:
+        if self._pending:
+            self.stream.write("".join(self._pending))
+            self._pending.clear()
+
+    def close(self, totals: ReportTotals) -> None:
+        if self.stream is None:  # never opened
+            return
+        self.flush()
+        self.stream.flush()
+        if self.owns_stream:
+            self.stream.close()
+            self.stream = None
+
+
+# Same text as the original print_comp_report body (one compensation_summary-style line per employee).
+class TerminalSink(_BufferedSink):
+    def __init__(self, stream: Optional[TextIO] = None, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        super().__init__(stream if stream is not None else sys.stdout, buffer_rows)
+
+    def format(self, row: ReportRow) -> str:
+        return f"{row.employee} | Total Compensation: ${row.compensation:,.2f}\n"
+
+
+class CsvSink(_BufferedSink):
+    def __init__(self, path: str, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        super().__init__(None, buffer_rows, owns_stream=True)
+        self.path = path
+        # csv.writer wants a file; we point it at a reusable in-memory buffer and drain that in chunks.
+        self._scratch = io.StringIO()
+        self._writer = csv.DictWriter(self._scratch, fieldnames=REPORT_FIELDS)
+
+    def open(self) -> None:
+        self.stream = open(self.path, "w", newline="")
+        self._writer.writeheader()
+        self._pending.append(self._drain())
+
+    def format(self, row: ReportRow) -> str:
+        self._writer.writerow(row.as_record())
+        return self._drain()
+
+    def _drain(self) -> str:
+        text = self._scratch.getvalue()
+        self._scratch.seek(0)
+        self._scratch.truncate()
+        return text
+
+
+class JsonlSink(_BufferedSink):
+    def __init__(self, path: str, buffer_rows: int = DEFAULT_BUFFER_ROWS) -> None:
+        super().__init__(None, buffer_rows, owns_stream=True)
+        self.path = path
+
+    def open(self) -> None:
+        self.stream = open(self.path, "w")
+
+    def format(self, row: ReportRow) -> str:
+        return json.dumps(row.as_record()) + "\n"
+
+
+# Drives the single pass: every row goes to every sink and into the totals. Returns the totals for the caller to print.
+# With workers > 1 the compensation numbers come from the process pool in aidd_assgt_02_payroll.py (in employee order) and
+# the rows are built here, so the sinks and totals work exactly the same either way. With one worker `employees` is read
+# once, so a generator streaming from storage works; Staff kickers are cached per start_year cohort on first use.
+def write_report(employees: Iterable[Employee], registry: ProjectRegistry, sinks: Sequence[_BufferedSink],
+                 period: Optional[date] = None, workers: int = 1) -> ReportTotals:
+    totals = ReportTotals()
+    registry.refresh_tenure()  # pick up a year rollover once per run, not once per Staff row
+    if workers > 1:
+        employees = list(employees)  # the pool shards a list, and the rows pair each result with its employee
+        rows = map(ReportRow, employees, iter_compensations(employees, registry, workers=workers, period=period))
+    else:
+        rows = iter_report_rows(employees, registry, period)
+    opened: List[_BufferedSink] = []
+    try:
+        for sink in sinks:
+            sink.open()
+            opened.append(sink)
+        for row in rows:
+            totals.add(row)
+            for sink in sinks:
+                sink.write(row)
+    finally:
+        for sink in opened:
+            sink.close(totals)
+    return totals
@@ -0,0 +1,116 @@
+# What-if simulation for the KSD compensation rules. The question finance keeps asking is "what happens to payroll if
+# project X's revenue moves by some amount?". Rebuilding a registry and re-running the report answers it, but slowly, and
+# one scenario at a time.
+#
+# The trick is that every rule is linear in project revenue:
+# - a GM gets POOL_RATE (3%) of total revenue divided by the GM count, so every project moves every GM by 0.03 / n per $1,
+# - a PM gets REVENUE_RATE (5%) of their attributed revenue, so a project moves them by 0.05 * their share of it,
+# - a Programmer gets base + REVENUE_RATE (1%) of attributed revenue, so 0.01 * share,
+# - Staff pay doesn't depend on revenue at all.
+# So for each project we precompute its "sensitivity": the list of (employee, dollars of pay per dollar of revenue) plus the
+# total across everyone. A scenario is then just delta_payroll = sum(sensitivity[k] * delta_revenue[k]) over the projects
+# that changed, and the per-employee breakdown only touches the people on those projects (plus the GMs). Hundreds of
+# scenarios cost hundreds of small dict walks, not hundreds of payroll runs.
+#
+# The simulator is a snapshot of the registry and employee list at construction time. If either changes, build a new one.
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from aidd_assgt_02_employees import (
+    ProjectRegistry, Employee,
+    GeneralManager, ProjectManager, Programmer
+)
+
+
+@dataclass
+class SimulationResult:
+    total_delta: float
+    per_employee: Dict[str, float] = field(default_factory=dict)  # emp_id -> pay delta (only people who moved)
+    revenue_deltas: Dict[str, float] = field(default_factory=dict)  # project name -> absolute revenue delta applied
+
+
+class PayrollSimulator:
+    def __init__(self, employees: Iterable[Employee], registry: ProjectRegistry) -> None:
+        self.registry = registry
+        self._revenue: Dict[str, float] = registry.revenue_by_project()
+        self._names: Dict[str, str] = {ProjectRegistry._key(p.name): p.name for p in registry.projects}
+        allocations = registry.allocation_index()
+
+        # GMs: one shared coefficient, applied to every project. Mirrors GeneralManager's max(1, gm_count) guard.
+        self._gm_ids: List[str] = []
+        self._gm_coeff = GeneralManager.POOL_RATE / max(1, registry.gm_count)
+
+        # Project key -> [(emp_id, coefficient)] for PMs and Programmers.
+        self._members: Dict[str, List[Tuple[str, float]]] = {k: [] for k in self._revenue}
+        for e in employees:
+            if isinstance(e, GeneralManager):
+                self._gm_ids.append(e.emp_id)
+            elif isinstance(e, (ProjectManager, Programmer)):
+                rate = e.REVENUE_RATE
+                shares = allocations.get(e.emp_id) or {ProjectRegistry._key(e.project.name): 1.0}
+                for k, share in shares.items():
+                    if k in self._members:
+                        self._members[k].append((e.emp_id, rate * share))
+
+        # Project key -> total dollars of payroll per dollar of that project's revenue.
+        gm_total = self._gm_coeff * len(self._gm_ids)
+        self._sensitivity: Dict[str, float] = {
+            k: gm_total + sum(c for _, c in members) for k, members in self._members.items()
+        }
+
+    def sensitivity(self, project_name: str) -> float:
+        # Payroll change per $1 change in this project's revenue.
+        return self._sensitivity[self._resolve(project_name)]
+
+    def simulate(self, revenue_deltas: Optional[Mapping[str, float]] = None,
+                 pct_changes: Optional[Mapping[str, float]] = None, per_employee: bool = True) -> SimulationResult:
+        # revenue_deltas: project name -> dollars added (negative to cut). pct_changes: project name -> percent (10 = +10%).
+        # Both can be given; they add up. Resulting revenue can't go below zero, same rule as Project.
+        deltas = self._absolute_deltas(revenue_deltas, pct_changes)
+        total = sum(self._sensitivity[k] * d for k, d in deltas.items())
+        result = SimulationResult(total_delta=total,
+                                  revenue_deltas={self._names[k]: d for k, d in deltas.items()})
+        if per_employee and deltas:
+            moved: Dict[str, float] = {}
+            gm_delta = self._gm_coeff * sum(deltas.values())
+            if gm_delta:
+                for emp_id in self._gm_ids:
+                    moved[emp_id] = gm_delta
+            for k, d in deltas.items():
+                for emp_id, coeff in self._members[k]:
+                    moved[emp_id] = moved.get(emp_id, 0.0) + coeff * d
+            result.per_employee = moved
+        return result
+
+    def simulate_many(self, scenarios: Iterable[Mapping[str, float]], as_percent: bool = False) -> List[float]:
+        # Totals only, for sweeping lots of scenarios. Each scenario is a {project name: delta} mapping.
+        out: List[float] = []
+        for scenario in scenarios:
+            if as_percent:
+                deltas = self._absolute_deltas(None, scenario)
+            else:
+                deltas = self._absolute_deltas(scenario, None)
+            out.append(sum(self._sensitivity[k] * d for k, d in deltas.items()))
+        return out
+
+    def _resolve(self, project_name: str) -> str:
+        k = ProjectRegistry._key(project_name)
+        if k not in self._revenue:
+            raise KeyError(f"Unknown project: {project_name!r}")
+        return k
+
+    def _absolute_deltas(self, revenue_deltas: Optional[Mapping[str, float]],
+                         pct_changes: Optional[Mapping[str, float]]) -> Dict[str, float]:
+        deltas: Dict[str, float] = {}
+        for name, d in (revenue_deltas or {}).items():
+            k = self._resolve(name)
+            deltas[k] = deltas.get(k, 0.0) + float(d)
+        for name, pct in (pct_changes or {}).items():
+            k = self._resolve(name)
+            deltas[k] = deltas.get(k, 0.0) + self._revenue[k] * float(pct) / 100.0
+        for k, d in deltas.items():
+            if self._revenue[k] + d < 0:
+                raise ValueError(f"Scenario would make revenue of {self._names[k]!r} negative.")
+        return {k: d for k, d in deltas.items() if d}
@@ -0,0 +1,316 @@
+# Persistence for the KSD personnel prototype. Up to now every run started from an empty ProjectRegistry and the only way
+# to get employees in was typing them or using the demo. This module saves and loads the whole model (unique projects plus
+# all four employee types) in three formats:
+# - CSV: a directory holding projects.csv and employees.csv (easy to open in Excel),
+# - JSON Lines: one record per line, projects first, then employees (easy to stream and to diff),
+# - SQLite: projects / employees / employee_projects tables (queryable, and the fastest to reload).
+#
+# Loading is streaming in all three cases: rows are read one at a time and turned into objects as we go, nothing builds a
+# giant intermediate list. Projects are pushed into the registry in batches through ProjectRegistry.upsert_projects, so the
+# usual normalized-name dedupe (ProjectRegistry._key) and first-write-wins rule apply exactly like the interactive path.
+# GMs are registered as they are loaded. What we persist is the current view: each project's revenue in force today (the
+# dated revenue history and the allocation index are runtime features and are not written out).
+#
+# Employee rows carry a `role` column using the same tags as the report lines: GM, PM, Programmer, Staff. A GM can have
+# several projects; in CSV they are joined with "|" (project names can contain commas but not pipes in practice).
+# emp_id is the key everything else hangs off (the compensation cache, GM registration, SQLite links), so all three formats
+# refuse a second employee with the same emp_id with the same ValueError, both when saving and when loading.
+
+from __future__ import annotations
+import csv
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from aidd_assgt_02_employees import (
+    ProjectRegistry, Project, Employee,
+    GeneralManager, ProjectManager, Programmer, Staff
+)
+
+DEFAULT_BATCH_SIZE = 10_000
+PROJECTS_CSV = "projects.csv"
+EMPLOYEES_CSV = "employees.csv"
+EMPLOYEE_FIELDS = ["role", "emp_id", "first_name", "last_name", "phone", "start_year", "base_salary", "projects"]
+PROJECT_SEP = "|"
+
+
+# Record <-> object conversion. Every format goes through these two functions so the rules live in one place.
+
+def employee_to_record(e: Employee) -> Dict:
+    if isinstance(e, GeneralManager):
+        role, base, projects = "GM", None, [p.name for p in e.projects]
+    elif isinstance(e, ProjectManager):
+        role, base, projects = "PM", None, [e.project.name]
+    elif isinstance(e, Programmer):
+        role, base, projects = "Programmer", e.base_salary, [e.project.name]
+    elif isinstance(e, Staff):
+        role, base, projects = "Staff", e.base_salary, []
+    else:
+        raise TypeError(f"Unsupported employee type: {type(e).__name__}")
+    return {"role": role, "emp_id": e.emp_id, "first_name": e.first_name, "last_name": e.last_name,
+            "phone": e.phone, "start_year": e.start_year, "base_salary": base, "projects": projects}
+
+
+def record_to_employee(rec: Dict, registry: ProjectRegistry) -> Employee:
+    # Projects must already be in the registry (every format writes projects before employees).
+    def lookup(name: str) -> Project:
+        proj = registry.get_project(name)
+        if proj is None:
+            raise ValueError(f"Employee {rec.get('emp_id')!r} references unknown project {name!r}.")
+        return proj
+
+    def only_project() -> Project:
+        if len(names) != 1:
+            raise ValueError(f"{role} {rec.get('emp_id')!r} must have exactly one project, found {len(names)}.")
+        return lookup(names[0])
+
+    role = rec["role"]
+    ident = (rec["first_name"], rec["last_name"], rec["emp_id"], rec["phone"], int(rec["start_year"]))
+    names = rec.get("projects") or []
+    if role == "GM":
+        gm = GeneralManager(*ident, [lookup(n) for n in names])
+        registry.register_gm(gm)
+        return gm
+    if role == "PM":
+        return ProjectManager(*ident, only_project())
+    if role == "Programmer":
+        return Programmer(*ident, base_salary=float(rec["base_salary"]), project=only_project())
+    if role == "Staff":
+        return Staff(*ident, base_salary=float(rec["base_salary"]))
+    raise ValueError(f"Unknown role {role!r} for employee {rec.get('emp_id')!r}.")
+
+
+def _unique_records(employees: Iterable[Employee]) -> Iterator[Dict]:
+    # employee_to_record for every employee, refusing a repeated emp_id. The savers all go through this, so a model that
+    # couldn't be loaded back is never written in any format.
+    seen: Set[str] = set()
+    for e in employees:
+        _check_unique(e.emp_id, seen)
+        yield employee_to_record(e)
+
+
+def _check_unique(emp_id: str, seen: Set[str]) -> None:
+    if emp_id in seen:
+        raise ValueError(f"Duplicate employee id {emp_id!r}.")
+    seen.add(emp_id)
+
+
+# Buffers (name, revenue) pairs and hands them to the registry in batches. Callers must flush() before resolving employees.
+class _ProjectBatcher:
+    def __init__(self, registry: ProjectRegistry, batch_size: int) -> None:
+        self.registry = registry
+        self.batch_size = batch_size
+        self.pending: List[Tuple[str, float]] = []
+
+    def add(self, name: str, revenue: float) -> None:
+        self.pending.append((name, float(revenue)))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.registry.upsert_projects(self.pending)
+            self.pending = []
+
+
+def _load_records(project_rows: Iterable[Tuple[str, float]], employee_records: Iterable[Dict],
+                  registry: Optional[ProjectRegistry], batch_size: int) -> Tuple[ProjectRegistry, List[Employee]]:
+    registry = registry if registry is not None else ProjectRegistry()
+    batcher = _ProjectBatcher(registry, batch_size)
+    for name, revenue in project_rows:
+        batcher.add(name, revenue)
+    batcher.flush()
+    employees: List[Employee] = []
+    seen: Set[str] = set()
+    for rec in employee_records:
+        _check_unique(rec["emp_id"], seen)
+        employees.append(record_to_employee(rec, registry))
+    return registry, employees
+
+
+# CSV (directory with projects.csv + employees.csv)
+
+def save_csv(directory: str, registry: ProjectRegistry, employees: Iterable[Employee]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, PROJECTS_CSV), "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "revenue"])
+        w.writerows((p.name, p.revenue) for p in registry.projects)
+    with open(os.path.join(directory, EMPLOYEES_CSV), "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=EMPLOYEE_FIELDS)
+        w.writeheader()
+        for rec in _unique_records(employees):
+            rec["projects"] = PROJECT_SEP.join(rec["projects"])
+            rec["base_salary"] = "" if rec["base_salary"] is None else rec["base_salary"]
+            w.writerow(rec)
+
+
+def load_csv(directory: str, registry: Optional[ProjectRegistry] = None,
+             batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[ProjectRegistry, List[Employee]]:
+    def project_rows() -> Iterator[Tuple[str, float]]:
+        with open(os.path.join(directory, PROJECTS_CSV), newline="") as f:
+            for row in csv.DictReader(f):
+                yield row["name"], float(row["revenue"])
+
+    def employee_records() -> Iterator[Dict]:
+        with open(os.path.join(directory, EMPLOYEES_CSV), newline="") as f:
+            for row in csv.DictReader(f):
+                row["projects"] = [n for n in row["projects"].split(PROJECT_SEP) if n]
+                yield row
+
+    return _load_records(project_rows(), employee_records(), registry, batch_size)
+
+
+# JSON Lines ({"type": "project", ...} lines first, then {"type": "employee", ...} lines)
+
+def save_jsonl(path: str, registry: ProjectRegistry, employees: Iterable[Employee]) -> None:
+    with open(path, "w") as f:
+        for p in registry.projects:
+            f.write(json.dumps({"type": "project", "name": p.name, "revenue": p.revenue}) + "\n")
+        for rec in _unique_records(employees):
+            rec["type"] = "employee"
+            f.write(json.dumps(rec) + "\n")
+
+
+def load_jsonl(path: str, registry: Optional[ProjectRegistry] = None,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[ProjectRegistry, List[Employee]]:
+    registry = registry if registry is not None else ProjectRegistry()
+    batcher = _ProjectBatcher(registry, batch_size)
+    employees: List[Employee] = []
+    seen: Set[str] = set()
+    with open(path) as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            kind = rec.get("type")
+            if kind == "project":
+                batcher.add(rec["name"], rec["revenue"])
+            elif kind == "employee":
+                batcher.flush()  # no-op after the first employee; keeps any late project lines resolvable
+                _check_unique(rec["emp_id"], seen)
+                employees.append(record_to_employee(rec, registry))
+            else:
+                raise ValueError(f"{path}:{line_no}: unknown record type {kind!r}.")
+    batcher.flush()
+    return registry, employees
+
+
+# SQLite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    key      TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    revenue  REAL NOT NULL CHECK (revenue >= 0)
+);
+CREATE TABLE IF NOT EXISTS employees (
+    seq          INTEGER PRIMARY KEY,
+    emp_id       TEXT NOT NULL UNIQUE,
+    role         TEXT NOT NULL CHECK (role IN ('GM', 'PM', 'Programmer', 'Staff')),
+    first_name   TEXT NOT NULL,
+    last_name    TEXT NOT NULL,
+    phone        TEXT NOT NULL,
+    start_year   INTEGER NOT NULL,
+    base_salary  REAL
+);
+CREATE TABLE IF NOT EXISTS employee_projects (
+    emp_id       TEXT NOT NULL REFERENCES employees (emp_id),
+    position     INTEGER NOT NULL,
+    project_key  TEXT NOT NULL REFERENCES projects (key),
+    PRIMARY KEY (emp_id, position)
+);
+"""
+
+
+def save_sqlite(path: str, registry: ProjectRegistry, employees: Iterable[Employee],
+                batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    # Replaces whatever model was stored in the file. One transaction, executemany in batches.
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.execute("DELETE FROM employee_projects")
+            conn.execute("DELETE FROM employees")
+            conn.execute("DELETE FROM projects")
+            conn.executemany("INSERT INTO projects (key, name, revenue) VALUES (?, ?, ?)",
+                             ((ProjectRegistry._key(p.name), p.name, p.revenue) for p in registry.projects))
+            emp_rows: List[Tuple] = []
+            link_rows: List[Tuple] = []
+            for seq, rec in enumerate(_unique_records(employees)):
+                emp_rows.append((seq, rec["emp_id"], rec["role"], rec["first_name"], rec["last_name"], rec["phone"],
+                                 rec["start_year"], rec["base_salary"]))
+                link_rows.extend((rec["emp_id"], pos, ProjectRegistry._key(n)) for pos, n in enumerate(rec["projects"]))
+                if len(emp_rows) >= batch_size:
+                    _flush_employee_rows(conn, emp_rows, link_rows)
+            _flush_employee_rows(conn, emp_rows, link_rows)
+    finally:
+        conn.close()
+
+
+def _flush_employee_rows(conn: sqlite3.Connection, emp_rows: List[Tuple], link_rows: List[Tuple]) -> None:
+    conn.executemany("INSERT INTO employees (seq, emp_id, role, first_name, last_name, phone, start_year, base_salary) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", emp_rows)
+    conn.executemany("INSERT INTO employee_projects (emp_id, position, project_key) VALUES (?, ?, ?)", link_rows)
+    emp_rows.clear()
+    link_rows.clear()
+
+
+def load_sqlite(path: str, registry: Optional[ProjectRegistry] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[ProjectRegistry, List[Employee]]:
+    conn = sqlite3.connect(path)
+    try:
+        def project_rows() -> Iterator[Tuple[str, float]]:
+            yield from conn.execute("SELECT name, revenue FROM projects ORDER BY rowid")
+
+        def employee_records() -> Iterator[Dict]:
+            # group_concat in an ordered subquery keeps each GM's project order; names come back via the projects table.
+            cur = conn.execute(
+                "SELECT e.role, e.emp_id, e.first_name, e.last_name, e.phone, e.start_year, e.base_salary, "
+                "       (SELECT group_concat(name, char(31)) FROM ("
+                "            SELECT p.name FROM employee_projects ep JOIN projects p ON p.key = ep.project_key "
+                "            WHERE ep.emp_id = e.emp_id ORDER BY ep.position)) "
+                "FROM employees e ORDER BY e.seq")
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for role, emp_id, first, last, phone, start_year, base, names in rows:
+                    yield {"role": role, "emp_id": emp_id, "first_name": first, "last_name": last, "phone": phone,
+                           "start_year": start_year, "base_salary": base,
+                           "projects": names.split("\x1f") if names else []}
+
+        return _load_records(project_rows(), employee_records(), registry, batch_size)
+    finally:
+        conn.close()
+
+
+# Format dispatch used by the driver: a directory means CSV, .db/.sqlite/.sqlite3 means SQLite, anything else is JSONL.
+
+def _format_for(path: str) -> str:
+    if os.path.isdir(path) or path.endswith(os.sep):
+        return "csv"
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return "sqlite"
+    return "jsonl"
+
+
+def save(path: str, registry: ProjectRegistry, employees: Iterable[Employee]) -> None:
+    fmt = _format_for(path)
+    if fmt == "csv":
+        save_csv(path, registry, employees)
+    elif fmt == "sqlite":
+        save_sqlite(path, registry, employees)
+    else:
+        save_jsonl(path, registry, employees)
+
+
+def load(path: str, registry: Optional[ProjectRegistry] = None) -> Tuple[ProjectRegistry, List[Employee]]:
+    fmt = _format_for(path)
+    if fmt == "csv":
+        return load_csv(path, registry)
+    if fmt == "sqlite":
+        return load_sqlite(path, registry)
+    return load_jsonl(path, registry)
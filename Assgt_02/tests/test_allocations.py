@@ -0,0 +1,80 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from datetime import date
+import pytest
+from aidd_assgt_02_employees import ProjectRegistry, ProjectManager, Programmer, GeneralManager
+
+PAST = date(2020, 1, 1)
+
+
+@pytest.fixture
+def registry():
+    registry = ProjectRegistry()
+    registry.upsert_project("Apollo", 1_000.0, effective=PAST)
+    registry.upsert_project("Zephyr", 2_000.0, effective=PAST)
+    return registry
+
+
+def test_allocation_splits_attributed_revenue(registry):
+    pm = ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, registry.get_project("Apollo"))
+    assert registry.compensation(pm) == pytest.approx(50.0)  # no allocations: 100% of the assigned project
+    registry.allocate(pm, "Apollo", 60)
+    registry.allocate(pm, " zephyr ", 40)  # names are matched on the normalized key
+    assert registry.allocations_for(pm) == {"Apollo": 60.0, "Zephyr": 40.0}
+    assert registry.members_of("Zephyr") == {"PM1": 40.0}
+    assert registry.attributed_revenue(pm) == pytest.approx(1_400.0)
+    assert registry.compensation(pm) == pytest.approx(70.0)  # allocate() invalidated the cached 50.0
+
+
+def test_allocations_are_capped_at_100_percent(registry):
+    dev = Programmer("Ava", "Ng", "P1", "3175553333", 2021, 50_000, registry.get_project("Apollo"))
+    registry.allocate(dev, "Apollo", 70)
+    with pytest.raises(ValueError):
+        registry.allocate(dev, "Zephyr", 40)
+    registry.allocate(dev, "Apollo", 60)  # replacing the same pair doesn't count twice
+    registry.allocate(dev, "Zephyr", 40)
+    for bad in (0, -5, 101):
+        with pytest.raises(ValueError):
+            registry.allocate(dev, "Apollo", bad)
+    with pytest.raises(KeyError):
+        registry.allocate(dev, "Nowhere", 10)
+
+
+def test_unallocate_falls_back_to_the_assigned_project(registry):
+    pm = ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, registry.get_project("Apollo"))
+    registry.allocate(pm, "Zephyr", 100)
+    assert registry.compensation(pm) == pytest.approx(100.0)
+    assert registry.unallocate(pm, "Zephyr") is True
+    assert registry.unallocate(pm, "Zephyr") is False
+    assert registry.members_of("Zephyr") == {}
+    assert registry.compensation(pm) == pytest.approx(50.0)
+
+
+def test_revenue_change_invalidates_only_dependents(registry):
+    on_apollo = ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, registry.get_project("Apollo"))
+    on_zephyr = ProjectManager("Mia", "Diaz", "PM2", "3175554444", 2019, registry.get_project("Zephyr"))
+    split = Programmer("Ava", "Ng", "P1", "3175553333", 2021, 50_000, registry.get_project("Zephyr"))
+    registry.allocate(split, "Apollo", 50)
+    registry.allocate(split, "Zephyr", 50)
+    for employee in (on_apollo, on_zephyr, split):
+        registry.compensation(employee)
+
+    assert registry.set_project_revenue("Apollo", 3_000.0) == {"PM1", "P1"}
+    assert registry.compensation(on_apollo) == pytest.approx(150.0)
+    assert registry.compensation(on_zephyr) == pytest.approx(100.0)
+    assert registry.compensation(split) == pytest.approx(50_000 + 0.01 * 2_500.0)
+    assert registry.set_project_revenue("Apollo", 3_000.0) == set()  # same value: nothing to invalidate
+    with pytest.raises(KeyError):
+        registry.set_project_revenue("Nowhere", 1.0)
+
+
+def test_general_managers_follow_total_revenue(registry):
+    gm = GeneralManager("Asha", "Rao", "GM1", "3175551111", 2018, registry.projects)
+    registry.register_gm(gm)
+    assert registry.compensation(gm) == pytest.approx(0.03 * 3_000.0)
+    assert registry.set_project_revenue("Zephyr", 5_000.0) == {"GM1"}
+    assert registry.compensation(gm) == pytest.approx(0.03 * 6_000.0)
+    registry.upsert_project("Orion", 4_000.0)
+    assert registry.compensation(gm) == pytest.approx(0.03 * 10_000.0)
+    registry.register_gm(GeneralManager("Ben", "Ito", "GM2", "3175555555", 2018, registry.projects))
+    assert registry.compensation(gm) == pytest.approx(0.03 * 10_000.0 / 2)
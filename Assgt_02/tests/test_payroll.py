@@ -0,0 +1,27 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+import aidd_assgt_02_payroll as payroll
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_report_matches_the_registry(workers):
+    registry, employees = payroll.build_synthetic_org(300)
+    expected = [e.compensation_summary(registry) for e in employees]
+    assert list(payroll.iter_report_lines(employees, registry, workers=workers, chunk_size=64)) == expected
+    assert list(payroll.iter_compensations(employees, registry, workers=workers, chunk_size=64)) == \
+        [registry.compensation(e) for e in employees]
+
+
+def test_single_worker_does_not_touch_the_worker_global():
+    registry, employees = payroll.build_synthetic_org(10)
+    list(payroll.iter_report_lines(employees, registry, workers=1))
+    assert payroll._worker_snapshot is None
+
+
+def test_bad_arguments():
+    registry, employees = payroll.build_synthetic_org(10)
+    with pytest.raises(ValueError):
+        payroll.iter_report_lines(employees, registry, workers=0)
+    with pytest.raises(ValueError):
+        payroll.iter_compensations(employees, registry, chunk_size=0)
@@ -0,0 +1,94 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import csv
+import io
+import json
+import pytest
+from aidd_assgt_02_employees import ProjectRegistry
+from aidd_assgt_02_main import add_demo
+from aidd_assgt_02_payroll import build_synthetic_org
+from aidd_assgt_02_report import CsvSink, JsonlSink, TerminalSink, REPORT_FIELDS, write_report
+
+
+def report(employees, registry, **kwargs):
+    out = io.StringIO()
+    totals = write_report(employees, registry, [TerminalSink(out)], **kwargs)
+    return out.getvalue(), totals
+
+
+def test_generator_input_is_reported_in_full():
+    registry = ProjectRegistry()
+    employees = add_demo(registry)
+    text, totals = report(employees, registry)
+    streamed_text, streamed_totals = report((e for e in employees), registry)
+    assert streamed_totals.count == totals.count == 4
+    assert streamed_text == text
+    assert streamed_totals.total_compensation == totals.total_compensation
+
+
+def test_terminal_sink_matches_the_summary_lines():
+    registry = ProjectRegistry()
+    employees = add_demo(registry)
+    text, totals = report(employees, registry)
+    assert text.splitlines() == [e.compensation_summary(registry) for e in employees]
+    assert totals.by_role["Staff"][0] == 1
+    assert totals.total_compensation == pytest.approx(sum(registry.compensation(e) for e in employees))
+
+
+def test_csv_and_jsonl_sinks(tmp_path):
+    registry = ProjectRegistry()
+    employees = add_demo(registry)
+    csv_path, jsonl_path = tmp_path / "report.csv", tmp_path / "report.jsonl"
+    write_report(employees, registry, [CsvSink(str(csv_path)), JsonlSink(str(jsonl_path))])
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    records = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert list(rows[0]) == REPORT_FIELDS
+    assert [r["emp_id"] for r in rows] == [r["emp_id"] for r in records] == [e.emp_id for e in employees]
+    assert records[1]["projects"] == "Core Banking Revamp" and records[1]["base_salary"] is None
+    assert rows[1]["base_salary"] == ""
+    for row, record, e in zip(rows, records, employees):
+        assert float(row["compensation"]) == record["compensation"] == round(registry.compensation(e), 2)
+
+
+def test_rows_are_buffered_until_the_chunk_fills_or_the_sink_closes():
+    registry, employees = build_synthetic_org(10)
+    out = io.StringIO()
+    sink = TerminalSink(out, buffer_rows=4)
+    writes = []
+    real_write = out.write
+    out.write = lambda text: writes.append(text.count("\n")) or real_write(text)
+    write_report(employees, registry, [sink])
+    assert writes == [4, 4, 2]  # two full chunks, then the rest on close
+    assert len(out.getvalue().splitlines()) == 10
+
+
+def test_file_sinks_open_lazily_and_close_on_error(tmp_path):
+    registry = ProjectRegistry()
+    employees = add_demo(registry)
+    sink = JsonlSink(str(tmp_path / "report.jsonl"))
+    assert sink.stream is None and not (tmp_path / "report.jsonl").exists()
+
+    def broken():
+        yield employees[0]
+        raise RuntimeError("storage went away")
+
+    csv_sink = CsvSink(str(tmp_path / "report.csv"), buffer_rows=1)
+    with pytest.raises(RuntimeError):
+        write_report(broken(), registry, [sink, csv_sink])
+    assert sink.stream is None and csv_sink.stream is None  # both handles were closed
+    assert len((tmp_path / "report.csv").read_text().splitlines()) == 2  # header + the row before the failure
+
+
+def test_worker_counts_give_identical_output(tmp_path):
+    registry, employees = build_synthetic_org(500)
+    outputs = []
+    for workers in (1, 3):
+        out = io.StringIO()
+        csv_path, jsonl_path = tmp_path / f"{workers}.csv", tmp_path / f"{workers}.jsonl"
+        totals = write_report(employees, registry, [TerminalSink(out), CsvSink(str(csv_path)),
+                                                    JsonlSink(str(jsonl_path))], workers=workers)
+        outputs.append((out.getvalue(), csv_path.read_text(), jsonl_path.read_text(), totals.count,
+                        round(totals.total_compensation, 6), totals.by_role))
+    assert outputs[0] == outputs[1]
+    assert outputs[0][3] == 500
@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from datetime import date, timedelta
+import pytest
+from aidd_assgt_02_employees import ProjectRegistry, ProjectManager, GeneralManager
+
+TODAY = date.today()
+FUTURE = TODAY + timedelta(days=365)
+PAST = date(2020, 1, 1)
+
+
+def make_pm(registry, revenue=100.0):
+    project = registry.upsert_project("Apollo", revenue, effective=PAST)
+    return ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, project)
+
+
+def test_future_version_does_not_change_todays_revenue():
+    registry = ProjectRegistry()
+    pm = make_pm(registry)
+    assert registry.compensation(pm) == pytest.approx(5.0)
+
+    affected = registry.set_project_revenue("Apollo", 999.0, effective=FUTURE)
+    assert affected == set()  # nothing in force today moved
+    assert registry.get_project("Apollo").revenue == 100.0
+    assert registry.compensation(pm) == pytest.approx(5.0)
+    assert pm.calculate_compensation(registry) == pytest.approx(5.0)
+    assert pm.calculate_compensation(registry, TODAY) == pytest.approx(5.0)
+    # ... but periods on or after the effective date see the new version
+    assert pm.calculate_compensation(registry, FUTURE) == pytest.approx(49.95)
+    assert registry.project_history("Apollo") == [(PAST, 100.0), (FUTURE, 999.0)]
+
+
+def test_set_without_effective_edits_the_version_in_force_today():
+    registry = ProjectRegistry()
+    pm = make_pm(registry)
+    registry.set_project_revenue("Apollo", 999.0, effective=FUTURE)
+    assert registry.compensation(pm) == pytest.approx(5.0)
+
+    affected = registry.set_project_revenue("Apollo", 200.0)
+    assert affected == {"PM1"}
+    assert registry.compensation(pm) == pytest.approx(10.0)
+    assert registry.project_history("Apollo") == [(PAST, 200.0), (FUTURE, 999.0)]
+
+
+def test_project_that_has_not_started_counts_as_zero_today():
+    registry = ProjectRegistry()
+    registry.upsert_project("Live", 1_000.0)
+    registry.upsert_project("Later", 5_000.0, effective=FUTURE)
+    gm = GeneralManager("Asha", "Rao", "GM1", "3175551111", 2018, registry.projects)
+    registry.register_gm(gm)
+    assert registry.total_revenue == 1_000.0
+    assert registry.compensation(gm) == pytest.approx(30.0)
+    assert registry.total_revenue_as_of(FUTURE) == 6_000.0
+
+
+def test_past_version_only_changes_history():
+    registry = ProjectRegistry()
+    pm = make_pm(registry)
+    registry.set_project_revenue("Apollo", 40.0, effective=date(2018, 1, 1))
+    assert registry.revenue_as_of("Apollo", date(2019, 6, 1)) == 40.0
+    assert registry.revenue_as_of("Apollo", date(2017, 6, 1)) == 0.0
+    assert registry.compensation(pm) == pytest.approx(5.0)
+
+
+def test_set_without_effective_keeps_a_future_only_version():
+    registry = ProjectRegistry()
+    registry.upsert_project("Orion", 5_000.0, effective=FUTURE)
+    pm = ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, registry.get_project("Orion"))
+    assert registry.compensation(pm) == 0.0
+
+    assert registry.set_project_revenue("Orion", 1_000.0) == {"PM1"}
+    assert registry.project_history("Orion") == [(TODAY, 1_000.0), (FUTURE, 5_000.0)]
+    assert registry.compensation(pm) == pytest.approx(50.0)
+    assert pm.calculate_compensation(registry, FUTURE) == pytest.approx(250.0)
@@ -0,0 +1,79 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from aidd_assgt_02_employees import ProjectRegistry, GeneralManager, ProjectManager, Programmer, Staff
+from aidd_assgt_02_simulation import PayrollSimulator
+
+
+def make_org():
+    registry = ProjectRegistry()
+    apollo = registry.upsert_project("Apollo", 100_000.0)
+    zephyr = registry.upsert_project("Zephyr", 200_000.0)
+    orion = registry.upsert_project("Orion", 50_000.0)
+    gms = [GeneralManager("Asha", "Rao", "GM1", "3175551111", 2018, registry.projects),
+           GeneralManager("Ben", "Ito", "GM2", "3175555555", 2018, [apollo])]
+    registry.register_gms(gms)
+    split_pm = ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, apollo)
+    split_dev = Programmer("Ava", "Ng", "P1", "3175553333", 2021, 80_000, zephyr)
+    registry.allocate(split_pm, "Apollo", 60)
+    registry.allocate(split_pm, "Zephyr", 40)
+    registry.allocate(split_dev, "Apollo", 25)
+    registry.allocate(split_dev, "Zephyr", 75)
+    employees = gms + [
+        split_pm, split_dev,
+        ProjectManager("Mia", "Diaz", "PM2", "3175554444", 2019, orion),  # no allocations
+        Programmer("Kai", "Lum", "P2", "3175556666", 2022, 70_000, orion),  # no allocations
+        Programmer("Zoe", "Park", "P3", "3175557777", 2020, 75_000, apollo),  # no allocations, on a shared project
+        Staff("Noah", "Kim", "S1", "3175558888", 2015, 40_000),
+    ]
+    return registry, employees
+
+
+def recompute(registry, employees, revenue):
+    # Full recompute: apply the new revenues for real, then run every employee's own compensation rule again
+    before = {e.emp_id: e.calculate_compensation(registry) for e in employees}
+    for name, value in revenue.items():
+        registry.set_project_revenue(name, value)
+    after = {e.emp_id: e.calculate_compensation(registry) for e in employees}
+    return {emp_id: after[emp_id] - before[emp_id] for emp_id in before}
+
+
+@pytest.mark.parametrize("deltas", [
+    {"Apollo": 20_000.0},  # shared allocations plus a plain assignment
+    {"Orion": -10_000.0},  # nobody on it has allocations
+    {"Apollo": -5_000.0, "Zephyr": 12_500.0, "Orion": 1_000.0},
+])
+def test_matches_a_full_recompute(deltas):
+    registry, employees = make_org()
+    simulator = PayrollSimulator(employees, registry)
+    result = simulator.simulate(deltas)
+    revenue = {name: registry.get_project(name).revenue + d for name, d in deltas.items()}
+    expected = recompute(registry, employees, revenue)
+
+    assert result.total_delta == pytest.approx(sum(expected.values()))
+    moved = {emp_id: d for emp_id, d in expected.items() if abs(d) > 1e-9}
+    assert result.per_employee.keys() == moved.keys()
+    for emp_id, d in moved.items():
+        assert result.per_employee[emp_id] == pytest.approx(d)
+    assert "S1" not in result.per_employee
+
+
+def test_percent_changes_and_sweeps_agree():
+    registry, employees = make_org()
+    simulator = PayrollSimulator(employees, registry)
+    by_percent = simulator.simulate(pct_changes={"Zephyr": 10}).total_delta
+    assert by_percent == pytest.approx(simulator.simulate({"Zephyr": 20_000.0}).total_delta)
+    assert simulator.simulate_many([{"Zephyr": 10}, {"Orion": -50}], as_percent=True) == \
+        pytest.approx([by_percent, simulator.simulate({"Orion": -25_000.0}).total_delta])
+    expected = recompute(registry, employees, {"Zephyr": 220_000.0})
+    assert by_percent == pytest.approx(sum(expected.values()))
+
+
+def test_bad_scenarios():
+    registry, employees = make_org()
+    simulator = PayrollSimulator(employees, registry)
+    with pytest.raises(KeyError):
+        simulator.simulate({"Nowhere": 1.0})
+    with pytest.raises(ValueError):
+        simulator.simulate({"Orion": -60_000.0})
+    assert simulator.simulate({}).total_delta == 0.0
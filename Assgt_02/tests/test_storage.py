@@ -0,0 +1,59 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+from aidd_assgt_02_employees import ProjectRegistry, ProjectManager, Staff
+import aidd_assgt_02_storage as storage
+
+FORMATS = ["org" + os.sep, "org.jsonl", "org.db"]  # CSV directory, JSON Lines, SQLite
+
+
+def make_org():
+    registry = ProjectRegistry()
+    project = registry.upsert_project("Apollo", 1_000.0)
+    employees = [ProjectManager("Liam", "Chen", "PM1", "3175552222", 2019, project),
+                 Staff("Noah", "Kim", "S1", "3175556666", 2015, 40_000)]
+    return registry, employees
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_round_trip(tmp_path, name):
+    registry, employees = make_org()
+    path = str(tmp_path / name)
+    storage.save(path, registry, employees)
+    loaded_registry, loaded = storage.load(path)
+    assert [storage.employee_to_record(e) for e in loaded] == [storage.employee_to_record(e) for e in employees]
+    assert loaded[0].project is loaded_registry.get_project("apollo")
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_duplicate_emp_id_is_refused_when_saving(tmp_path, name):
+    registry, employees = make_org()
+    employees.append(Staff("Eve", "Roe", "S1", "3175557777", 2020, 30_000))
+    with pytest.raises(ValueError, match="Duplicate employee id 'S1'"):
+        storage.save(str(tmp_path / name), registry, employees)
+
+
+def test_duplicate_emp_id_is_refused_when_loading(tmp_path):
+    registry, employees = make_org()
+    path = tmp_path / "org.jsonl"
+    storage.save(str(path), registry, employees)
+    with open(path, "a") as f:
+        f.write(json.dumps(dict(storage.employee_to_record(employees[1]), type="employee")) + "\n")
+    with pytest.raises(ValueError, match="Duplicate employee id 'S1'"):
+        storage.load(str(path))
+
+    directory = tmp_path / "org"
+    storage.save(str(directory) + os.sep, registry, employees)
+    with open(directory / storage.EMPLOYEES_CSV, "a") as f:
+        f.write("Staff,S1,Eve,Roe,3175557777,2020,30000.0,\n")
+    with pytest.raises(ValueError, match="Duplicate employee id 'S1'"):
+        storage.load(str(directory))
+
+
+@pytest.mark.parametrize("projects", [[], ["Apollo", "Apollo"]])
+def test_pm_needs_exactly_one_project(projects):
+    registry, employees = make_org()
+    rec = dict(storage.employee_to_record(employees[0]), projects=projects)
+    with pytest.raises(ValueError, match="exactly one project"):
+        storage.record_to_employee(rec, registry)
@@ -0,0 +1,70 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from datetime import date
+import pytest
+import aidd_assgt_02_employees as employees_module
+from aidd_assgt_02_employees import ProjectRegistry, Staff, TenureService
+
+
+class Clock:
+    # A settable stand-in for date.today
+    def __init__(self, today):
+        self.today = today
+
+    def __call__(self):
+        return self.today
+
+
+@pytest.fixture
+def kicker_calls(monkeypatch):
+    calls = []
+    real = TenureService.kicker_for
+
+    def counting(year, start_year):
+        calls.append((year, start_year))
+        return real(year, start_year)
+
+    monkeypatch.setattr(TenureService, "kicker_for", staticmethod(counting))
+    return calls
+
+
+def make_staff(n, years=(2015, 2018, 2020)):
+    return [Staff("S", f"Person{i}", f"S{i}", "3175550000", years[i % len(years)], 50_000) for i in range(n)]
+
+
+def test_kicker_is_computed_once_per_cohort(kicker_calls):
+    registry = ProjectRegistry()
+    registry.tenure = TenureService(Clock(date(2025, 6, 1)))
+    staff = make_staff(300)
+    pay = [registry.compensation(s) for s in staff]
+    assert sorted(kicker_calls) == [(2025, 2015), (2025, 2018), (2025, 2020)]
+    assert pay[:3] == [51_000.0, 50_700.0, 50_500.0]
+
+    registry.clear_compensation_cache()
+    registry.run_payroll(staff, [date(2025, 1, 31), date(2025, 2, 28)])  # same year: still cached
+    assert len(kicker_calls) == 3
+
+
+def test_year_rollover_drops_cached_pay(kicker_calls):
+    clock = Clock(date(2025, 12, 31))
+    registry = ProjectRegistry()
+    registry.tenure = TenureService(clock)
+    staff = make_staff(1, years=(2020,))[0]
+    assert registry.compensation(staff) == 50_500.0
+    assert staff.years_of_service(registry) == 5
+
+    clock.today = date(2026, 1, 1)
+    assert registry.compensation(staff) == 50_600.0  # the cached 2025 number was thrown away
+    assert staff.years_of_service(registry) == 6
+    assert kicker_calls == [(2025, 2020), (2026, 2020)]
+    assert registry.refresh_tenure() is False  # nothing moved since
+
+
+def test_years_of_service_uses_the_cached_year(monkeypatch):
+    registry = ProjectRegistry()
+    registry.tenure = TenureService(Clock(date(2030, 3, 1)))
+    staff = make_staff(1, years=(2020,))[0]
+    monkeypatch.setattr(employees_module, "current_year", lambda: pytest.fail("read the system clock"))
+    assert staff.years_of_service(registry) == 10
+    assert staff.years_of_service(registry, date(2022, 1, 1)) == 2
+    assert not hasattr(employees_module, "CURRENT_YEAR")
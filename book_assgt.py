@@ -2,50 +2,169 @@
 # Import json for reading and writing data in JSON format
 # Import os for file path operations (not used directly in this code, but useful for file management)
 # Import datetime for handling and formatting dates (used for review dates)
+# Import Catalog, which owns the books/reviews lists and keeps lookup indexes on them (see book_catalog.py)
+# Import stream_load, which reads the data file one book/review at a time instead of all at once (see book_stream.py)
+# Import argparse for the optional command line flags (--db, --dump, --limit, --offset, --format)
+# Import SqliteCatalog, the optional SQLite backend with the same query methods as Catalog (see book_sqlite.py)
+# Import render and the formatters, which write books/reviews in chunks instead of one print per line (see book_render.py)
+# Import sys and redirect_stdout so status messages can go to stderr while --dump writes data to stdout
+# Import time to measure import throughput
+# Import record_to_json so json.dump can write Book/Review records, and id_number for the next free id (book_records.py)
+import argparse
 import json
 import os
+import sys
+import time
+from contextlib import redirect_stdout
 from datetime import datetime
+from book_catalog import Catalog, SEARCH_LIMIT
+from book_stream import stream_load
+from book_journal import AppendLog, atomic_write_json, log_path_for
+from book_sqlite import SqliteCatalog
+from book_render import render, format_book, format_review, format_jsonl, TEXT, JSONL, FORMATS
+from book_records import record_to_json, id_number
+from book_join import ORDERS
+
+# Global catalog that owns our data (a Catalog of Book/Review records, or a SqliteCatalog after use_database()).
+# Always go through `catalog`: use_database() replaces it, so a name bound to its lists at import time would go stale.
+catalog = Catalog()
+
+# New books and reviews are appended to a small change log next to the data file (data_file_assgt-01.log.jsonl)
+# instead of rewriting the whole file each time. After COMPACT_EVERY changes, on Save, and on Exit the log is folded
+# back into the data file with an atomic rename (see book_journal.py).
+DATA_FILE = "data_file_assgt-01.json"
+COMPACT_EVERY = 500
+PAGE_SIZE = 20  # Books/reviews shown before the menu asks whether to show more
+IMPORT_PROGRESS_EVERY = 10_000  # Records between progress lines during `books import` / `reviews import`
+change_log = AppendLog(log_path_for(DATA_FILE))
+
+
+# Function to switch every menu query over to a SQLite database
+def use_database(db_path, filename=DATA_FILE):
+    """
+    Open (or create) a SQLite database and make it the catalog for the rest of the session.
+    A new, empty database is filled from the JSON data file and its change log first (the migration).
+    """
+    global catalog
+    catalog = SqliteCatalog(db_path)
+    print(f"Using SQLite database {db_path}")
+    if catalog.book_count() == 0 and os.path.exists(filename):
+        import_into_database(filename)
+
+# Function to check which backend is in use
+def using_database():
+    return isinstance(catalog, SqliteCatalog)
+
+# Function to copy a JSON data file into the SQLite database
+def import_into_database(filename=DATA_FILE):
+    """
+    Import books and reviews from the JSON data file (and its change log) into the database.
+    Records already in the database (same bookId / reviewId) are skipped.
+    """
+    try:
+        added_books, added_reviews = catalog.import_json(filename, log=log_for(filename), progress=show_load_progress)
+        print(f"Imported {added_books} books and {added_reviews} reviews from {filename} into {catalog.path}")
+    except FileNotFoundError:
+        print(f"File {filename} not found. Nothing imported.")
+    except json.JSONDecodeError:
+        print("Error reading JSON file. Nothing imported.")
+
+# Function to get the change log that belongs to a data file
+def log_for(filename):
+    path = log_path_for(filename)
+    return change_log if path == change_log.path else AppendLog(path)
+
+# Function to print loading progress for big files
+def show_load_progress(kind, count):
+    print(f"  ...{count:,} {kind} loaded")
 
-# Global variables to store our data
-books = []
-reviews = []
 
 # Function to load data from a JSON file
-def load_data(filename="data_file_assgt-01.json"):
+def load_data(filename=DATA_FILE, lazy_reviews=False):
     """
     Load books and reviews data from a JSON file.
-    This function reads the JSON file and populates the global books and reviews lists.
+    This function streams the JSON file item by item into the catalog, which refills its lists in place.
+    With lazy_reviews=True only the books are read now; reviews are read the first time something needs them.
     """
-#To modify the global variables books and reviews inside this function
-    global books, reviews
+    if using_database():  # The database is the live copy; loading means merging the JSON file into it
+        import_into_database(filename)
+        return
     try:
-        with open(filename, 'r') as file:  # Open the file for reading
-            data = json.load(file)  # Load JSON data from the file
-            books = data.get('books', [])  # Get books list or empty list if not found
-            reviews = data.get('reviews', [])  # Get reviews list or empty list if not found
-            print(f"Data loaded successfully from {filename}")  # Success message
-            print(f"Loaded {len(books)} books and {len(reviews)} reviews")  # Loaded books and reviews count
+        n_books, n_reviews = stream_load(catalog, filename, lazy_reviews=lazy_reviews, progress=show_load_progress)
+        print(f"Data loaded successfully from {filename}")  # Success message
+        if catalog.reviews_loaded:
+            print(f"Loaded {n_books} books and {n_reviews} reviews")  # Loaded books and reviews count
+        else:
+            print(f"Loaded {n_books} books (reviews will be loaded when needed)")
     except FileNotFoundError:  # Handle file not found error
         print(f"File {filename} not found. Starting with empty data.")  # File not found message
-        books = []
-        reviews = []
+        catalog.load([], [])
     except json.JSONDecodeError: # Handle JSON decode error
         print("Error reading JSON file. Starting with empty data.")
-        books = []
-        reviews = []
+        catalog.load([], [])
+    replay_change_log(filename)
+
+# Function to re-apply changes from the change log after loading the data file
+def replay_change_log(filename=DATA_FILE):
+    """
+    Add the books and reviews recorded in the change log since the last full save.
+    Records that are already in the data file (same bookId / reviewId) are skipped, so replaying twice is harmless.
+    """
+    log = log_for(filename)
+    added_books = 0
+    logged_reviews = []
+    for op, record in log.entries():
+        if op == "book" and catalog.merge_book(record):
+            added_books += 1
+        elif op == "review":
+            logged_reviews.append(record)
+    catalog.merge_reviews(logged_reviews)
+    if log.count:
+        print(f"Replayed {log.count} change(s) from {log.path} ({added_books} new book(s), "
+              f"{len(logged_reviews)} review(s))")
+
+# Function to record one new book or review in the change log
+def record_change(op, record, filename=DATA_FILE):
+    """
+    Append one change to the log (one small write instead of rewriting the whole data file).
+    Every COMPACT_EVERY changes the log is folded into the data file.
+    """
+    if using_database():  # The database already committed it
+        print(f"Change saved to {catalog.path}")
+        return
+    log = log_for(filename)
+    try:
+        count = log.append(op, record)
+    except OSError as e:  # Fall back to a full save if the log can't be written
+        print(f"Error writing change log ({e}). Saving the full data file instead.")
+        save_data(filename)
+        return
+    print(f"Change saved to {log.path}")
+    if count >= COMPACT_EVERY:
+        save_data(filename)
+
 # Function to save data to a JSON file
-def save_data(filename="data_file_assgt-01.json"):  # Specify default filename
+def save_data(filename=DATA_FILE):  # Specify default filename
     """
     Save books and reviews data to a JSON file.
-    This function creates a dictionary with books and reviews and writes it to JSON.
+    This function creates a dictionary with books and reviews and writes it to JSON atomically
+    (temporary file + rename), then clears the change log because the data file now has everything.
     """
-    data = {  # Create a dictionary to hold the data
-        "books": books,
-        "reviews": reviews
-    }
+    try:
+        catalog.ensure_reviews()  # Never save while reviews are still waiting on disk, or they would be lost
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading reviews from the data file ({e}). Data not saved; the change log is kept.")
+        return
+    if using_database():  # Export the database in the same JSON layout
+        data = catalog.export_data()
+    else:
+        data = {  # Create a dictionary to hold the data
+            "books": catalog.books,
+            "reviews": catalog.reviews
+        }
     try:  # Attempt to save data
-        with open(filename, 'w') as file:  # Open the file for writing
-            json.dump(data, file, indent=2)  # indent=2 makes the JSON readable
+        atomic_write_json(filename, data, indent=2, default=record_to_json)  # indent=2 makes the JSON readable
+        log_for(filename).clear()  # Only after the new file is safely in place
         print(f"Data saved successfully to {filename}")
     except Exception as e:  # Catch any exceptions
         print(f"Error saving data: {e}")
@@ -58,12 +177,8 @@ def add_book():
     """
     print("\n--- Add New Book ---")
     
-    # Generate a new book ID (find the highest existing ID and add 1)
-    if books:
-        max_id = max(int(book['bookId']) for book in books)  # Find the highest book ID
-        book_id = str(max_id + 1)  # Generate new book ID
-    else:
-        book_id = "1"  # Start with ID 1 if no books exist
+    # Generate a new book ID (the catalog keeps a running highest ID, so this is highest + 1 without a scan)
+    book_id = catalog.next_book_id()
 
     # Collect book information from user
     title = input("Enter book title: ")
@@ -101,11 +216,11 @@ def add_book():
         "sales": sales
     }
     
-    books.append(new_book)  # Add the new book to our books list
+    catalog.add_book(new_book)  # Add the new book to our books list and indexes
     print(f"Added book: {title}")
     
-    # Automatically save after adding a book
-    save_data()
+    # Automatically save after adding a book (one line appended to the change log)
+    record_change("book", new_book)
 # Function to add a new review
 def add_review():
     """
@@ -115,29 +230,24 @@ def add_review():
     print("\n--- Add New Review ---")
     
     # Show available books
-    if not books:  # Check if there are no books
+    if not catalog.book_count():  # Check if there are no books
         print("No books available to review. Please add a book first.")
         return
     
     print("Available books:")
-    for book in books:  # List all available books
-        print(f"ID {book['bookId']}: {book['title']} by {book['author']}")  # Show book details
+    for book in catalog.iter_books():  # List all available books
+        print(f"ID {book.book_id}: {book.title} by {book.author}")  # Show book details
 
     # Get book ID to review
     book_id = input("Enter the book ID to review: ")
     
-    # Check if book exists
-    book_exists = any(book['bookId'] == book_id for book in books)
-    if not book_exists:
+    # Check if book exists (dictionary lookup in the catalog's bookId index)
+    if not catalog.has_book(book_id):
         print("Invalid book ID. Please try again.")
         return
     
-    # Generate a new review ID
-    if reviews:  # Check if there are existing reviews
-        max_id = max(int(review['reviewId']) for review in reviews)  # Find the highest review ID
-        review_id = str(max_id + 1)  # Generate new review ID
-    else:
-        review_id = "1"
+    # Generate a new review ID (running highest review ID + 1)
+    review_id = catalog.next_review_id()
     
     # Collect review information
     review_author = input("Enter your name (review author): ")
@@ -152,60 +262,50 @@ def add_review():
         "reviewAuthor": review_author,
         "reviewDate": review_date,
         "reviewText": review_text,
-        "bookId": book_id
+        "bookId": book_id.strip()
     }
     
-    reviews.append(new_review)  # Add the new review to our reviews list
+    catalog.add_review(new_review)  # Add the new review to our reviews list and indexes
     print(f"Added review by {review_author}")  # Confirm review addition
 
-    # Automatically save after adding a review
-    save_data()
+    # Automatically save after adding a review (one line appended to the change log)
+    record_change("review", new_review)
 # Function to display all books
-def display_books():
+def display_books(offset=0, limit=None, output_format=TEXT, page_size=PAGE_SIZE):
     """
-    Display all books in a readable format.
+    Display all books in a readable format (or as JSON Lines with output_format="jsonl").
+    Books are formatted in chunks and written with one write per chunk (see book_render.py).
+    offset/limit pick a slice of the books; page_size pauses every N books to ask for more (None = no pausing).
     """
-    print("\n--- All Books ---")
-    if not books:
-        print("No books available.")
-        return
+    if output_format == TEXT:
+        print("\n--- All Books ---")
+        if not catalog.book_count():
+            print("No books available.")
+            return
 
-    for book in books:  # Iterate through all books
-        print(f"ID: {book['bookId']}")
-        print(f"Title: {book['title']}")
-        print(f"Author: {book['author']}")
-        print(f"Release Year: {book['releaseYear']}")
-        print(f"AI Metric: {book['aiMetric']}")
-        print(f"Genres: {', '.join(book['genres'])}")
-        print(f"Publisher: {book['publisher']['publisherName']} ({book['publisher']['location']})")
-        print(f"Pages: {book['pages']}")
-        print(f"Sales: {book['sales']}")
-        print("-" * 40)
+    formatter = format_book if output_format == TEXT else format_jsonl
+    render(catalog.iter_books(offset, limit), formatter, page_size=page_size)
 
 # Function to display all reviews
-def display_reviews():
+def display_reviews(offset=0, limit=None, output_format=TEXT, page_size=PAGE_SIZE, order="added"):
     """
-    Display all reviews in a readable format.
+    Display all reviews in a readable format (or as JSON Lines with output_format="jsonl").
+    Same chunked writing, slicing and paging as display_books.
+    order is "added" (file order), "book" (grouped by book) or "date"; the rows come from the catalog's review join.
     """
-    print("\n--- All Reviews ---")
-    if not reviews:  # Check if there are no reviews
-        print("No reviews available.")
-        return
-    
-    for review in reviews:
-        # Find the book title for this review
-        book_title = "Unknown Book"  # Default title if not found
-        for book in books:
-            if book['bookId'] == review['bookId']:  # Match book ID
-                book_title = book['title']
-                break
-        
-        print(f"Review ID: {review['reviewId']}")
-        print(f"Book: {book_title} (ID: {review['bookId']})")
-        print(f"Author: {review['reviewAuthor']}")
-        print(f"Date: {review['reviewDate']}")
-        print(f"Review: {review['reviewText']}")
-        print("-" * 40)
+    if output_format == TEXT:
+        print("\n--- All Reviews ---")
+        if not catalog.review_total():  # Check if there are no reviews (reads deferred reviews from the file first)
+            print("No reviews available.")
+            return
+
+        # Each row already carries its book's title ("Unknown Book" if the bookId isn't in the catalog)
+        def formatter(row):
+            return format_review(row[0], row[1])
+    else:
+        def formatter(row):
+            return format_jsonl(row[0])
+    render(catalog.joined_reviews(order, offset, limit), formatter, page_size=page_size)
 
 # Function to display the main menu
 def display_menu():
@@ -222,108 +322,289 @@ def display_menu():
     print("7. Books With Reviews")
     print("8. Display All Books")
     print("9. Display All Reviews")
+    print("10. Most Reviewed Books (Top N)")
+    print("11. Search Books and Reviews")
+    print("12. Filter Books by Genre / Publisher / Location / Year")
+    print("13. Sales Analytics")
+    print("14. Reviews by Book or Date")
     print("0. Exit")
 
+# Function to print books or reviews without the menu (python book_assgt.py --dump books --format jsonl)
+def dump(args):
+    """
+    Load the data, then write the requested records to stdout. Status messages go to stderr so the output
+    can be piped into other tools.
+    """
+    with redirect_stdout(sys.stderr):
+        if args.db:
+            use_database(args.db)
+        else:
+            load_data()
+    if args.dump == "books":
+        display_books(args.offset, args.limit, args.format, page_size=None)
+    else:
+        display_reviews(args.offset, args.limit, args.format, page_size=None, order=args.order)
+
+# Function to check and complete one imported book (returns an error message, or None if it can be added)
+def prepare_imported_book(book):
+    if not isinstance(book, dict):
+        return "not a JSON object"
+    if not str(book.get("title") or "").strip():
+        return "missing title"
+    book_id = str(book.get("bookId") or "").strip()
+    if not book_id:
+        book["bookId"] = catalog.next_book_id()  # Same id rule as add_book
+    elif catalog.has_book(book_id):
+        return f"duplicate bookId {book_id}"
+    else:
+        book["bookId"] = book_id
+    return None
+
+# Function to check and complete one imported review (returns an error message, or None if it can be added)
+# claimed holds the reviewIds of reviews that passed this check but aren't in the catalog yet (book_service's batches)
+def prepare_imported_review(review, claimed=()):
+    if not isinstance(review, dict):
+        return "not a JSON object"
+    book_id = str(review.get("bookId") or "").strip()
+    if not catalog.has_book(book_id):
+        return f"unknown bookId {book_id or '(missing)'}"
+    review["bookId"] = book_id
+    review_id = str(review.get("reviewId") or "").strip()
+    if not review_id:
+        numbers = [number + 1 for number in map(id_number, claimed) if number is not None]
+        review["reviewId"] = str(max([int(catalog.next_review_id())] + numbers))  # Same id rule as add_review
+    elif catalog.has_review(review_id) or review_id in claimed:
+        return f"duplicate reviewId {review_id}"
+    else:
+        review["reviewId"] = review_id
+    review.setdefault("reviewDate", datetime.now().strftime("%Y-%m-%d"))
+    return None
+
+# Function to add many books or reviews from a JSON Lines file (one JSON object per line)
+def import_jsonl(kind, path, filename=DATA_FILE):
+    """
+    Add every book (kind="books") or review (kind="reviews") in a JSON Lines file to the catalog, then save once.
+    Bad lines, duplicates and reviews of unknown books are skipped and counted. Prints the ingestion throughput.
+    Returns (records added, records skipped).
+    """
+    prepare = prepare_imported_book if kind == "books" else prepare_imported_review
+    add = catalog.add_book if kind == "books" else catalog.add_review
+    added = skipped = 0
+    problems = []  # First few skipped lines, to show the user what went wrong
+    started = time.perf_counter()
+    with open(path, encoding="utf-8") as feed, catalog.batch():  # One transaction in --db mode
+        for line_number, line in enumerate(feed, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                problem = prepare(record)
+            except json.JSONDecodeError as e:
+                problem = f"invalid JSON ({e.msg})"
+            if problem:
+                skipped += 1
+                if len(problems) < 5:
+                    problems.append(f"line {line_number}: {problem}")
+                continue
+            add(record)
+            added += 1
+            if added % IMPORT_PROGRESS_EVERY == 0:
+                print(f"  ...{added:,} {kind} imported")
+    elapsed = time.perf_counter() - started
+    rate = added / elapsed if elapsed > 0 else float(added)
+    print(f"Imported {added:,} {kind} from {path} in {elapsed:.2f}s ({rate:,.0f} {kind}/s); skipped {skipped:,}")
+    for problem in problems:
+        print(f"  skipped {problem}")
+
+    if added and not using_database():  # The database committed already; the JSON file is saved once, here
+        started = time.perf_counter()
+        save_data(filename)
+        print(f"Save took {time.perf_counter() - started:.2f}s")
+    return added, skipped
+
+# Function to run one command-line subcommand (books import, reviews import, query ...)
+def run_command(args):
+    """
+    Run a non-interactive subcommand against the catalog, for example:
+      python book_assgt.py books import new_books.jsonl
+      python book_assgt.py reviews import new_reviews.jsonl
+      python book_assgt.py query year 2023
+      python book_assgt.py query ai-lt 50
+      python book_assgt.py query with-reviews
+    Loading messages go to stderr so the command's own output can be piped.
+    """
+    lazy = args.command == "query" and args.query in ("year", "ai-lt")  # These never need reviews
+    with redirect_stdout(sys.stderr):
+        if args.db:
+            use_database(args.db)
+        else:
+            load_data(lazy_reviews=lazy)
+    if args.command == "books" or args.command == "reviews":
+        try:
+            import_jsonl(args.command, args.file)
+        except FileNotFoundError:
+            print(f"File {args.file} not found.")
+            return 1
+    elif args.query == "year":
+        books_by_year(args.value)
+    elif args.query == "ai-lt":
+        books_by_ai_metric(args.value)
+    else:
+        books_with_reviews()
+    return 0
+
 # Main program loop
-def main():
+def main(argv=None):
     """
     Main program function that handles the menu system.
+    With --db PATH every query runs against a SQLite database instead of the in-memory catalog.
+    With a command (books import, reviews import, query ...) it runs that command instead of the menu.
     """
+    parser = argparse.ArgumentParser(description="Book Review Management System")
+    parser.add_argument("--db", metavar="PATH", help="use a SQLite database (created from the JSON file if empty)")
+    parser.add_argument("--dump", choices=("books", "reviews"), help="print all books or reviews and exit (no menu)")
+    parser.add_argument("--offset", type=int, default=0, help="with --dump: skip this many records first")
+    parser.add_argument("--limit", type=int, help="with --dump: print at most this many records")
+    parser.add_argument("--format", choices=FORMATS, default=TEXT, help="with --dump: text (default) or jsonl")
+    parser.add_argument("--order", choices=ORDERS, default="added",
+                        help="with --dump reviews: file order (default), grouped by book, or by date")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", help="run one command instead of the menu")
+    for kind in ("books", "reviews"):
+        kind_parser = commands.add_parser(kind, help=f"import {kind} from a JSON Lines file")
+        actions = kind_parser.add_subparsers(dest="action", metavar="ACTION", required=True)
+        actions.add_parser("import", help="one JSON object per line").add_argument("file", metavar="FILE.jsonl")
+    query_parser = commands.add_parser("query", help="run one query and print the result")
+    queries = query_parser.add_subparsers(dest="query", metavar="QUERY", required=True)
+    queries.add_parser("year", help="books released in YEAR").add_argument("value", metavar="YEAR")
+    queries.add_parser("ai-lt", help="books with AI metric lower than N").add_argument("value", metavar="N")
+    queries.add_parser("with-reviews", help="books with at least one review")
+    args = parser.parse_args(argv)
+    if args.offset < 0 or (args.limit is not None and args.limit < 0):
+        parser.error("--offset and --limit must not be negative")
+    if args.dump and args.command:
+        parser.error("--dump can't be combined with a command")
+
+    if args.command:
+        return run_command(args)
+    if args.dump:
+        dump(args)
+        return
+
     print("Welcome to the Book Review Management System!")
     
-    # Automatically load data when program starts
-    load_data()
+    if args.db:
+        use_database(args.db)
+    else:
+        # Automatically load data when program starts (books now, reviews when first needed, so startup stays fast)
+        load_data(lazy_reviews=True)
     
     while True:
         display_menu()
         choice = input("Enter your choice: ")
         
-        if choice == "1":
-            load_data()
-        elif choice == "2":
-            save_data()
-        elif choice == "3":
-            add_book()
-        elif choice == "4":
-            add_review()
-        elif choice == "5":
-            books_by_year()
-        elif choice == "6":
-            books_by_ai_metric()
-        elif choice == "7":
-            books_with_reviews()
-        elif choice == "8":
-            display_books()
-        elif choice == "9":
-            display_reviews()
-        elif choice == "0":
-            print("Thank you for using the Book Review Management System!")
-            print("Goodbye!")
-            break
-        else:
-            print("Invalid choice. Please try again.")
+        try:  # Reviews left on disk at startup are read by whichever action first needs them
+            if choice == "1":
+                load_data()
+            elif choice == "2":
+                save_data()
+            elif choice == "3":
+                add_book()
+            elif choice == "4":
+                add_review()
+            elif choice == "5":
+                books_by_year()
+            elif choice == "6":
+                books_by_ai_metric()
+            elif choice == "7":
+                books_with_reviews()
+            elif choice == "8":
+                display_books()
+            elif choice == "9":
+                display_reviews()
+            elif choice == "10":
+                most_reviewed_books()
+            elif choice == "11":
+                search_books_and_reviews()
+            elif choice == "12":
+                filter_books_by_facets()
+            elif choice == "13":
+                sales_analytics()
+            elif choice == "14":
+                reviews_by_book_or_date()
+            elif choice == "0":
+                if change_log.count and not using_database():  # Fold pending changes into the data file before leaving
+                    save_data()
+                print("Thank you for using the Book Review Management System!")
+                print("Goodbye!")
+                break
+            else:
+                print("Invalid choice. Please try again.")
+        except (OSError, json.JSONDecodeError) as e:  # Handle the data file vanishing or breaking since startup
+            print(f"Error reading reviews from the data file ({e}). Nothing was changed; "
+                  "reload the data (option 1) to start over.")
 
 # Run the program
 
 # Function to print titles of all books released in a user specified year
-def books_by_year():
+def books_by_year(year_input=None):
     """
     Prompt the user for a release year and print the titles of all books released in that year.
-    This function reads from the global `books` list. It handles both string and integer year values.
+    This function reads from the catalog (JSON or SQLite). It handles both string and integer year values.
+    If year_input is given (e.g. from `query year 2023`), it is used instead of prompting.
     """
     print("\n--- Books by Release Year ---")
-    if not books:
+    if not catalog.book_count():
         print("No books loaded. Please add or load books first.")  # Check if there are no books
         return
 
-    year_input = input("Enter the release year (e.g., 2023): ").strip()
+    if year_input is None:
+        year_input = input("Enter the release year (e.g., 2023): ")
+    year_input = str(year_input).strip()
     if not year_input.isdigit():  # Check if input is a valid year
         print("Invalid year. Please enter a numeric year like 2024.")
         return
 
     year_str = str(year_input)
-    matches = [b for b in books if str(b.get("releaseYear", "")).strip() == year_str]  # Find matching books
+    matches = catalog.books_by_year(year_str)  # Look up matching books in the catalog's year index
     if not matches:
         print(f"No books found for the year {year_str}.")
         return
 
     print(f"Books released in {year_str}:")
     for idx, b in enumerate(matches, start=1):  # Enumerate through matching books
-        print(f"{idx}. {b.get('title', 'Untitled')}")
+        print(f"{idx}. {b.title or 'Untitled'}")
 
 # Function to print titles of all books with AI Metric lower than a user specified value
-def books_by_ai_metric():
+def books_by_ai_metric(raw=None):
     """
     Prompt the user for an AI Metric threshold and print titles of books with aiMetric lower than that value.
     Converts aiMetric values to integers safely (treats missing/invalid as very high to avoid false matches).
+    If raw is given (e.g. from `query ai-lt 50`), it is used instead of prompting.
     """
     print("\n--- Books by AI Metric (Lower Than Threshold) ---")
-    if not books:  # Check if there are no books
+    if not catalog.book_count():  # Check if there are no books
         print("No books loaded. Please add or load books first.")
         return
 
-    raw = input("Show books with AI Metric lower than: ").strip()  # Get user input
+    if raw is None:
+        raw = input("Show books with AI Metric lower than: ")  # Get user input
+    raw = str(raw).strip()
     try:
         threshold = int(raw)
     except ValueError:  # Handle invalid input
         print("Invalid number. Please enter an integer between 0 and 100.")
         return
 
-    def to_int(val):  # Convert value to int, treating invalid/missing as 101
-        try:
-            return int(val)
-        except (TypeError, ValueError):
-            # If aiMetric is missing or malformed, treat it as 101 so it won't be picked up accidentally
-            return 101 
-
-    matches = [b for b in books if to_int(b.get("aiMetric")) < threshold]  # Find matching books
+    # The catalog keeps books sorted by aiMetric (missing/malformed values count as 101 so they won't be picked up
+    # accidentally), so this is a binary search. Results come back lowest aiMetric first.
+    matches = catalog.books_with_ai_metric_below(threshold)  # Find matching books
     if not matches:  # Check if there are no matching books
         print(f"No books found with AI Metric lower than {threshold}.")
         return
 
     print(f"Books with AI Metric < {threshold}:")  # Print matching books
     for idx, b in enumerate(matches, start=1):  # Enumerate through matching books
-        print(f"{idx}. {b.get('title', 'Untitled')} (AI Metric: {b.get('aiMetric')})")
+        print(f"{idx}. {b.title or 'Untitled'} (AI Metric: {b.ai_metric_text})")
 
 # Function to print all books that have at least 1 review
 def books_with_reviews():
@@ -332,19 +613,12 @@ def books_with_reviews():
     A review is counted if `review['bookId']` matches the book's `bookId`.
     """
     print("\n--- Books With Reviews ---")
-    if not books:
+    if not catalog.book_count():
         print("No books loaded. Please add or load books first.")
         return
 
-    # Build an index of review counts per bookId for O(n) pass
-    counts = {}
-    for r in reviews:  # Count reviews per bookId
-        bid = str(r.get("bookId", "")).strip()  # Get the bookId from the review
-        if bid:
-            counts[bid] = counts.get(bid, 0) + 1  # Increment the count for this bookId
-
-    matches = [(b, counts.get(str(b.get("bookId", "")).strip(), 0)) for b in books]  # Pair books with their review counts
-    matches = [(b, c) for b, c in matches if c > 0]  # Filter out books without reviews
+    # The catalog keeps review counts per bookId up to date as reviews are added, so this only touches reviewed books
+    matches = catalog.books_with_reviews()  # Pairs of (book, review count)
 
     if not matches:
         print("No books have reviews yet.")
@@ -352,7 +626,160 @@ def books_with_reviews():
 
     print("Books with at least one review:")
     for idx, (b, c) in enumerate(matches, start=1):  # Enumerate through matching books
-        print(f"{idx}. {b.get('title', 'Untitled')} — {c} review(s)")  # Print book title and review count
+        print(f"{idx}. {b.title or 'Untitled'} — {c} review(s)")  # Print book title and review count
+
+# Function to print the books with the most reviews
+def most_reviewed_books():
+    """
+    Prompt the user for N and print the N books with the most reviews, highest count first.
+    Uses the catalog's review-count index (a heap picks the top N), so the reviews list is not scanned.
+    """
+    print("\n--- Most Reviewed Books ---")
+    raw = input("How many books to show (e.g., 5): ").strip()
+    if not raw.isdigit() or int(raw) < 1:  # Check if input is a positive whole number
+        print("Invalid number. Please enter a whole number like 5.")
+        return
+
+    top = catalog.most_reviewed(int(raw))
+    if not top:
+        print("No books have reviews yet.")
+        return
+
+    for idx, (b, c) in enumerate(top, start=1):  # Enumerate through the top books
+        print(f"{idx}. {b.title or 'Untitled'} — {c} review(s)")
+
+# Function to search titles, authors, genres and review text
+def search_books_and_reviews():
+    """
+    Prompt the user for search words and print the best matching books and reviews, best match first.
+    The in-memory catalog ranks with TF-IDF over an inverted index (book_search.py); the SQLite backend uses FTS5.
+    """
+    print("\n--- Search Books and Reviews ---")
+    query = input("Enter search words: ").strip()
+    if not query:
+        print("Please enter at least one word.")
+        return
+
+    if not getattr(catalog, "search_ready", True):  # The SQLite backend's FTS index is always ready
+        print("Building the search index (only needed once per session)...")
+    results = catalog.search(query, limit=SEARCH_LIMIT)
+    if not results:
+        print(f"No books or reviews match '{query}'.")
+        return
+
+    for idx, (b, r) in enumerate(results, start=1):  # Enumerate through the ranked results
+        title = (b.title or 'Untitled') if b is not None else "Unknown Book"
+        if r is None:
+            print(f"{idx}. {title} by {b.author or 'Unknown'} (ID: {b.book_id})")
+        else:
+            text = r.text
+            snippet = text if len(text) <= 80 else text[:77] + "..."  # Keep each result on one line
+            print(f"{idx}. Review {r.review_id} of {title} by {r.author}: {snippet}")
+
+# Function to filter books by any combination of genre, publisher, location and release year
+def filter_books_by_facets():
+    """
+    Prompt for genre(s), publisher, publisher location and release year (blank = any) and print the books that
+    match all of them, followed by how many of those books fall in each genre and location.
+    Uses the catalog's facet indexes, so books are never scanned one by one.
+    """
+    print("\n--- Filter Books ---")
+    if not catalog.book_count():
+        print("No books loaded. Please add or load books first.")
+        return
+
+    print("Leave a field blank to skip it.")
+    filters = {}
+    genres_input = input("Genre(s), separated by commas (books must have all of them): ")
+    genres = [genre.strip() for genre in genres_input.split(',') if genre.strip()]
+    if genres:
+        filters["genre"] = genres
+    for facet, prompt in (("publisher", "Publisher name: "), ("location", "Publisher location: "),
+                          ("year", "Release year: ")):
+        value = input(prompt).strip()
+        if value:
+            filters[facet] = value
+
+    matches = catalog.books_matching(filters)
+    if not matches:
+        print("No books match those filters.")
+        return
+
+    print(f"{len(matches)} book(s) match:")
+    for idx, b in enumerate(matches, start=1):  # Enumerate through matching books
+        print(f"{idx}. {b.title or 'Untitled'} ({b.release_year_text}, {b.publisher.name}, {b.publisher.location})")
+
+    for facet, heading in (("genre", "By genre"), ("location", "By location")):
+        counts = catalog.facet_counts(facet, filters)
+        print(f"{heading}: " + ", ".join(f"{value or '(none)'} ({count})" for value, count in counts))
+
+# Function to print sales totals, growth, top sellers and rollups by genre and year
+def sales_analytics():
+    """
+    Print a sales summary for the whole catalog: total and mean sales, the top 5 sellers with their average
+    yearly growth, and sales by genre and by calendar year.
+    The numbers come from the catalog's SalesMatrix (book_sales.py), which is reused until a book is added.
+    """
+    print("\n--- Sales Analytics ---")
+    if not catalog.book_count():
+        print("No books loaded. Please add or load books first.")
+        return
+
+    sales = catalog.sales()
+    print(f"Total sales: {sales.grand_total():,}")
+    print(f"Mean sales per book: {sales.mean_per_book():,.0f}")
+
+    totals, growth = sales.totals(), sales.average_growth()
+    print("Top 5 sellers:")
+    for idx, row in enumerate(sales.top_seller_rows(5), start=1):  # Enumerate through the best sellers
+        b, total, rate = sales.books[row], totals[row], growth[row]
+        trend = "n/a" if rate != rate else f"{rate:+.1%} per year"  # NaN (rate != rate) means growth is undefined
+        print(f"{idx}. {b.title or 'Untitled'} — {total:,} ({trend})")
+
+    print("Sales by genre:")
+    for genre, total in sorted(sales.by_genre().items(), key=lambda pair: -pair[1]):
+        print(f"  {genre}: {total:,}")
+
+    print("Sales by year:")
+    for year, total in sales.by_year().items():
+        print(f"  {year}: {total:,}")
+
+# Function to list reviews grouped by book or by date, followed by the reviews of books that aren't in the catalog
+def reviews_by_book_or_date():
+    """
+    Prompt for "book" or "date" and print the reviews in groups: each book (title, author, number of reviews) with
+    its reviews, or each review date with the reviews written that day. Reviews of unknown books are counted at the end.
+    The groups come from the catalog's review join, so titles aren't looked up again and the order is only sorted once.
+    """
+    print("\n--- Reviews by Book or Date ---")
+    if not catalog.review_total():
+        print("No reviews available.")
+        return
+    by = input("Group by book or date? [book]: ").strip().lower() or "book"
+    if by not in ("book", "date"):
+        print("Please enter 'book' or 'date'.")
+        return
+
+    def snippet(text):
+        return text if len(text) <= 60 else text[:57] + "..."  # Keep each review on one line
+
+    def formatter(group):
+        key, rows = group
+        if by == "book":
+            _, title, author = rows[0]
+            lines = [f"{title or 'Untitled'} by {author or 'Unknown'} (ID: {key}) - {len(rows)} review(s)"]
+            lines += [f"  {r.date}  {r.author}: {snippet(r.text)}" for r, _, _ in rows]
+        else:
+            lines = [f"{key or 'No date'} - {len(rows)} review(s)"]
+            lines += [f"  {title or 'Untitled'} - {r.author}: {snippet(r.text)}" for r, title, _ in rows]
+        return "\n".join(lines) + "\n"
+
+    render(catalog.review_groups(by), formatter, page_size=PAGE_SIZE)
+
+    orphans = catalog.orphaned_reviews()
+    if orphans:
+        ids = ", ".join(r.review_id for r in orphans[:10]) + (", ..." if len(orphans) > 10 else "")
+        print(f"{len(orphans)} review(s) point at books that aren't in the catalog (review IDs: {ids})")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,308 @@
+# Explanation of this module
+# Benchmarks for the Book Review Management System. The sample data file has 5 books and 3 reviews, which says nothing
+# about how the program behaves with a real catalog, so this module has two parts:
+# - generate: writes a synthetic data file with the same schema as data_file_assgt-01.json (string ids, aiMetric and
+#   releaseYear as strings, genres, publisher, pages, yearly sales) for any number of books, with reviews in proportion
+#   (a few books get many reviews, most get a few). The same --seed and sizes always give the same file.
+# - run: loads a generated catalog through book_assgt.load_data and times load_data, save_data, every menu query
+#   (first call and repeated call, since repeated calls are served from the query cache) and the display functions.
+#   It records the peak memory of the process, prints a table, and compares the timings with a baseline recorded
+#   earlier on the same machine (bench_baseline.json), marking every step that got more than --tolerance slower.
+#
+#   python book_bench.py run --books 10000 --save-baseline       (record a baseline on this machine, e.g. before a change)
+#   python book_bench.py run --books 10000                       (compare with that baseline, e.g. after the change)
+#   python book_bench.py generate --books 100000 -o books_100k.json
+#
+# Timings depend on the machine, so a baseline is only meaningful on the machine that recorded it. That is why no
+# baseline is shipped with the code (bench_baseline.json is in .gitignore): without one, `run` just prints the timings.
+
+# Import argparse for the generate / run command line
+# Import builtins to answer the menu functions' input() prompts during a run
+# Import json to write the data file and the results
+# Import os, sys, tempfile and platform for the work folder, the null output stream and the run description
+# Import random for the deterministic generator (random.Random(seed), never the shared global generator)
+# Import time for the timings
+# Import array to keep the release years of a million books compactly while their reviews are generated
+import argparse
+import builtins
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from array import array
+from contextlib import contextmanager, redirect_stdout
+
+try:  # Peak memory of the process; the resource module only exists on Unix
+    import resource
+except ImportError:
+    resource = None
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+DEFAULT_BOOKS = 10_000
+REVIEWS_PER_BOOK = 3  # Average; the actual count per book is skewed
+SEED = 2024
+REPEAT = 5  # Repeated calls per query in each round
+ROUNDS = 3  # Full passes (load, queries, display, save); every step reports its best round, which filters out noise
+TOLERANCE = 0.25  # A step more than 25% slower than the baseline is a regression ...
+MIN_DIFFERENCE = 0.002  # ... if it is also at least 2 ms slower (tiny steps are mostly timer noise)
+CURRENT_YEAR = 2025
+
+GENRES = ("Fiction", "Science Fiction", "Fantasy", "Mystery", "Thriller", "Romance", "Historical Fiction", "Horror",
+          "Biography", "History", "Science", "Technology", "Self-help", "Business", "Poetry", "Young Adult",
+          "Children", "Travel", "Cooking", "Philosophy")
+LOCATIONS = ("USA", "UK", "Canada", "Australia", "India", "Germany", "France", "Japan", "Brazil", "Russia")
+PUBLISHER_WORDS = ("Bright", "Future", "Penguin", "Harbor", "Summit", "Lantern", "Blue", "River", "North", "Oak",
+                   "Silver", "Quill", "Atlas", "Echo", "Cedar")
+PUBLISHER_KINDS = ("Press", "Books", "Publishing", "House", "Media")
+FIRST_NAMES = ("Alice", "Bob", "Carmen", "Dmitri", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal", "Kate", "Liam",
+               "Maya", "Nikhil", "Olga", "Pedro", "Quinn", "Rosa", "Sam", "Tariq", "Uma", "Victor", "Wen", "Yara")
+LAST_NAMES = ("Johnson", "Smith", "Garcia", "Ivanova", "Khan", "Lee", "Martin", "Nguyen", "Okafor", "Patel", "Rossi",
+              "Schmidt", "Tanaka", "Walker", "Young", "Zhang")
+TITLE_WORDS = ("Quantum", "Garden", "Forgotten", "Code", "Silent", "River", "Machine", "Dreams", "Shadow", "Empire",
+               "Last", "Light", "Algorithm", "Ocean", "City", "Memory", "Winter", "Signal", "Glass", "Crown", "Hidden",
+               "Star", "Notes", "Underground", "Clockwork", "Storm", "Paper", "Orchard", "Mirror", "Voyage")
+REVIEW_OPENINGS = ("A gripping read", "Slow to start", "Beautifully written", "Not for me", "An instant favourite",
+                   "Clever and surprising", "Uneven but rewarding", "Predictable", "Hard to put down",
+                   "Thoughtful and moving")
+REVIEW_DETAILS = ("the characters feel real", "the plot drags in the middle", "the AI-generated dialogue felt awkward",
+                  "the ending is perfect", "the pacing is excellent", "the world-building is rich",
+                  "the research shows", "the prose is a little flat", "it asks big questions",
+                  "the twist landed well")
+
+
+# Generator
+def _book(rng, number, authors, publishers):
+    year = CURRENT_YEAR - min(int(rng.expovariate(1 / 12)), 75)  # Mostly recent books, a long tail back to 1950
+    sales = []
+    figure = rng.randint(500, 50_000)
+    for _ in range(min(CURRENT_YEAR - year + 1, 10)):  # One figure per year since release (at most 10)
+        sales.append(figure)
+        figure = max(0, int(figure * rng.uniform(0.6, 1.4)))
+    ai_metric = str(rng.randint(0, 100)) if rng.random() > 0.01 else "N/A"  # A few books were never rated
+    publisher_name, location = rng.choice(publishers)
+    return {
+        "bookId": str(number),
+        "title": f"The {rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)}"
+                 + (f" {rng.randint(2, 9)}" if rng.random() < 0.1 else ""),
+        "aiMetric": ai_metric,
+        "releaseYear": str(year),
+        "author": rng.choice(authors),
+        "genres": rng.sample(GENRES, rng.choice((1, 1, 2, 2, 3))),
+        "publisher": {"publisherName": publisher_name, "location": location},
+        "pages": rng.randint(80, 1200),
+        "sales": sales,
+    }
+
+
+def _review(rng, number, book_number, release_year):
+    year = rng.randint(release_year, CURRENT_YEAR)
+    return {
+        "reviewId": str(number),
+        "reviewAuthor": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "reviewDate": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "reviewText": f"{rng.choice(REVIEW_OPENINGS)}; {rng.choice(REVIEW_DETAILS)}.",
+        "bookId": str(book_number),
+    }
+
+
+# Function to write a synthetic data file
+def generate(filename, books=DEFAULT_BOOKS, reviews_per_book=REVIEWS_PER_BOOK, seed=SEED):
+    """
+    Write a data file with `books` books and about `reviews_per_book` reviews per book, in the layout load_data reads.
+    Records are written as they are made, so a million books don't have to fit in memory as dicts.
+    Returns (books written, reviews written).
+    """
+    rng = random.Random(seed)
+    authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(max(1, books // 5))]
+    publishers = [(f"{rng.choice(PUBLISHER_WORDS)} {rng.choice(PUBLISHER_KINDS)}", rng.choice(LOCATIONS))
+                  for _ in range(max(1, books // 200))]
+    release_years = array("H")
+    review_count = 0
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write('{\n  "books": [')
+        for number in range(1, books + 1):
+            book = _book(rng, number, authors, publishers)
+            release_years.append(int(book["releaseYear"]))
+            file.write(("\n    " if number == 1 else ",\n    ") + json.dumps(book, ensure_ascii=False))
+        file.write('\n  ],\n  "reviews": [')
+        review_rng = random.Random(seed + 1)  # Own stream, so changes to the book generator don't reshuffle reviews
+        for book_number in range(1, books + 1):
+            # Exponential counts: most books get a few reviews, a few get many, and the average is reviews_per_book
+            for _ in range(int(review_rng.expovariate(1 / (reviews_per_book + 0.5))) if reviews_per_book else 0):
+                review_count += 1
+                review = _review(review_rng, review_count, book_number, release_years[book_number - 1])
+                file.write(("\n    " if review_count == 1 else ",\n    ") + json.dumps(review, ensure_ascii=False))
+        file.write("\n  ]\n}\n")
+    return books, review_count
+
+
+# Benchmark harness
+@contextmanager
+def _answers(*answers):
+    # Feed fixed answers to input() for the menu functions that prompt
+    replies = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(replies)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)  # Bytes on macOS, KiB on Linux
+
+
+def _timed(function, *answers):
+    with _answers(*answers):
+        started = time.perf_counter()
+        function()
+        return time.perf_counter() - started
+
+
+def run(books=DEFAULT_BOOKS, reviews_per_book=REVIEWS_PER_BOOK, seed=SEED, repeat=REPEAT, data_file=None,
+        workdir=None, rounds=ROUNDS):
+    """
+    Time the menu functions of book_assgt on a generated catalog, `rounds` times over, and keep each step's best time.
+    Every round starts with load_data, so the first call of each query is a cold one again (empty query cache, no
+    search index yet). Returns the results as a dict ({"meta": ..., "timings": {step: seconds}, "memory": {...}}).
+    Output of the timed functions is discarded.
+    """
+    import book_assgt as app  # Imported here so `generate` works without loading the whole program
+
+    workdir = workdir or os.path.join(tempfile.gettempdir(), "book_bench")
+    os.makedirs(workdir, exist_ok=True)
+    if data_file is None:
+        data_file = os.path.join(workdir, f"books_{books}_{reviews_per_book}_{seed}.json")
+        if not os.path.exists(data_file):  # Generated files are reused: the same arguments give the same file
+            print(f"Generating {data_file} ...")
+            generate(data_file, books, reviews_per_book, seed)
+    save_file = os.path.join(workdir, "saved.json")
+    timings = {}
+    memory = {"start": _peak_memory_mb()}
+    for _ in range(rounds):
+        for name, seconds in _round(app, data_file, save_file, repeat, memory).items():
+            timings[name] = min(seconds, timings.get(name, seconds))
+    memory["end"] = _peak_memory_mb()
+    os.remove(save_file)
+    meta = {"books": app.catalog.book_count(), "reviews": app.catalog.review_total(), "seed": seed,
+            "reviews_per_book": reviews_per_book, "python": platform.python_version(), "machine": platform.machine()}
+    return {"meta": meta, "timings": {name: round(value, 6) for name, value in timings.items()}, "memory": memory}
+
+
+def _round(app, data_file, save_file, repeat, memory):
+    timings = {}
+    with open(os.devnull, "w") as null, redirect_stdout(null):
+        timings["load_data"] = _timed(lambda: app.load_data(data_file))
+        memory.setdefault("after_load", _peak_memory_mb())
+        first_year = app.catalog.get_book("1").release_year_text if app.catalog.has_book("1") else "2020"
+        queries = {
+            "books_by_year": (lambda: app.books_by_year(first_year), ()),
+            "books_by_ai_metric": (lambda: app.books_by_ai_metric(50), ()),
+            "books_with_reviews": (app.books_with_reviews, ()),
+            "most_reviewed_books": (app.most_reviewed_books, ("10",)),
+            "search": (app.search_books_and_reviews, ("quantum garden",)),
+            "filter_by_facets": (app.filter_books_by_facets, ("Mystery", "", "USA", first_year)),
+            "sales_analytics": (app.sales_analytics, ()),
+        }
+        for name, (function, answers) in queries.items():
+            timings[name] = _timed(function, *answers)  # First call: does the work (and fills the query cache)
+            timings[name + " (repeat)"] = min(_timed(function, *answers) for _ in range(repeat))
+        timings["display_books"] = _timed(lambda: app.display_books(page_size=None))
+        timings["display_reviews"] = _timed(lambda: app.display_reviews(page_size=None))
+        timings["save_data"] = _timed(lambda: app.save_data(save_file))
+    return timings
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Return (step, seconds now, seconds in the baseline, ratio, regressed) rows for every timed step.
+    """
+    rows = []
+    for name, seconds in results["timings"].items():
+        before = baseline["timings"].get(name) if baseline else None
+        ratio = seconds / before if before else None
+        regressed = ratio is not None and ratio > 1 + tolerance and seconds - before >= MIN_DIFFERENCE
+        rows.append((name, seconds, before, ratio, regressed))
+    return rows
+
+
+def print_report(results, rows, baseline):
+    meta = results["meta"]
+    print(f"{meta['books']:,} books, {meta['reviews']:,} reviews (seed {meta['seed']}, Python {meta['python']})")
+    if baseline and baseline["meta"].get("books") != meta["books"]:
+        print(f"Note: the baseline is for {baseline['meta'].get('books'):,} books; the comparison is rough.")
+    print(f"{'step':32} {'seconds':>10} {'baseline':>10} {'change':>8}")
+    for name, seconds, before, ratio, regressed in rows:
+        change = f"{ratio - 1:+.0%}" if ratio is not None else ""
+        print(f"{name:32} {seconds:10.4f} {f'{before:.4f}' if before is not None else '':>10} {change:>8}"
+              + ("  REGRESSION" if regressed else ""))
+    memory = results["memory"]
+    if memory.get("end") is not None:
+        print(f"Peak memory: {memory['after_load']} MB after load, {memory['end']} MB at the end")
+
+
+# Main program
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic data and benchmarks for the Book Review Management System")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for name, help_text in (("generate", "write a synthetic data file"), ("run", "run the benchmarks")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--books", type=int, default=DEFAULT_BOOKS,
+                             help=f"number of books (default {DEFAULT_BOOKS})")
+        command.add_argument("--reviews-per-book", type=float, default=REVIEWS_PER_BOOK,
+                             help=f"average reviews per book (default {REVIEWS_PER_BOOK})")
+        command.add_argument("--seed", type=int, default=SEED, help="random seed (same seed, same data)")
+    commands.choices["generate"].add_argument("-o", "--output", required=True, metavar="FILE",
+                                              help="data file to write")
+    run_parser = commands.choices["run"]
+    run_parser.add_argument("--data", metavar="FILE", help="benchmark this data file instead of a generated one")
+    run_parser.add_argument("--workdir", metavar="DIR", help="folder for generated and saved files (default: temp)")
+    run_parser.add_argument("--repeat", type=int, default=REPEAT, help="repeated calls per query in each round")
+    run_parser.add_argument("--rounds", type=int, default=ROUNDS, help="full passes; each step keeps its best time")
+    run_parser.add_argument("--baseline", default=BASELINE_FILE, metavar="FILE",
+                            help="baseline results to compare with")
+    run_parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    run_parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    run_parser.add_argument("--output", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+    if args.books < 1 or args.reviews_per_book < 0:
+        parser.error("--books must be at least 1 and --reviews-per-book must not be negative")
+
+    if args.command == "generate":
+        started = time.perf_counter()
+        n_books, n_reviews = generate(args.output, args.books, args.reviews_per_book, args.seed)
+        print(f"Wrote {n_books:,} books and {n_reviews:,} reviews to {args.output} "
+              f"in {time.perf_counter() - started:.1f}s")
+        return 0
+
+    results = run(args.books, args.reviews_per_book, args.seed, max(1, args.repeat), args.data, args.workdir,
+                  max(1, args.rounds))
+    baseline = None
+    if not args.save_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as file:
+                baseline = json.load(file)
+        else:
+            print(f"No baseline at {args.baseline}; record one on this machine with --save-baseline to compare runs.")
+    rows = compare(results, baseline, args.tolerance)
+    print_report(results, rows, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    return 1 if any(row[4] for row in rows) else 0  # Non-zero exit status when something got slower
+
+
+if __name__ == "__main__":
+    sys.exit(main())
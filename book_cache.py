@@ -0,0 +1,92 @@
+# Explanation of this module
+# A small query result cache for the catalogs (book_catalog.Catalog and book_sqlite.SqliteCatalog). The menu and the
+# review service ask the same questions over and over ("books with reviews", "books from 2023", "AI metric below 50")
+# while books and reviews are only added now and then. Every catalog keeps a version number that goes up whenever
+# its data changes (a book or review added, a file loaded). Query results are cached under
+#   (query name, arguments, catalog version)
+# so a repeated question is a dictionary lookup, and a result can never be stale: after a change the version differs,
+# so the old entries can't match any more (they are dropped as soon as the new version is seen).
+# The cache holds at most MAX_ENTRIES results and forgets the least recently used one first (LRU).
+
+# Import OrderedDict for the LRU order (move_to_end / popitem are O(1))
+# Import wraps so cached methods keep their names and docstrings
+from collections import OrderedDict
+from functools import wraps
+
+MAX_ENTRIES = 128  # Results kept per catalog
+
+
+def _freeze(value):
+    # Make query arguments hashable: filter dicts and genre lists become sorted tuples
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class QueryCache:
+    """
+    LRU cache of query results, keyed on (query name, arguments, catalog version).
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (name, arguments, version) -> result, least recently used first
+        self._version = None  # Catalog version of the entries held now
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        """
+        Return the cached result for `key` at `version`, or None.
+        """
+        if version != self._version:  # The data changed: nothing cached can be valid any more
+            self._entries.clear()
+            self._version = version
+        result = self._entries.get((key, version))
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end((key, version))
+        return result
+
+    def put(self, key, version, result):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        self._entries[(key, version)] = result
+        self._entries.move_to_end((key, version))
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self._version = None
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def cached_query(method):
+    """
+    Decorator for catalog query methods. The catalog needs a `version` attribute and a `query_cache` (QueryCache).
+    Results are stored as tuples and every call gets its own list, so callers can't change a cached result.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, _freeze(args), _freeze(kwargs))
+        result = self.query_cache.get(key, self.version)
+        if result is None:
+            result = tuple(method(self, *args, **kwargs))
+            # Stored under the version *after* the query, which may have loaded deferred reviews first
+            self.query_cache.put(key, self.version, result)
+        return list(result)
+
+    return wrapper
@@ -0,0 +1,524 @@
+# Explanation of this module
+# The Book Review Management System (book_assgt.py) used to keep books and reviews in two bare global lists and scan them
+# for every lookup. This module holds a Catalog class that owns those two lists AND keeps small indexes next to them, so
+# the common questions ("does this bookId exist?", "what is the title of book 7?", "which reviews belong to book 3?",
+# "what is the next free id?") are dictionary lookups instead of loops over everything.
+# Books and reviews are stored as Book / Review records (book_records.py); dicts passed in are converted on the way in,
+# and the records convert back to the JSON schema of data_file_assgt-01.json unchanged.
+
+# Import bisect for the sorted aiMetric index (binary search instead of checking every book)
+# Import heapq for the "top N most reviewed" query (keeps only N candidates instead of sorting everything)
+# Import array for the facet indexes (compact sorted lists of book insertion numbers)
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+import heapq
+from itertools import islice
+from book_search import SearchIndex, BOOK
+from book_sales import SalesMatrix
+from book_cache import QueryCache, cached_query
+from book_join import ReviewJoin, group_rows
+# normalize_id / normalize_year / ai_metric_value / id_number / INVALID_AI_METRIC moved to book_records.py;
+# they are imported here so `from book_catalog import ...` keeps working
+from book_records import (INVALID_AI_METRIC, as_book, as_review, ai_metric_value, id_number, normalize_id,
+                          normalize_year, parse_int)
+
+# Facets a book can be filtered and counted by: genre (a book can have several), publisher name, publisher location, year
+FACETS = ("genre", "publisher", "location", "year")
+SEARCH_LIMIT = 10  # Results search() returns by default, with either backend (book_sqlite.py uses the same)
+
+
+def facet_key(value):
+    """
+    Turn a facet value into its index key, so "thriller " and "Thriller" are the same genre.
+    """
+    return str(value if value is not None else "").strip().casefold()
+
+
+def facet_values(book):
+    """
+    Return {facet: [values]} for one book, spelled as in the book (minus surrounding spaces).
+    """
+    return {
+        "genre": [genre.strip() for genre in book.genres if genre.strip()],
+        "publisher": [book.publisher.name.strip()],
+        "location": [book.publisher.location.strip()],
+        "year": [normalize_year(book.release_year_text)],
+    }
+
+
+def _year_key(number, text):
+    # Year index key: the year as an int, or its text when it isn't a number (so "2023", " 2023" and 2023 all match)
+    return number if number is not None else normalize_year(text)
+
+
+def _bits_from_seqs(seqs, size):
+    # Build a bitset (a Python int with bit n set for insertion number n) through a bytearray, which is linear;
+    # OR-ing 1 << n into an int one book at a time would copy the whole int every time
+    buffer = bytearray((size >> 3) + 1)
+    for seq in seqs:
+        buffer[seq >> 3] |= 1 << (seq & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _seqs_from_bits(bits):
+    # Insertion numbers of the set bits, lowest first
+    text = bin(bits)[:1:-1]  # Reverse the binary digits (and drop "0b") so text[n] is bit n
+    seq = text.find("1")
+    while seq != -1:
+        yield seq
+        seq = text.find("1", seq + 1)
+
+
+class Catalog:
+    """
+    In-memory store for books and reviews with lookup indexes.
+
+    - books / reviews: the lists of Book / Review records (what gets saved to JSON)
+    - bookId -> Book, for O(1) existence checks and title lookups
+    - bookId -> list of Reviews (a multimap), so one book's reviews are O(k)
+    - running max bookId / reviewId, so new ids don't need a max() over every record
+    - releaseYear -> list of books (hash index for books_by_year)
+    - (aiMetric, insertion number) pairs kept sorted, so "aiMetric < threshold" is a binary search
+    - bookId -> review count, updated as reviews are added/loaded, so review counts never rescan the reviews list
+    - a full-text search index (book_search.py), built the first time search() is used and updated on every add after
+    - facet indexes: genre / publisher / location / year -> sorted insertion numbers of the matching books. Queries AND
+      several facets together by intersecting bitsets built from those lists (cached; books added since a bitset was
+      built are ORed in all at once the next time it is used, so adding a book never touches a bitset)
+    - a SalesMatrix (book_sales.py) with the sales analytics, built on first use and dropped whenever a book is added
+    - a join of every review to its book (book_join.py), built the first time joined reviews are asked for and
+      updated on every add after that, so listing reviews with titles, by book or by date never redoes the lookups
+    - a version number that goes up on every change, and an LRU cache of query results for the current version
+      (book_cache.py), so a repeated query between changes is one lookup
+    """
+
+    def __init__(self, books=None, reviews=None):
+        self.books = []  # List of Books, in insertion order
+        self.reviews = []  # List of Reviews, in insertion order
+        self._books_by_id = {}  # bookId -> Book
+        self._reviews_by_book = {}  # bookId -> [Reviews]
+        self._max_book_id = 0  # Highest numeric bookId seen so far
+        self._max_review_id = 0  # Highest numeric reviewId seen so far
+        self._books_by_year = {}  # releaseYear (int, or its text if not a number) -> [Books]
+        self._ai_keys = []  # sorted (aiMetric, insertion number) pairs
+        self._ai_books = []  # Books in the same order as _ai_keys
+        self._book_seq = {}  # bookId -> insertion number (to list books in the order they were added)
+        self._review_counts = {}  # bookId -> number of reviews (only bookIds with at least one review)
+        self._review_loader = None  # Callable that yields reviews not loaded yet (lazy loading), or None
+        self._review_ids = set()  # reviewIds seen so far (so replaying the append log never duplicates a review)
+        self._search = None  # SearchIndex, or None until the first search
+        self._facets = {facet: {} for facet in FACETS}  # facet -> facet_key(value) -> array of insertion numbers
+        self._facet_labels = {facet: {} for facet in FACETS}  # facet -> facet_key(value) -> first spelling seen
+        self._facet_bits = {}  # (facet, facet_key(value)) -> (bitset, how many of the index's numbers it covers)
+        self._sales = None  # SalesMatrix over the current books, or None until it's needed
+        self._join = None  # ReviewJoin, or None until reviews are first listed with their books
+        self._in_batch = False  # True inside batch()
+        self.version = 0  # Goes up whenever books or reviews change (query_cache keys include it)
+        self.query_cache = QueryCache()
+        self.load(books or [], reviews or [])
+
+    # Function to replace all data (used by load_data)
+    def load(self, books, reviews):
+        """
+        Replace the catalog contents with the given books and reviews and rebuild every index.
+        The existing lists are cleared and refilled in place, so anyone holding a reference to
+        catalog.books or catalog.reviews keeps seeing the current data.
+        """
+        if books is self.books:
+            books = list(books)  # Copy first in case the caller passed our own lists back in
+        if reviews is self.reviews:
+            reviews = list(reviews)
+        self._clear()
+        for book in books:
+            self._index_book(book, sorted_index=False)
+        for review in reviews:
+            self._index_review(review)
+        self._rebuild_ai_index()
+
+    def load_events(self, events):
+        """
+        Replace the catalog contents from a stream of ("books", item) / ("reviews", item) pairs,
+        as produced by book_stream.iter_events. Items are indexed as they arrive.
+        """
+        self._clear()
+        for kind, item in events:
+            if kind == "books":
+                self._index_book(item, sorted_index=False)
+            else:
+                self._index_review(item)
+        self._rebuild_ai_index()
+
+    def set_review_loader(self, loader):
+        """
+        Register a callable that returns an iterable of reviews still on disk. It is run once,
+        the first time anything needs reviews (see ensure_reviews).
+        """
+        self._review_loader = loader
+
+    @property
+    def reviews_loaded(self):
+        return self._review_loader is None
+
+    def ensure_reviews(self):
+        """
+        Pull in lazily-deferred reviews, if there are any. Cheap no-op once everything is loaded.
+        """
+        if self._review_loader is not None:
+            loader, self._review_loader = self._review_loader, None
+            try:
+                pending = list(loader())  # Read them all first, so a bad file adds nothing
+            except BaseException:
+                self._review_loader = loader  # Still waiting on disk; the next call tries again
+                raise
+            for review in pending:
+                self._index_review(review)
+
+    def _clear(self):
+        self.version += 1
+        self.books.clear()
+        self.reviews.clear()
+        self._books_by_id = {}
+        self._reviews_by_book = {}
+        self._max_book_id = 0
+        self._max_review_id = 0
+        self._books_by_year = {}
+        self._book_seq = {}
+        self._review_counts = {}
+        self._review_loader = None
+        self._review_ids = set()
+        self._search = None
+        self._facets = {facet: {} for facet in FACETS}
+        self._facet_labels = {facet: {} for facet in FACETS}
+        self._facet_bits = {}
+        self._sales = None
+        self._join = None
+
+    def _rebuild_ai_index(self):
+        # One sort for a bulk load is cheaper than inserting books into the sorted index one at a time
+        pairs = sorted(((book.ai_metric_rank, seq), book) for seq, book in enumerate(self.books))
+        self._ai_keys = [key for key, _ in pairs]
+        self._ai_books = [book for _, book in pairs]
+
+    # Function to add one book and update the indexes
+    def add_book(self, book):
+        """
+        Append a book (a Book or a dict in the JSON schema) and index it. Returns the Book.
+        """
+        book = as_book(book)
+        self._index_book(book, sorted_index=not self._in_batch)
+        return book
+
+    @contextmanager
+    def batch(self):
+        """
+        Group many adds together (same call as SqliteCatalog.batch()). Inside a batch, new books skip the
+        one-at-a-time insert into the sorted aiMetric index; the index is rebuilt with one sort at the end
+        (only if books were added, so a batch of reviews stays cheap).
+        """
+        books_before = len(self.books)
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            if len(self.books) != books_before:
+                self._rebuild_ai_index()
+
+    # Function to add one review and update the indexes
+    def add_review(self, review):
+        """
+        Append a review (a Review or a dict in the JSON schema) and index it. Returns the Review.
+        Raises KeyError if the review points at a bookId that isn't in the catalog.
+        """
+        review = as_review(review)
+        self.ensure_reviews()  # Keep reviews in file order and the max reviewId correct
+        if not self.has_book(review.book_id):
+            raise KeyError(f"Unknown bookId: {review.book_id}")
+        self._index_review(review)
+        return review
+
+    def _index_book(self, book, sorted_index=True):
+        book = as_book(book)
+        self.version += 1
+        seq = len(self.books)  # Insertion number, used to keep equal aiMetrics in the order they were added
+        self.books.append(book)
+        self._sales = None  # Sales results describe the old set of books
+        book_id = book.book_id
+        self._books_by_id[book_id] = book
+        self._book_seq[book_id] = seq
+        number = id_number(book_id)
+        if number is not None and number > self._max_book_id:
+            self._max_book_id = number
+        self._books_by_year.setdefault(_year_key(book.release_year, book.release_year_text), []).append(book)
+        for facet, values in facet_values(book).items():
+            seen = set()
+            for label in values:
+                key = facet_key(label)
+                if key in seen:  # A genre listed twice still counts the book once
+                    continue
+                seen.add(key)
+                self._facets[facet].setdefault(key, array("I")).append(seq)
+                self._facet_labels[facet].setdefault(key, label)
+        if sorted_index:
+            key = (book.ai_metric_rank, seq)
+            position = bisect_left(self._ai_keys, key)
+            self._ai_keys.insert(position, key)
+            self._ai_books.insert(position, book)
+        if self._search is not None:
+            self._search.add_book(book)
+        if self._join is not None:
+            self._join.add_book(book)
+
+    def _index_review(self, review):
+        # Reviews loaded from a file may point at books that no longer exist; keep them (display shows "Unknown Book")
+        review = as_review(review)
+        self.version += 1
+        self.reviews.append(review)
+        self._review_ids.add(review.review_id)
+        book_id = review.book_id
+        self._reviews_by_book.setdefault(book_id, []).append(review)
+        self._review_counts[book_id] = self._review_counts.get(book_id, 0) + 1
+        number = id_number(review.review_id)
+        if number is not None and number > self._max_review_id:
+            self._max_review_id = number
+        if self._search is not None:
+            self._search.add_review(review)
+        if self._join is not None:
+            self._join.add_review(review)
+
+    # Function to re-apply records from the append log (see book_journal.py)
+    def merge_book(self, book):
+        """
+        Add a book unless a book with the same bookId is already there. Returns True if it was added.
+        """
+        book = as_book(book)
+        if self.has_book(book.book_id):
+            return False
+        self.add_book(book)
+        return True
+
+    def merge_reviews(self, reviews):
+        """
+        Add reviews unless their reviewId is already there. If reviews are still waiting on disk (lazy
+        loading), these are queued behind them instead, so replaying the log doesn't force a full load.
+        """
+        reviews = [as_review(review) for review in reviews]
+        if not reviews:
+            return
+        earlier = self._review_loader
+
+        def load_then_merge():
+            # ensure_reviews indexes only after the loader has finished, so track the ids it has yielded itself
+            seen = set(self._review_ids)
+            if earlier is not None:
+                for review in earlier():
+                    review = as_review(review)
+                    seen.add(review.review_id)
+                    yield review
+            for review in reviews:
+                if review.review_id not in seen:
+                    seen.add(review.review_id)
+                    yield review
+
+        if earlier is None:
+            for review in load_then_merge():
+                self._index_review(review)
+        else:
+            self._review_loader = load_then_merge
+
+    # Lookup helpers
+    def book_count(self):
+        return len(self.books)
+
+    def review_total(self):
+        self.ensure_reviews()
+        return len(self.reviews)
+
+    def iter_books(self, offset=0, limit=None):
+        return islice(self.books, offset, offset + limit if limit is not None else None)
+
+    def iter_reviews(self, offset=0, limit=None):
+        self.ensure_reviews()
+        return islice(self.reviews, offset, offset + limit if limit is not None else None)
+
+    def has_book(self, book_id):
+        return normalize_id(book_id) in self._books_by_id
+
+    def get_book(self, book_id):
+        return self._books_by_id.get(normalize_id(book_id))
+
+    def has_review(self, review_id):
+        self.ensure_reviews()
+        return normalize_id(review_id) in self._review_ids
+
+    def title_for(self, book_id, default="Unknown Book"):
+        book = self.get_book(book_id)
+        return book.title if book is not None else default
+
+    def reviews_for(self, book_id):
+        """
+        Return the list of reviews for one book (empty list if none). Do not modify it in place.
+        """
+        self.ensure_reviews()
+        return self._reviews_by_book.get(normalize_id(book_id), [])
+
+    def review_count(self, book_id):
+        self.ensure_reviews()
+        return self._review_counts.get(normalize_id(book_id), 0)
+
+    @cached_query
+    def books_with_reviews(self):
+        """
+        Return (book, review count) pairs for every book with at least one review, in the order the books were added.
+        Only the reviewed books are touched; books without reviews and the reviews list itself are never scanned.
+        """
+        self.ensure_reviews()
+        reviewed = [bid for bid in self._review_counts if bid in self._books_by_id]  # Skip reviews of unknown books
+        reviewed.sort(key=self._book_seq.__getitem__)
+        return [(self._books_by_id[bid], self._review_counts[bid]) for bid in reviewed]
+
+    @cached_query
+    def most_reviewed(self, n):
+        """
+        Return the top `n` (book, review count) pairs, most reviews first (ties: book added earlier comes first).
+        """
+        self.ensure_reviews()
+        candidates = ((count, -self._book_seq[bid], bid) for bid, count in self._review_counts.items()
+                      if bid in self._books_by_id)
+        top = heapq.nlargest(n, candidates)
+        return [(self._books_by_id[bid], count) for count, _, bid in top]
+
+    @cached_query
+    def books_by_year(self, year):
+        """
+        Return the books released in `year` (string or int), in the order they were added.
+        """
+        return list(self._books_by_year.get(_year_key(parse_int(year), year), []))
+
+    @cached_query
+    def books_with_ai_metric_below(self, threshold):
+        """
+        Return the books whose aiMetric is lower than `threshold`, lowest aiMetric first.
+        """
+        end = bisect_left(self._ai_keys, (threshold, -1))  # First key with aiMetric >= threshold
+        return self._ai_books[:end]
+
+    @property
+    def search_ready(self):
+        return self._search is not None
+
+    @cached_query
+    def search(self, text, limit=SEARCH_LIMIT):
+        """
+        Full-text search over titles, authors, genres and review text, best matches first.
+        Returns (book, review) pairs: review is None for a book match, and book is None for a review of an unknown book.
+        """
+        if self._search is None:  # First search: index everything once; adds keep it current from then on
+            self.ensure_reviews()
+            self._search = SearchIndex()
+            for book in self.books:
+                self._search.add_book(book)
+            for review in self.reviews:
+                self._search.add_review(review)
+        results = []
+        for _, kind, record in self._search.search(text, limit):
+            if kind == BOOK:
+                results.append((record, None))
+            else:
+                results.append((self.get_book(record.book_id), record))
+        return results
+
+    # Reviews joined to their books
+    def _review_join(self):
+        self.ensure_reviews()
+        if self._join is None:  # First use: join every review once; adds keep it current from then on
+            self._join = ReviewJoin(self.reviews, self._books_by_id, self._book_seq)
+        return self._join
+
+    def joined_reviews(self, order="added", offset=0, limit=None):
+        """
+        Return an iterator of (review, book title, book author) rows, in the order the reviews were added, by book or
+        by date (see book_join.ORDERS). Reviews of books that aren't in the catalog get "Unknown Book" and no author.
+        """
+        return self._review_join().rows(order, offset, limit)
+
+    def orphaned_reviews(self):
+        """
+        Return the reviews whose bookId isn't in the catalog, in the order they were added.
+        """
+        return self._review_join().orphans()
+
+    def review_groups(self, by="book"):
+        """
+        Return an iterator of (bookId, rows) pairs (by="book") or (reviewDate, rows) pairs (by="date"), where rows are
+        the joined_reviews() rows of that book or date.
+        """
+        return group_rows(self.joined_reviews(by), by)
+
+    # Facet queries
+    def _bits(self, facet, value):
+        if facet not in self._facets:
+            raise KeyError(f"Unknown facet: {facet} (expected one of {', '.join(FACETS)})")
+        key = facet_key(value)
+        seqs = self._facets[facet].get(key, ())
+        bits, covered = self._facet_bits.get((facet, key), (0, 0))
+        if covered < len(seqs):
+            # Insertion numbers are appended in order, so the ones added since the bitset was built are the tail of
+            # the list; OR them in with one pass instead of copying the whole int once per added book
+            bits |= _bits_from_seqs(seqs[covered:], len(self.books))
+            self._facet_bits[(facet, key)] = (bits, len(seqs))
+        return bits
+
+    def _filter_bits(self, filters):
+        # AND together every {facet: value or [values]} filter. None means "no filter" (every book).
+        result = None
+        for facet, values in (filters or {}).items():
+            for value in ([values] if isinstance(values, str) or not hasattr(values, "__iter__") else values):
+                bits = self._bits(facet, value)
+                result = bits if result is None else result & bits
+        return result
+
+    @cached_query
+    def books_matching(self, filters):
+        """
+        Return the books that match every filter, in the order they were added.
+        `filters` maps a facet ("genre", "publisher", "location", "year") to a value or a list of values,
+        e.g. {"genre": "Thriller", "location": "USA", "year": 2023}. A list means the book needs all of them.
+        """
+        bits = self._filter_bits(filters)
+        if bits is None:
+            return list(self.books)
+        return [self.books[seq] for seq in _seqs_from_bits(bits)]
+
+    @cached_query
+    def facet_counts(self, facet, filters=None):
+        """
+        Return (value, number of books) pairs for one facet, most books first (ties: alphabetical).
+        With `filters`, only books matching them are counted, e.g. the genres of books published in the USA.
+        """
+        if facet not in self._facets:
+            raise KeyError(f"Unknown facet: {facet} (expected one of {', '.join(FACETS)})")
+        within = self._filter_bits(filters)
+        labels = self._facet_labels[facet]
+        counts = []
+        for key, seqs in self._facets[facet].items():
+            count = len(seqs) if within is None else (self._bits(facet, key) & within).bit_count()
+            if count:
+                counts.append((labels[key], count))
+        counts.sort(key=lambda pair: (-pair[1], facet_key(pair[0])))
+        return counts
+
+    def sales(self):
+        """
+        Return the SalesMatrix for the current books (built once, reused until the next book is added).
+        """
+        if self._sales is None:
+            self._sales = SalesMatrix(self.books)
+        return self._sales
+
+    def next_book_id(self):
+        return str(self._max_book_id + 1)
+
+    def next_review_id(self):
+        self.ensure_reviews()
+        return str(self._max_review_id + 1)
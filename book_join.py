@@ -0,0 +1,124 @@
+# Explanation of this module
+# A join view from reviews to the books they review, for display_reviews and the review report. Showing a review
+# means showing its book's title (and author), so every display used to look the book up again for every review.
+# ReviewJoin does that lookup once per review and keeps the result:
+# - for every review (in the order they were added), the Book it points at, or None if its bookId isn't in the catalog
+#   (an "orphaned" review; the catalog keeps those because the JSON file may hold reviews of deleted books)
+# - the orphaned reviews' positions by bookId, so adding that book later fixes exactly those rows
+# - the review order by book and by date, sorted the first time each is asked for and kept until reviews or books change
+# Catalog (book_catalog.py) builds it in one pass over the reviews the first time it's needed and keeps it current on
+# every add after that; SqliteCatalog (book_sqlite.py) gets the same rows from a LEFT JOIN.
+
+# Import sys for the sort key of orphaned reviews (after every book)
+# Import array for compact lists of review positions
+# Import groupby, islice and starmap to group, slice and build rows without copying them
+import sys
+from array import array
+from itertools import groupby, islice, starmap
+
+UNKNOWN_BOOK = "Unknown Book"  # Title shown for a review whose bookId isn't in the catalog
+
+# Orders the joined reviews can be listed in:
+# - "added": the order the reviews were added (the order of the data file)
+# - "book": grouped by book in the order the books were added, then orphaned reviews by bookId; reviews of one book
+#   stay in the order they were added
+# - "date": by reviewDate as text (ISO dates like 2024-05-12 sort by date), ties in the order they were added
+ORDERS = ("added", "book", "date")
+# What review_groups() groups by, for the orders that group
+GROUP_KEYS = {"book": lambda row: row[0].book_id, "date": lambda row: row[0].date}
+
+
+def joined_row(review, book):
+    """
+    The (review, book title, book author) row for one review. Orphaned reviews get UNKNOWN_BOOK and no author.
+    """
+    if book is None:
+        return (review, UNKNOWN_BOOK, "")
+    return (review, book.title, book.author)
+
+
+def group_rows(rows, by):
+    """
+    Group (review, title, author) rows listed in order `by` ("book" or "date") into (bookId or date, [rows]) pairs.
+    """
+    key = GROUP_KEYS[by]
+    for value, group in groupby(rows, key):
+        yield value, list(group)
+
+
+def check_order(order):
+    if order not in ORDERS:
+        raise ValueError(f"Unknown review order: {order} (expected one of {', '.join(ORDERS)})")
+
+
+class ReviewJoin:
+    """
+    Reviews joined to their books. `reviews`, `books_by_id` and `book_seq` are the catalog's own reviews list,
+    bookId -> Book and bookId -> insertion number dicts (read, never changed here); the catalog appends each new
+    review to its list and then calls add_review().
+    """
+
+    def __init__(self, reviews, books_by_id, book_seq):
+        self.reviews = reviews
+        self._books_by_id = books_by_id
+        self._book_seq = book_seq
+        self.books = []  # The Book of each review (None if orphaned), same order as reviews
+        self._orphans = {}  # bookId -> array of positions of reviews pointing at that missing book
+        self._orders = {}  # "book" / "date" -> array of review positions in that order, built on first use
+        for review in reviews:
+            self.add_review(review)
+
+    def add_review(self, review):
+        position = len(self.books)
+        book = self._books_by_id.get(review.book_id)
+        self.books.append(book)
+        if book is None:
+            self._orphans.setdefault(review.book_id, array("I")).append(position)
+        self._orders.clear()
+
+    def add_book(self, book):
+        # A book arriving after its reviews (e.g. replayed from the append log) adopts them
+        positions = self._orphans.pop(book.book_id, None)
+        if positions is not None:
+            for position in positions:
+                self.books[position] = book
+            self._orders.clear()
+
+    def _positions(self, order):
+        positions = self._orders.get(order)
+        if positions is None:
+            reviews = self.reviews
+            if order == "book":
+                missing = sys.maxsize  # Orphaned reviews go after every book
+                seq = self._book_seq
+
+                def key(position):
+                    book_id = reviews[position].book_id
+                    return seq.get(book_id, missing), book_id
+            else:
+                def key(position):
+                    return reviews[position].date
+            # sorted() is stable, so reviews with equal keys stay in the order they were added
+            positions = self._orders[order] = array("I", sorted(range(len(reviews)), key=key))
+        return positions
+
+    def rows(self, order="added", offset=0, limit=None):
+        """
+        Return an iterator of (review, title, author) rows in `order` (see ORDERS), skipping `offset` rows and
+        stopping after `limit`.
+        """
+        check_order(order)
+        end = offset + limit if limit is not None else None
+        if order == "added":
+            pairs = zip(self.reviews, self.books)
+        else:
+            reviews, books = self.reviews, self.books
+            pairs = ((reviews[position], books[position]) for position in self._positions(order))
+        return starmap(joined_row, islice(pairs, offset, end))
+
+    def orphans(self):
+        """
+        Return the reviews whose bookId isn't in the catalog, in the order they were added.
+        """
+        positions = sorted(position for group in self._orphans.values() for position in group)
+        return [self.reviews[position] for position in positions]
@@ -0,0 +1,157 @@
+# Explanation of this module
+# Every add_book / add_review used to call save_data(), which rewrites the whole data file (all books and all reviews,
+# pretty-printed) for one new record, and does it in place, so a crash halfway through leaves a broken file.
+# This module provides the two pieces that fix that:
+# - AppendLog: a JSON-lines file next to the data file. Adding a record appends one short line and flushes it to disk.
+#   On startup the log is replayed on top of the data file. A half-written last line (the process died mid-write) is
+#   ignored instead of breaking the load.
+# - atomic_write_json: writes the full data file to a temporary file in the same folder, flushes it to disk and then
+#   renames it over the old file. The rename is atomic, so readers see either the old file or the new one, never half.
+#   The temporary file gets the old file's permissions first (mkstemp creates it private to the owner), and the folder
+#   is flushed after the rename so the rename itself survives a power cut.
+# "Compaction" is just: atomic_write_json the full data, then clear the log.
+
+import json
+import os
+import stat
+import tempfile
+
+LOG_SUFFIX = ".log.jsonl"
+
+
+def log_path_for(data_filename):
+    """
+    Return the append-log path that belongs to a data file (data.json -> data.log.jsonl).
+    """
+    base, _ = os.path.splitext(data_filename)
+    return base + LOG_SUFFIX
+
+
+def atomic_write_json(filename, data, indent=2, default=None):
+    """
+    Write `data` as JSON to `filename` so the file is always either the old or the new version.
+    `default` is passed to json.dump, for objects json can't write by itself (like book_records.record_to_json).
+    """
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=folder)  # Same folder, so rename is atomic
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=indent, default=default)
+            file.flush()
+            os.fsync(file.fileno())  # Make sure the bytes are on disk before the rename makes them visible
+        os.chmod(tmp_path, _file_mode(filename))  # mkstemp makes the file 0600; keep the mode the data file had
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(folder)
+
+
+def _file_mode(filename):
+    """
+    Return the permission bits of `filename`, or the mode a plain open() would give a new file if it doesn't exist.
+    """
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)  # The only way to read the umask is to set it, so put it straight back
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _fsync_dir(folder):
+    """
+    Flush a folder's entries to disk, so a rename inside it is durable. Skipped where folders can't be opened (Windows).
+    """
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Some file systems don't support fsync on a folder; the rename has still happened
+    finally:
+        os.close(fd)
+
+
+class AppendLog:
+    """
+    A JSON-lines log of added records. Each line is {"op": "book" | "review", "data": {...}}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = None  # Number of entries in the file (None until counted or replayed)
+
+    def append(self, op, record):
+        """
+        Append one entry and force it to disk. Returns the number of entries now in the log.
+        """
+        return self.append_many([(op, record)])
+
+    def append_many(self, entries):
+        """
+        Append several (op, record) entries with one write and one fsync (a group commit), so a batch costs about
+        the same as a single entry. Returns the number of entries now in the log.
+        """
+        lines = [json.dumps({"op": op, "data": record}, separators=(",", ":")) + "\n" for op, record in entries]
+        if not lines:
+            return self.count
+        if self._ends_with_torn_line():
+            lines.insert(0, "\n")  # Terminate a half-written line from a crash so it can't swallow these entries
+        with open(self.path, "a") as file:
+            file.write("".join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+        if self.count is None:
+            self.count = sum(1 for _ in self.entries())
+        else:
+            self.count += len(entries)
+        return self.count
+
+    def _ends_with_torn_line(self):
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                if file.tell() == 0:
+                    return False
+                file.seek(-1, os.SEEK_END)
+                return file.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def entries(self):
+        """
+        Yield (op, record) pairs in the order they were written. A torn (unparseable) last line is skipped.
+        """
+        count = 0
+        try:
+            file = open(self.path, "r")
+        except FileNotFoundError:
+            self.count = 0
+            return
+        with file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break  # Last write never finished; it was never acknowledged, so drop it
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Corrupt line in the middle: skip it rather than lose everything after it
+                count += 1
+                yield entry.get("op"), entry.get("data")
+        self.count = count
+
+    def clear(self):
+        """
+        Remove the log (after its contents were compacted into the data file).
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.count = 0
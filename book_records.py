@@ -0,0 +1,271 @@
+# Explanation of this module
+# Typed records for books and reviews. The data file stores numbers as strings ("aiMetric": "88", "releaseYear": "2023")
+# and every query used to convert them again (int(...), str(...).strip()). Book and Review parse those fields once,
+# when a record is loaded or added, and keep the results as plain attributes, so queries compare ints directly.
+# - __slots__ instead of a per-record dict: a book is a handful of pointers instead of two dicts and a list
+# - publishers are shared: every book from ("Penguin", "UK") points at the same Publisher object. The table of shared
+#   publishers only holds weak references, so a publisher no book uses any more is dropped instead of kept forever
+# - genre names, authors, reviewers and review dates are interned, so each distinct string is stored once
+# - from_dict() / to_dict() convert to and from the JSON schema of data_file_assgt-01.json without losing anything:
+#   values the typed fields can't reproduce exactly (an aiMetric of "abc", a bookId stored as a number, a missing
+#   key, an extra key) are remembered as they were and written back unchanged
+
+# Import sys for string interning
+import sys
+# Import weakref so the shared publisher table doesn't keep unused publishers alive
+import weakref
+
+MISSING = object()  # Marks a JSON key that the original record didn't have
+
+# aiMetric values that are missing or not numbers are indexed as 101 so a normal 0-100 threshold never matches them
+INVALID_AI_METRIC = 101
+
+
+def normalize_id(value):
+    """
+    Turn a bookId/reviewId into the string form used as an index key.
+    The sample data stores ids as strings, but this also accepts ints and strips stray spaces.
+    """
+    return str(value if value is not None else "").strip()
+
+
+def normalize_year(value):
+    """
+    Turn a releaseYear into the string form used by the year index ("2023" and 2023 both become "2023").
+    """
+    return str(value if value is not None else "").strip()
+
+
+def parse_int(value):
+    """
+    Parse a number stored as a string (or an int) to an int, or None if it isn't one.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def ai_metric_value(value):
+    """
+    Parse an aiMetric (stored as a string in the JSON) to an int, or INVALID_AI_METRIC if it isn't a number.
+    """
+    number = parse_int(value)
+    return number if number is not None else INVALID_AI_METRIC
+
+
+def id_number(value):
+    """
+    Return the numeric value of an id, or None if it isn't a whole number.
+    Used to keep the running max-id counters without crashing on odd ids.
+    """
+    try:
+        return int(normalize_id(value))
+    except ValueError:
+        return None
+
+
+def _text(value):
+    # Text fields: keep strings as they are, anything else becomes a string ("" for missing)
+    if isinstance(value, str):
+        return value
+    return "" if value is None else str(value)
+
+
+def _interned(value):
+    return sys.intern(value if type(value) is str else _text(value))
+
+
+def _same(value, canonical):
+    # Exact JSON equality of an original value and its canonical form: 88 and "88" differ, and so do 1, 1.0 and True.
+    # Canonical lists hold only str/int/None and canonical dicts only str, so an equal list can only hide a float or
+    # a bool where the canonical list has an int; nothing else needs a per-item check
+    if type(value) is not type(canonical) or value != canonical:
+        return False
+    if type(value) is list:
+        return not any(type(item) is float or type(item) is bool for item in value)
+    return True
+
+
+class _Record:
+    """
+    Shared JSON conversion for Book and Review. Subclasses build the canonical JSON dict from their typed
+    fields (_canonical); anything in the original record that differs from it is kept in _raw.
+    """
+    __slots__ = ()
+    _NUMBER_KEYS = ()  # Canonical fields holding ints, where an equal original value may still be a float or a bool
+
+    def _remember_originals(self, data):
+        canonical = self._canonical()
+        if data == canonical and all(_same(data[key], canonical[key]) for key in self._NUMBER_KEYS):
+            self._raw = None  # The usual case, settled by one dict comparison in C
+            return
+        raw = {key: value for key, value in data.items() if key not in canonical or not _same(value, canonical[key])}
+        for key in canonical:
+            if key not in data:
+                raw[key] = MISSING
+        self._raw = raw or None
+
+    def to_dict(self):
+        """
+        The record in the JSON schema, exactly as it was loaded (plus any changes made through add_book/add_review).
+        """
+        data = self._canonical()
+        if self._raw:
+            for key, value in self._raw.items():
+                if value is MISSING:
+                    del data[key]
+                else:
+                    data[key] = value
+        return data
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # Mutable value objects, like the dicts they replace
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Publisher:
+    """
+    A publisher name and location. Use Publisher.shared() so equal publishers are one object.
+    """
+    __slots__ = ("name", "location", "__weakref__")
+    _shared = weakref.WeakValueDictionary()  # (name, location) -> Publisher, while some book still refers to it
+
+    def __init__(self, name, location):
+        self.name = name
+        self.location = location
+
+    @classmethod
+    def shared(cls, name, location):
+        key = (_text(name), _text(location))
+        publisher = cls._shared.get(key)
+        if publisher is None:
+            publisher = cls._shared[key] = cls(sys.intern(key[0]), sys.intern(key[1]))
+        return publisher
+
+    def to_dict(self):
+        return {"publisherName": self.name, "location": self.location}
+
+
+class Book(_Record):
+    """
+    One book. ai_metric, release_year and pages are ints (None if missing or not a number); sales is a tuple of
+    ints (None for a figure that isn't a number); genres is a tuple of interned strings.
+    """
+    __slots__ = ("book_id", "title", "ai_metric", "release_year", "author", "genres", "publisher", "pages", "sales",
+                 "_raw")
+    _NUMBER_KEYS = ("pages", "sales")
+
+    @classmethod
+    def from_dict(cls, data):
+        book = cls.__new__(cls)
+        book.book_id = normalize_id(data.get("bookId"))
+        book.title = _text(data.get("title"))
+        book.ai_metric = parse_int(data.get("aiMetric"))
+        book.release_year = parse_int(data.get("releaseYear"))
+        book.author = _interned(data.get("author"))
+        genres = data.get("genres")
+        book.genres = tuple(map(_interned, genres)) if isinstance(genres, list) else ()
+        publisher = data.get("publisher")
+        publisher = publisher if isinstance(publisher, dict) else {}
+        book.publisher = Publisher.shared(publisher.get("publisherName"), publisher.get("location"))
+        book.pages = parse_int(data.get("pages"))
+        sales = data.get("sales")
+        book.sales = tuple(map(parse_int, sales)) if isinstance(sales, list) else ()
+        book._remember_originals(data)
+        return book
+
+    def _canonical(self):
+        return {
+            "bookId": self.book_id,
+            "title": self.title,
+            "aiMetric": str(self.ai_metric) if self.ai_metric is not None else None,
+            "releaseYear": str(self.release_year) if self.release_year is not None else None,
+            "author": self.author,
+            "genres": list(self.genres),
+            "publisher": self.publisher.to_dict(),
+            "pages": self.pages,
+            "sales": list(self.sales),
+        }
+
+    # The fields as the JSON file spells them (for display and for the string-keyed indexes)
+    @property
+    def ai_metric_text(self):
+        return _text(self._original("aiMetric", self.ai_metric))
+
+    @property
+    def release_year_text(self):
+        return _text(self._original("releaseYear", self.release_year))
+
+    @property
+    def sales_json(self):
+        # The sales list as the JSON file spells it (figures that aren't numbers stay as they were)
+        return self._original("sales", list(self.sales)) or []
+
+    @property
+    def ai_metric_rank(self):
+        # aiMetric for sorting and thresholds; missing/invalid values sort after every real one
+        return self.ai_metric if self.ai_metric is not None else INVALID_AI_METRIC
+
+    def _original(self, key, parsed):
+        if self._raw and key in self._raw:
+            value = self._raw[key]
+            return None if value is MISSING else value
+        return parsed
+
+
+class Review(_Record):
+    """
+    One review. Reviewer names and dates repeat a lot, so they are interned.
+    """
+    __slots__ = ("review_id", "author", "date", "text", "book_id", "_raw")
+
+    @classmethod
+    def from_dict(cls, data):
+        review = cls.__new__(cls)
+        review.review_id = normalize_id(data.get("reviewId"))
+        review.author = _interned(data.get("reviewAuthor"))
+        review.date = _interned(data.get("reviewDate"))
+        review.text = _text(data.get("reviewText"))
+        review.book_id = normalize_id(data.get("bookId"))
+        review._remember_originals(data)
+        return review
+
+    def _canonical(self):
+        return {
+            "reviewId": self.review_id,
+            "reviewAuthor": self.author,
+            "reviewDate": self.date,
+            "reviewText": self.text,
+            "bookId": self.book_id,
+        }
+
+
+def as_book(record):
+    """
+    Return `record` as a Book (dicts from JSON are converted; Books are returned as they are).
+    """
+    return record if isinstance(record, Book) else Book.from_dict(record)
+
+
+def as_review(record):
+    """
+    Return `record` as a Review (dicts from JSON are converted; Reviews are returned as they are).
+    """
+    return record if isinstance(record, Review) else Review.from_dict(record)
+
+
+def record_to_json(value):
+    """
+    json.dump(..., default=record_to_json) writes Book/Review/Publisher objects in the JSON schema,
+    one at a time, without building a dict copy of the whole catalog first.
+    """
+    if isinstance(value, (_Record, Publisher)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,91 @@
+# Explanation of this module
+# Output helpers for display_books / display_reviews. Printing a catalog used to take one print() call per line
+# (about 10 per book, 6 per review), and each of those is a separate write to the terminal. For a big catalog the
+# time goes into those writes, not into the data. This module instead:
+# - formats each record as one string (the same lines display_books/display_reviews always printed)
+# - collects CHUNK_SIZE records in a list and writes them to the stream with a single write() call
+# - can skip the first `offset` records and stop after `limit`, so you can look at one slice of a big catalog
+# - can pause every `page_size` records and ask whether to continue (interactive paging)
+# - can write JSON Lines (one JSON object per line) instead of text, for piping into other tools
+#   (e.g. `python book_assgt.py --dump books --format jsonl | jq .title`)
+
+# Import json for the JSON Lines output
+# Import sys for the default output stream
+# Import islice to apply offset/limit without copying the records
+import json
+import sys
+from itertools import islice
+from book_records import record_to_json
+
+CHUNK_SIZE = 500  # Records formatted per write() call
+SEPARATOR = "-" * 40 + "\n"
+TEXT = "text"
+JSONL = "jsonl"
+FORMATS = (TEXT, JSONL)
+
+
+def format_book(book):
+    """
+    The text block display_books prints for one book.
+    """
+    return (f"ID: {book.book_id}\n"
+            f"Title: {book.title}\n"
+            f"Author: {book.author}\n"
+            f"Release Year: {book.release_year_text}\n"
+            f"AI Metric: {book.ai_metric_text}\n"
+            f"Genres: {', '.join(book.genres)}\n"
+            f"Publisher: {book.publisher.name} ({book.publisher.location})\n"
+            f"Pages: {book.pages}\n"
+            f"Sales: {list(book.sales)}\n"
+            + SEPARATOR)
+
+
+def format_review(review, book_title):
+    """
+    The text block display_reviews prints for one review.
+    """
+    return (f"Review ID: {review.review_id}\n"
+            f"Book: {book_title} (ID: {review.book_id})\n"
+            f"Author: {review.author}\n"
+            f"Date: {review.date}\n"
+            f"Review: {review.text}\n"
+            + SEPARATOR)
+
+
+def format_jsonl(record):
+    return json.dumps(record, ensure_ascii=False, default=record_to_json) + "\n"
+
+
+def _continue_prompt(shown):
+    answer = input(f"-- {shown} shown. Press Enter for more, or q to stop: ")
+    return answer.strip().lower() not in ("q", "quit")
+
+
+def render(records, formatter, stream=None, offset=0, limit=None, page_size=None, chunk_size=CHUNK_SIZE,
+           ask_more=_continue_prompt):
+    """
+    Write formatter(record) for each record, CHUNK_SIZE records per write() call.
+    - offset / limit: skip the first `offset` records, then write at most `limit` (None = all)
+    - page_size: after every `page_size` records, flush and call ask_more(records shown so far); stop if it says no
+    Returns the number of records written.
+    """
+    stream = stream if stream is not None else sys.stdout
+    end = offset + limit if limit is not None else None
+    pending = []
+    shown = 0
+    for record in islice(records, offset, end):
+        if page_size and shown and shown % page_size == 0:  # A full page is out and there is more to show
+            stream.write("".join(pending))
+            pending.clear()
+            stream.flush()
+            if not ask_more(shown):
+                break
+        pending.append(formatter(record))
+        shown += 1
+        if len(pending) >= chunk_size:
+            stream.write("".join(pending))
+            pending.clear()
+    if pending:
+        stream.write("".join(pending))
+    stream.flush()
+    return shown
@@ -0,0 +1,186 @@
+# Explanation of this module
+# Sales analytics for the Book Review Management System. Every book has "sales": a list of yearly sales figures, the
+# first one for the release year, the next for the year after, and so on. The lists have different lengths ("ragged").
+# SalesMatrix packs all of them into one flat array of numbers laid out as a table (one row per book, one column per
+# year since release), padding short rows with 0 and keeping a mask that says which cells are real figures.
+# With everything in one contiguous array, whole columns and rows are array slices, and sums over them run in C:
+#   row i    = values[i * width:(i + 1) * width]
+#   column j = values[j::width]
+# On top of that it computes totals and means per book, year-over-year growth, top-N sellers, and rollups per genre
+# and per calendar year (releaseYear + column). Results are computed once and kept; the catalog drops the whole
+# SalesMatrix when a book is added, so the next question rebuilds it from the current books.
+# numpy would do the same job, but it isn't a dependency of this project, so only the standard library is used.
+
+# Import math for NaN and the compound growth formula
+# Import array for the packed matrix and mask
+# Import heapq for top-N without sorting every book
+import math
+from array import array
+import heapq
+
+NO_YEAR = -1  # Start year of books whose releaseYear isn't a number (they are left out of the per-year rollup)
+
+
+class SalesMatrix:
+    """
+    All books' yearly sales packed into one padded row-major matrix with a mask.
+    The matrix is a snapshot of the books it was built from; build a new one when books change.
+    """
+
+    def __init__(self, books):
+        self.books = list(books)
+        series = [book.sales for book in self.books]  # Figures are ints already, None where one isn't a number
+        self.rows = len(series)
+        self.width = max((len(figures) for figures in series), default=0)
+        width = self.width
+        self.values = array("q", bytes(8 * self.rows * width))  # Padded cells stay 0
+        self.mask = bytearray(self.rows * width)  # 1 where the cell holds a real figure
+        self.lengths = array("I")  # Number of cells in each row up to the last real figure
+        self.start_years = array("i")  # Release year of each row (NO_YEAR if unknown)
+        for row, figures in enumerate(series):
+            base = row * width
+            for column, figure in enumerate(figures):
+                if figure is not None:
+                    self.values[base + column] = figure
+                    self.mask[base + column] = 1
+            self.lengths.append(len(figures))
+            year = self.books[row].release_year
+            self.start_years.append(year if year is not None else NO_YEAR)
+        self._cache = {}  # Name of a result -> the result, filled in on first use
+
+    def _cached(self, name, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def row(self, index):
+        return self.values[index * self.width:(index + 1) * self.width]
+
+    def column(self, index):
+        return self.values[index::self.width]
+
+    # Per-book figures
+    def totals(self):
+        """
+        Total sales of every book (array, in book order). Padding is 0, so a row sum needs no mask.
+        """
+        return self._cached("totals", lambda: array("q", (sum(self.row(i)) for i in range(self.rows))))
+
+    def counts(self):
+        """
+        Number of real yearly figures per book (array, in book order).
+        """
+        return self._cached("counts", lambda: array(
+            "I", (self.mask[i * self.width:(i + 1) * self.width].count(1) for i in range(self.rows))))
+
+    def means(self):
+        """
+        Mean yearly sales of every book (NaN for a book without figures).
+        """
+        def compute():
+            return array("d", (total / count if count else math.nan
+                               for total, count in zip(self.totals(), self.counts())))
+        return self._cached("means", compute)
+
+    def growth_rates(self, index):
+        """
+        Year-over-year growth of one book as fractions (0.2 = +20%). A year without a figure, or after a year of
+        zero sales, gives None.
+        """
+        base = index * self.width
+        rates = []
+        for column in range(1, self.lengths[index]):
+            previous, current = base + column - 1, base + column
+            if self.mask[previous] and self.mask[current] and self.values[previous]:
+                rates.append((self.values[current] - self.values[previous]) / self.values[previous])
+            else:
+                rates.append(None)
+        return rates
+
+    def average_growth(self):
+        """
+        Compound annual growth rate of every book from its first to its last figure (NaN when undefined).
+        """
+        def compute():
+            result = array("d")
+            for i in range(self.rows):
+                base, length = i * self.width, self.lengths[i]
+                if length < 2 or not (self.mask[base] and self.mask[base + length - 1]):
+                    result.append(math.nan)
+                    continue
+                first, last = self.values[base], self.values[base + length - 1]
+                if first <= 0 or last < 0:
+                    result.append(math.nan)
+                else:
+                    result.append((last / first) ** (1 / (length - 1)) - 1)
+            return result
+        return self._cached("average_growth", compute)
+
+    # Whole-catalog figures
+    def grand_total(self):
+        return self._cached("grand_total", lambda: sum(self.values))
+
+    def mean_per_book(self):
+        # Average total sales per book, over books that have at least one figure
+        with_sales = sum(1 for count in self.counts() if count)
+        return self.grand_total() / with_sales if with_sales else 0.0
+
+    def column_totals(self):
+        """
+        Sales summed by year since release: [all first years, all second years, ...]. One C-level sum per column.
+        """
+        return self._cached("column_totals", lambda: [sum(self.column(j)) for j in range(self.width)])
+
+    def top_seller_rows(self, n):
+        """
+        Return the row numbers of the top `n` sellers, best first (ties: book added earlier comes first).
+        """
+        totals = self.totals()
+        return heapq.nlargest(n, range(self.rows), key=lambda i: (totals[i], -i))
+
+    def top_sellers(self, n):
+        """
+        Return the top `n` (book, total sales) pairs, best first.
+        """
+        totals = self.totals()
+        return [(self.books[i], totals[i]) for i in self.top_seller_rows(n)]
+
+    def by_genre(self):
+        """
+        Return {genre: total sales} over all books with that genre (a book with two genres counts in both).
+        Genres are matched ignoring case, like the catalog's genre facet, and keep the first spelling seen.
+        """
+        def compute():
+            totals, labels = {}, {}
+            for book, total in zip(self.books, self.totals()):
+                for genre in book.genres:
+                    label = genre.strip()
+                    labels.setdefault(label.casefold(), label)
+                for key in dict.fromkeys(genre.strip().casefold() for genre in book.genres):  # Once per book, in order
+                    if key:
+                        totals[key] = totals.get(key, 0) + total
+            return {labels[key]: total for key, total in totals.items()}
+        return self._cached("by_genre", compute)
+
+    def by_year(self):
+        """
+        Return {calendar year: total sales} (release year + years since release), oldest year first.
+        """
+        def compute():
+            rollup = {}
+            # Group rows by release year first; each group's yearly sums then come from its rows' slices
+            rows_by_start = {}
+            for i, start in enumerate(self.start_years):
+                if start != NO_YEAR:
+                    rows_by_start.setdefault(start, []).append(i)
+            width = self.width
+            for start, rows in rows_by_start.items():
+                block = array("q")  # The group's rows copied into their own matrix, so columns are slices again
+                for i in rows:
+                    block.extend(self.row(i))
+                for column in range(width):
+                    total = sum(block[column::width])
+                    if total:
+                        rollup[start + column] = rollup.get(start + column, 0) + total
+            return dict(sorted(rollup.items()))
+        return self._cached("by_year", compute)
@@ -0,0 +1,111 @@
+# Explanation of this module
+# A small full-text search engine for the Book Review Management System, kept entirely in memory:
+# - tokenize(): lower-case words and numbers ("AI-generated" -> "ai", "generated"); very common English words are dropped
+# - an inverted index: for every word, a posting list of the documents that contain it and how often
+#   A document is one book (its title, author and genres) or one review (its reviewText).
+# - search(): TF-IDF ranking. A word that appears in few documents (high IDF) counts more than one that appears
+#   everywhere, repeats count with diminishing returns (1 + log tf), and title/author/genre hits are weighted above
+#   review text. Long documents are scaled down a little so they don't win just by being long.
+# Posting lists are compact arrays of numbers instead of dictionaries, so hundreds of thousands of reviews fit in a few
+# tens of MB, and a query only walks the posting lists of its own words. Adding a book or review appends to the lists of
+# its words, so the index never has to be rebuilt while the program runs.
+
+# Import re for splitting text into words
+# Import math for the logarithms in the ranking formula
+# Import array for compact posting lists
+# Import Counter to count words per document (the counting loop runs in C)
+# Import heapq to pick the best N results without sorting every match
+import re
+import math
+from array import array
+from collections import Counter
+import heapq
+
+TOKEN = re.compile(r"[^\W_]+")  # Runs of letters/digits in any language; punctuation and "_" split words
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i in is it its of on or she so that the their them they
+this to was were which with you
+""".split())
+
+# How much one occurrence of a word counts in each field (attribute names of Book / Review, see book_records.py)
+FIELD_WEIGHTS = {"title": 3, "author": 2, "genres": 2, "text": 1}
+BOOK_FIELDS = ("title", "author", "genres")
+REVIEW_FIELDS = ("text",)
+
+BOOK = "book"
+REVIEW = "review"
+
+
+def tokenize(text):
+    """
+    Split text into lower-case words, dropping stopwords. Lists (like genres) are tokenized item by item.
+    """
+    if isinstance(text, (list, tuple)):
+        return [token for item in text for token in tokenize(item)]
+    if not text:
+        return []
+    return [word for word in TOKEN.findall(str(text).lower()) if word not in STOPWORDS]
+
+
+class SearchIndex:
+    """
+    Inverted index over books and reviews with TF-IDF ranked search.
+    """
+
+    def __init__(self):
+        self._docs = []  # document number -> (BOOK or REVIEW, Book or Review)
+        self._postings = {}  # word -> (array of document numbers, array of term weights)
+
+    def __len__(self):
+        return len(self._docs)
+
+    # Functions to add documents (called by the catalog whenever a book or review is added)
+    def add_book(self, book):
+        self._add(BOOK, book, BOOK_FIELDS)
+
+    def add_review(self, review):
+        self._add(REVIEW, review, REVIEW_FIELDS)
+
+    def _add(self, kind, record, fields):
+        doc = len(self._docs)
+        self._docs.append((kind, record))
+        counts = Counter()
+        for field in fields:
+            counts.update(tokenize(getattr(record, field)) * FIELD_WEIGHTS[field])  # A title word counts 3 times
+        inverse_norm = max(1, sum(counts.values())) ** -0.25  # Gentle: divide by the fourth root of the length
+        postings = self._postings
+        log = math.log
+        # The TF part of the score, (1 + log tf) / norm, is fixed once the document is added, so it is stored
+        # precomputed and a query only multiplies it by the word's current IDF
+        for word, count in counts.items():
+            try:
+                docs, weights = postings[word]
+            except KeyError:
+                docs, weights = postings[word] = (array("I"), array("f"))
+            docs.append(doc)
+            weights.append(inverse_norm if count == 1 else (1.0 + log(count)) * inverse_norm)
+
+    # Function to search
+    def search(self, query, limit=10):
+        """
+        Return up to `limit` (score, kind, record) tuples for the documents that best match `query`,
+        highest score first. kind is "book" or "review". Documents need at least one of the query words.
+        """
+        total = len(self._docs)
+        postings = [self._postings[word] for word in set(tokenize(query)) if word in self._postings]
+        if not postings:
+            return []
+        postings.sort(key=lambda posting: len(posting[0]), reverse=True)
+        # The longest posting list seeds the score table in one C-level dict(zip(...)); only the shorter lists are
+        # walked in Python. Common words have the longest lists, so that's where the time would otherwise go.
+        docs, weights = postings[0]
+        idf = math.log(1 + total / len(docs))
+        scores = dict(zip(docs, map(idf.__mul__, weights)))
+        get = scores.get
+        for docs, weights in postings[1:]:
+            idf = math.log(1 + total / len(docs))
+            for doc, weight in zip(docs, weights):
+                scores[doc] = get(doc, 0.0) + weight * idf
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))  # Ties: older first
+        return [(score, *self._docs[doc]) for doc, score in best]
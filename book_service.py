@@ -0,0 +1,485 @@
+# Explanation of this module
+# A small asyncio service that lets many clients submit reviews at the same time, instead of the one-user input() flow
+# of book_assgt.add_review. It speaks plain HTTP/1.1 with JSON bodies, on localhost TCP or on a Unix socket:
+#   POST /reviews                   one review object, or a list of them
+#   GET  /books?offset=0&limit=100  books in insertion order          GET /books/{bookId}           one book
+#   GET  /books/{bookId}/reviews    the reviews of one book           GET /reviews?offset=&limit=   reviews
+#   GET  /query/year/{year}         same queries as `book_assgt.py query ...`
+#   GET  /query/ai-lt/{n}           GET /query/with-reviews           GET /query/most-reviewed?n=10
+#   GET  /search?q=words&limit=10   full-text search                  GET /stats                    counters
+# Submitted reviews are checked the same way as `reviews import` (the bookId must be in the catalog index, reviewIds
+# must be new, a missing reviewId gets the next free one). They are not written one by one: a single writer task
+# collects whatever arrived within a few milliseconds (up to BATCH_SIZE reviews), adds them to the catalog, appends the
+# whole batch to the change log with one write and one fsync (book_journal.AppendLog.append_many), and only then answers
+# the waiting clients. So a review is on disk before it is acknowledged, and 100 concurrent submissions cost one fsync
+# instead of 100. In --db mode the batch is one SQLite transaction instead. Folding the change log into the data file
+# rewrites the whole file and pauses every client meanwhile, so the service does it every COMPACT_EVERY reviews (much
+# less often than the menu does) and on shutdown. Everything runs on one event loop thread,
+# so the catalog never sees two writers at once.
+# `python book_service.py bench` is the bundled load generator: it opens N keep-alive connections, sends a mix of
+# review submissions and reads, and prints throughput and latency percentiles.
+#
+#   python book_service.py serve --data copy_of_data.json --port 8765
+#   python book_service.py bench --port 8765 --requests 20000 --concurrency 50
+
+# Import argparse for the serve / bench command line
+# Import asyncio for the server, the batching writer and the load generator
+# Import contextlib to wait for the cancelled writer task without re-raising its CancelledError
+# Import json for request and response bodies
+# Import random and time for the load generator's traffic mix and latency measurements
+# Import signal to shut down cleanly (flushing pending reviews) on Ctrl+C / SIGTERM
+# Import sys for the exit code
+# Import urllib.parse to split request paths and query strings
+# Import book_assgt for the catalog, loading/saving, and the same review checks as `reviews import`
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import signal
+import sys
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+import book_assgt as app
+from book_catalog import SEARCH_LIMIT
+from book_journal import AppendLog, log_path_for
+from book_records import record_to_json
+
+HOST = "127.0.0.1"
+PORT = 8765
+BATCH_SIZE = 256  # Most reviews committed together
+BATCH_DELAY = 0.002  # Seconds the writer waits after the first review of a batch, so concurrent submissions can join it
+COMPACT_EVERY = 50_000  # Logged reviews before the data file is rewritten (book_assgt.COMPACT_EVERY is for the menu)
+MAX_BODY = 1 << 20  # Largest request body accepted (bytes)
+DEFAULT_LIMIT = 100  # Records per page when a list request doesn't give ?limit=
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    """
+    Raised by a route to answer with an error status and {"error": message}.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False, default=record_to_json).encode()
+
+
+def _int_param(params, name, default):
+    value = params.get(name, [None])[0]
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HttpError(400, f"{name} must be a whole number") from None
+    if number < 0:
+        raise HttpError(400, f"{name} must not be negative")
+    return number
+
+
+class ReviewService:
+    """
+    The HTTP front end plus the batching review writer. One instance serves one catalog (book_assgt.catalog).
+    """
+
+    def __init__(self, filename=app.DATA_FILE, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY,
+                 compact_every=COMPACT_EVERY):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.compact_every = compact_every
+        self._queue = asyncio.Queue()  # (review dict, future) pairs waiting for the writer
+        self._writer = None  # The writer task, while the service runs
+        self._batch = []  # Reviews the writer has taken off the queue but not committed yet
+        self.started = time.monotonic()
+        self.requests = 0  # Requests answered
+        self.accepted = 0  # Reviews committed
+        self.rejected = 0  # Reviews refused by validation
+        self.batches = 0  # Group commits done
+
+    # Functions to submit and commit reviews
+    async def submit(self, review):
+        """
+        Queue one review and wait until its batch is committed. Returns the stored review dict.
+        Raises HttpError(422) if the review is rejected (unknown bookId, duplicate reviewId, not an object).
+        """
+        if self._writer is None or self._writer.done():
+            raise HttpError(503, "The service is shutting down")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((review, future))
+        return await future
+
+    async def _write_batches(self):
+        while True:
+            self._batch = [await self._queue.get()]
+            await asyncio.sleep(self.batch_delay)  # Let other clients' reviews arrive and share this commit
+            while len(self._batch) < self.batch_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            batch, self._batch = self._batch, []
+            self._commit(batch)
+
+    def _commit(self, batch):
+        # Runs on the event loop thread, between requests, so nothing else touches the catalog meanwhile.
+        # The whole batch is checked first and written to the change log before the catalog changes, so a failed
+        # write leaves the catalog as it was and no client is told "500" about a review that was stored anyway.
+        accepted, claimed = [], set()
+        try:
+            for review, future in batch:
+                if future.cancelled():  # The client went away before its turn; don't store an unanswered review
+                    continue
+                problem = app.prepare_imported_review(review, claimed)
+                if problem:
+                    self.rejected += 1
+                    future.set_exception(HttpError(422, problem))
+                    continue
+                claimed.add(review["reviewId"])
+                accepted.append((review, future))
+            logged = 0
+            if accepted and not app.using_database():
+                logged = self._append_to_log([review for review, _ in accepted])
+            with app.catalog.batch():  # One transaction in --db mode; no index rebuild for reviews in JSON mode
+                for review, _ in accepted:
+                    app.catalog.add_review(review)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(HttpError(500, f"Could not store the review: {e}"))
+            return
+        if logged is None or logged >= self.compact_every:
+            app.save_data(self.filename)  # Now that the catalog holds the batch
+        self.batches += 1
+        self.accepted += len(accepted)
+        for review, future in accepted:
+            future.set_result(review)
+
+    def _append_to_log(self, reviews):
+        # Returns the number of entries now in the log, or None if it couldn't be written (the caller then saves the
+        # full data file instead, the same fallback as record_change)
+        try:
+            return app.log_for(self.filename).append_many([("review", review) for review in reviews])
+        except OSError as e:
+            print(f"Error writing change log ({e}). Saving the full data file instead.")
+            return None
+
+    async def _drain(self):
+        # Commit whatever is still queued (used on shutdown, after the writer task was cancelled)
+        batch, self._batch = self._batch, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            self._commit(batch)
+
+    # Functions for the HTTP side
+    async def handle(self, reader, writer):
+        """
+        Serve one client connection (HTTP/1.1 keep-alive: many requests per connection).
+        """
+        try:
+            while True:
+                keep_alive = False  # Until a request line and headers were read successfully
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, keep_alive, body = request
+                    status, payload = await self.route(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    if e.status in (400, 413):  # The rest of the stream can't be trusted to start at a request
+                        keep_alive = False
+                self.requests += 1
+                data = _json_bytes(payload)
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        # Returns (method, target, keep_alive, body bytes), or None when the client closed the connection
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length") from None
+        if length > MAX_BODY:
+            raise HttpError(413, f"Request bodies are limited to {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+        return method.upper(), target, keep_alive, body
+
+    async def route(self, method, target, body):
+        """
+        Dispatch one request. Returns (status, JSON payload) or raises HttpError.
+        """
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        params = parse_qs(url.query)
+        if parts == ["reviews"] and method == "POST":
+            return await self._post_reviews(body)
+        if method != "GET":
+            raise HttpError(405, f"{method} is not supported here")
+        catalog = app.catalog
+        offset, limit = _int_param(params, "offset", 0), _int_param(params, "limit", DEFAULT_LIMIT)
+        if parts == ["books"]:
+            return 200, {"total": catalog.book_count(), "items": list(catalog.iter_books(offset, limit))}
+        if parts == ["reviews"]:
+            return 200, {"total": catalog.review_total(), "items": list(catalog.iter_reviews(offset, limit))}
+        if len(parts) in (2, 3) and parts[0] == "books":
+            book = catalog.get_book(parts[1])
+            if book is None:
+                raise HttpError(404, f"Unknown bookId: {parts[1]}")
+            if len(parts) == 2:
+                return 200, book
+            if parts[2] == "reviews":
+                return 200, list(catalog.reviews_for(parts[1]))
+        if parts == ["search"]:
+            text = params.get("q", [""])[0].strip()
+            if not text:
+                raise HttpError(400, "q (the search words) is required")
+            results = catalog.search(text, limit=_int_param(params, "limit", SEARCH_LIMIT))
+            return 200, [{"book": book, "review": review} for book, review in results]
+        if parts == ["stats"]:
+            return 200, self.stats()
+        if parts[:1] == ["query"]:
+            return 200, self._query(parts[1:], params)
+        raise HttpError(404, f"No route for {url.path}")
+
+    def _query(self, parts, params):
+        catalog = app.catalog
+        if len(parts) == 2 and parts[0] == "year":
+            if not parts[1].isdigit():
+                raise HttpError(400, "year must be a number like 2023")
+            return catalog.books_by_year(parts[1])
+        if len(parts) == 2 and parts[0] == "ai-lt":
+            try:
+                return catalog.books_with_ai_metric_below(int(parts[1]))
+            except ValueError:
+                raise HttpError(400, "the AI metric threshold must be a whole number") from None
+        if parts == ["with-reviews"]:
+            return [{"book": book, "reviews": count} for book, count in catalog.books_with_reviews()]
+        if parts == ["most-reviewed"]:
+            n = _int_param(params, "n", 10)
+            return [{"book": book, "reviews": count} for book, count in catalog.most_reviewed(n)]
+        raise HttpError(404, f"Unknown query: {'/'.join(parts) or '(none)'}")
+
+    async def _post_reviews(self, body):
+        try:
+            data = json.loads(body or b"null")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise HttpError(400, f"Invalid JSON: {e}") from None
+        if not isinstance(data, list):
+            return 201, await self.submit(data)
+        # A list: submit them all at once so they share batches, and report each one
+        results = await asyncio.gather(*(self.submit(review) for review in data), return_exceptions=True)
+        accepted, rejected = [], []
+        for index, result in enumerate(results):
+            if isinstance(result, HttpError):
+                rejected.append({"index": index, "error": str(result)})
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                accepted.append(result)
+        return 200, {"accepted": accepted, "rejected": rejected}
+
+    def stats(self):
+        return {
+            "books": app.catalog.book_count(),
+            "reviews": app.catalog.review_total(),
+            "requests": self.requests,
+            "reviewsAccepted": self.accepted,
+            "reviewsRejected": self.rejected,
+            "batches": self.batches,
+            "averageBatch": round(self.accepted / self.batches, 1) if self.batches else 0,
+            "pending": self._queue.qsize() + len(self._batch),
+            "uptimeSeconds": round(time.monotonic() - self.started, 1),
+            "queryCache": app.catalog.query_cache.stats(),
+        }
+
+    # Function to run the service until Ctrl+C / SIGTERM
+    async def serve(self, host=HOST, port=PORT, unix_path=None):
+        """
+        Listen on host:port (or on the Unix socket unix_path) until interrupted, then commit the queued reviews,
+        fold the change log into the data file, and stop.
+        """
+        self._writer = asyncio.create_task(self._write_batches())
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            where = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+        print(f"Review service listening on {where} (Ctrl+C to stop)")
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer  # Let it stop before _drain takes over its half-collected batch
+            await self._drain()
+            if not app.using_database() and app.log_for(self.filename).count:
+                app.save_data(self.filename)
+            print(f"Stopped. {self.accepted} review(s) accepted in {self.batches} batch(es).")
+
+
+# Load generator
+async def _http(reader, writer, method, path, payload=None):
+    # One request on an open keep-alive connection. Returns (status, decoded JSON body)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _connect(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_bench(host=HOST, port=PORT, unix_path=None, requests=10_000, concurrency=50, read_ratio=0.2, seed=1):
+    """
+    Send `requests` requests over `concurrency` keep-alive connections: a `read_ratio` share of reads
+    (GET /books/{id}/reviews) and review submissions for the rest. Prints throughput and latency percentiles and
+    returns them as a dict.
+    """
+    reader, writer = await _connect(host, port, unix_path)
+    _, page = await _http(reader, writer, "GET", "/books?limit=1000")
+    writer.close()
+    book_ids = [book["bookId"] for book in page["items"]]
+    if not book_ids:
+        raise SystemExit("The service has no books to review; add or load some first.")
+    rng = random.Random(seed)
+    plan = [rng.random() < read_ratio for _ in range(requests)]  # True = read, False = review submission
+    latencies = {"read": [], "review": []}
+    statuses = {}
+    next_request = iter(range(requests))
+
+    async def client(number):
+        reader, writer = await _connect(host, port, unix_path)
+        try:
+            for index in next_request:  # Shared iterator: each request is sent by exactly one client
+                book_id = rng.choice(book_ids)
+                started = time.perf_counter()
+                if plan[index]:
+                    kind = "read"
+                    status, _ = await _http(reader, writer, "GET", f"/books/{book_id}/reviews")
+                else:
+                    kind = "review"
+                    status, _ = await _http(reader, writer, "POST", "/reviews", {
+                        "bookId": book_id, "reviewAuthor": f"Load tester {number}",
+                        "reviewText": f"Generated review {index} for load testing."})
+                latencies[kind].append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    result = {"requests": requests, "concurrency": concurrency, "seconds": round(elapsed, 3),
+              "requestsPerSecond": round(requests / elapsed, 1) if elapsed else 0.0, "statuses": statuses}
+    print(f"{requests:,} requests over {concurrency} connections in {elapsed:.2f}s "
+          f"({result['requestsPerSecond']:,.0f} requests/s); statuses {statuses}")
+    for kind, values in latencies.items():
+        values.sort()
+        summary = {name: round(_percentile(values, fraction) * 1000, 2)
+                   for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+        summary["count"] = len(values)
+        result[kind] = summary
+        if values:
+            print(f"  {kind:6} {len(values):>7,}  p50 {summary['p50']:.2f} ms  p95 {summary['p95']:.2f} ms  "
+                  f"p99 {summary['p99']:.2f} ms")
+    return result
+
+
+# Main program
+def main(argv=None):
+    """
+    `serve` runs the review service on the catalog (JSON data file or --db database);
+    `bench` runs the load generator against a running service.
+    """
+    parser = argparse.ArgumentParser(description="Review ingestion service for the Book Review Management System")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for name, help_text in (("serve", "run the service"), ("bench", "send load to a running service")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--host", default=HOST, help=f"address to use (default {HOST})")
+        command.add_argument("--port", type=int, default=PORT, help=f"TCP port (default {PORT})")
+        command.add_argument("--unix", metavar="PATH", help="use a Unix socket at PATH instead of TCP")
+    serve = commands.choices["serve"]
+    serve.add_argument("--data", default=app.DATA_FILE, help=f"JSON data file (default {app.DATA_FILE})")
+    serve.add_argument("--db", metavar="PATH", help="use a SQLite database instead of the JSON file")
+    serve.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="most reviews per commit")
+    serve.add_argument("--batch-delay-ms", type=float, default=BATCH_DELAY * 1000,
+                       help="how long a commit waits for more reviews to join it")
+    serve.add_argument("--compact-every", type=int, default=COMPACT_EVERY,
+                       help="logged reviews before the data file is rewritten")
+    bench = commands.choices["bench"]
+    bench.add_argument("--requests", type=int, default=10_000, help="total requests to send")
+    bench.add_argument("--concurrency", type=int, default=50, help="parallel connections")
+    bench.add_argument("--read-ratio", type=float, default=0.2, help="share of requests that are reads (0-1)")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        asyncio.run(run_bench(args.host, args.port, args.unix, args.requests, args.concurrency, args.read_ratio))
+        return 0
+    if args.batch_size < 1 or args.batch_delay_ms < 0 or args.compact_every < 1:
+        parser.error("--batch-size and --compact-every must be at least 1, and --batch-delay-ms must not be negative")
+    if args.db:
+        app.use_database(args.db, args.data)
+    else:
+        app.change_log = AppendLog(log_path_for(args.data))  # One log object, so its entry count stays cached
+        app.load_data(args.data)
+    service = ReviewService(args.data, args.batch_size, args.batch_delay_ms / 1000, args.compact_every)
+    asyncio.run(service.serve(args.host, args.port, args.unix))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
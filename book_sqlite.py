@@ -0,0 +1,525 @@
+# Explanation of this module
+# An optional SQLite backend for the Book Review Management System. The JSON file is still the default storage and the
+# exchange format, but with `python book_assgt.py --db books.db` every menu query runs as SQL against a database file:
+# - books and reviews keep the same fields as data_file_assgt-01.json, and get_book()/iter_reviews() return the same
+#   Book / Review records as Catalog (book_records.py)
+# - publisher and genres are normalized: one row per distinct publisher (name + location) and per distinct genre name,
+#   and a book_genres table that links books to genres in their original order
+# - indexes on bookId, releaseYear and aiMetric (as a number) back the "by id", "by year" and "AI metric below" queries,
+#   and an index on reviewDate lists reviews by date without sorting them
+# - an FTS5 full-text index over book titles and review text (kept in sync by triggers) backs search()
+# SqliteCatalog has the same query methods as Catalog (book_catalog.py), so book_assgt.py can use either one.
+# Query results are cached per version like Catalog's (book_cache.py). The version only counts changes made through
+# this SqliteCatalog, so another program writing to the same database file isn't noticed until the next add here.
+# import_json() is the migration from the JSON file (plus its change log); export_data() goes the other way for Save.
+
+# Import json for the sales/genres columns and for export
+# Import sqlite3 (standard library) for the database itself
+import json
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from itertools import chain
+from book_catalog import normalize_id, normalize_year, facet_key, id_number, FACETS, SEARCH_LIMIT
+from book_records import Book, Review, as_book, as_review
+from book_stream import iter_events
+from book_sales import SalesMatrix
+from book_cache import QueryCache, cached_query
+from book_join import check_order, group_rows, joined_row
+
+IMPORT_BATCH = 5_000  # Rows inserted per executemany() call during a migration
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publishers (
+    publisherId INTEGER PRIMARY KEY,
+    publisherName TEXT NOT NULL,
+    location TEXT NOT NULL,
+    UNIQUE (publisherName, location)
+);
+CREATE TABLE IF NOT EXISTS genres (
+    genreId INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS books (
+    seq INTEGER PRIMARY KEY,            -- insertion order (also the rowid the FTS index points at)
+    bookId TEXT NOT NULL UNIQUE,        -- UNIQUE gives us the bookId index
+    title TEXT,
+    aiMetric TEXT,                      -- kept exactly as entered, like the JSON file
+    aiMetricValue INTEGER NOT NULL,     -- aiMetric as a number (101 if missing/invalid), for range queries
+    releaseYear TEXT,
+    author TEXT,
+    publisherId INTEGER REFERENCES publishers (publisherId),
+    pages INTEGER,
+    sales TEXT                          -- JSON list of yearly sales
+);
+CREATE INDEX IF NOT EXISTS books_release_year ON books (releaseYear, seq);
+CREATE INDEX IF NOT EXISTS books_ai_metric ON books (aiMetricValue, seq);
+CREATE TABLE IF NOT EXISTS book_genres (
+    bookSeq INTEGER NOT NULL REFERENCES books (seq),
+    position INTEGER NOT NULL,
+    genreId INTEGER NOT NULL REFERENCES genres (genreId),
+    PRIMARY KEY (bookSeq, position)
+);
+CREATE INDEX IF NOT EXISTS book_genres_genre ON book_genres (genreId);
+CREATE TABLE IF NOT EXISTS reviews (
+    seq INTEGER PRIMARY KEY,
+    reviewId TEXT NOT NULL UNIQUE,
+    bookId TEXT NOT NULL,               -- no foreign key: reviews of deleted books are kept, like in the JSON file
+    reviewAuthor TEXT,
+    reviewDate TEXT,
+    reviewText TEXT
+);
+CREATE INDEX IF NOT EXISTS reviews_book_id ON reviews (bookId);
+CREATE INDEX IF NOT EXISTS reviews_date ON reviews (reviewDate, seq);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5 (title, content='books', content_rowid='seq');
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5 (reviewText, content='reviews', content_rowid='seq');
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title) VALUES (new.seq, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title) VALUES ('delete', old.seq, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+    INSERT INTO reviews_fts (rowid, reviewText) VALUES (new.seq, new.reviewText);
+END;
+CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN
+    INSERT INTO reviews_fts (reviews_fts, rowid, reviewText) VALUES ('delete', old.seq, old.reviewText);
+END;
+"""
+
+# Columns for rebuilding a Book. Genres come back as a JSON array in their original order.
+BOOK_COLUMNS = """
+b.bookId, b.title, b.aiMetric, b.releaseYear, b.author, p.publisherName, p.location, b.pages, b.sales,
+(SELECT json_group_array(name) FROM (SELECT g.name FROM book_genres bg JOIN genres g USING (genreId)
+                                     WHERE bg.bookSeq = b.seq ORDER BY bg.position)) AS genres
+"""
+BOOK_FROM = "FROM books b LEFT JOIN publishers p USING (publisherId)"
+BOOK_SELECT = f"SELECT {BOOK_COLUMNS} {BOOK_FROM}"
+# Book columns plus the review count of each reviewed book (books without reviews drop out of the join)
+REVIEWED_SELECT = (f"SELECT {BOOK_COLUMNS}, rc.n {BOOK_FROM}"
+                   " JOIN (SELECT bookId, count(*) AS n FROM reviews GROUP BY bookId) rc ON rc.bookId = b.bookId")
+
+# Facet filters and counts. facet_key() is the same Python function Catalog uses, registered with SQLite, so both
+# backends agree on what counts as the same genre/publisher/location.
+FACET_FILTERS = {
+    "genre": "b.seq IN (SELECT bg.bookSeq FROM book_genres bg JOIN genres g USING (genreId) WHERE facet_key(g.name) = ?)",
+    "publisher": "b.publisherId IN (SELECT publisherId FROM publishers WHERE facet_key(publisherName) = ?)",
+    "location": "b.publisherId IN (SELECT publisherId FROM publishers WHERE facet_key(location) = ?)",
+    "year": "b.releaseYear = ?",
+}
+# facet -> (extra join, group by, first row id, label of that row). The label is the spelling stored first, like Catalog's.
+FACET_COUNTS = {
+    "genre": ("JOIN book_genres bg ON bg.bookSeq = b.seq JOIN genres g USING (genreId)", "facet_key(g.name)",
+              "g.genreId", "(SELECT name FROM genres WHERE genreId = first)"),
+    "publisher": ("", "facet_key(p.publisherName)",
+                  "p.publisherId", "(SELECT publisherName FROM publishers WHERE publisherId = first)"),
+    "location": ("", "facet_key(p.location)",
+                 "p.publisherId", "(SELECT location FROM publishers WHERE publisherId = first)"),
+    "year": ("", "b.releaseYear", "b.releaseYear", "first"),
+}
+
+REVIEW_SELECT = "SELECT r.reviewId, r.reviewAuthor, r.reviewDate, r.reviewText, r.bookId FROM reviews r"
+# Review columns plus the title and author of the reviewed book (NULL for reviews of unknown books)
+JOINED_SELECT = ("SELECT r.reviewId, r.reviewAuthor, r.reviewDate, r.reviewText, r.bookId, b.title, b.author"
+                 " FROM reviews r LEFT JOIN books b ON b.bookId = r.bookId")
+# The ORDER BY of each book_join.ORDERS entry, matching ReviewJoin's orders (orphaned reviews last, by bookId)
+JOIN_ORDERS = {
+    "added": "r.seq",
+    "book": "b.seq IS NULL, b.seq, r.bookId, r.seq",
+    "date": "r.reviewDate, r.seq",
+}
+
+
+def _book_from_row(row):
+    book_id, title, ai_metric, year, author, pub_name, pub_location, pages, sales, genres = row
+    return Book.from_dict({
+        "bookId": book_id,
+        "title": title,
+        "aiMetric": ai_metric,
+        "releaseYear": year,
+        "author": author,
+        "genres": json.loads(genres),
+        "publisher": {"publisherName": pub_name or "", "location": pub_location or ""},
+        "pages": pages,
+        "sales": json.loads(sales) if sales else [],
+    })
+
+
+def _review_from_row(row):
+    review_id, author, date, text, book_id = row
+    return Review.from_dict(
+        {"reviewId": review_id, "reviewAuthor": author, "reviewDate": date, "reviewText": text, "bookId": book_id})
+
+
+def _joined_from_row(row):
+    review = _review_from_row(row[:5])
+    if row[5] is None:  # LEFT JOIN found no book
+        return joined_row(review, None)
+    return (review, row[5], row[6])
+
+
+def fts5_available(connection):
+    """
+    Return True if this SQLite build has the FTS5 extension (almost all do; some minimal builds don't).
+    """
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5 (x)")
+        connection.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SqliteCatalog:
+    """
+    Book/review store backed by a SQLite file, with the same query methods as book_catalog.Catalog.
+    Every add is committed straight away, so there is nothing to "save" for the database itself.
+    """
+
+    # The JSON-mode Catalog may defer reading reviews; the database never does
+    reviews_loaded = True
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.create_function("facet_key", 1, facet_key, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        self.has_fts = fts5_available(self.connection)  # Without FTS5, search() falls back to LIKE
+        if self.has_fts:
+            self.connection.executescript(FTS_SCHEMA)
+        self._publisher_ids = {}  # (publisherName, location) -> publisherId, so adds don't look publishers up twice
+        self._genre_ids = {}  # genre name -> genreId
+        self._sales = None  # SalesMatrix over the stored books, or None until it's needed
+        self._max_ids = {}  # table -> highest numeric id stored, so next ids don't need a scan every time
+        self._in_batch = False  # True inside batch(): adds join one transaction instead of committing each
+        self.version = 0  # Goes up with every add/import from this process (query_cache keys include it)
+        self.query_cache = QueryCache()
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def ensure_reviews(self):
+        pass
+
+    def _scalar(self, sql, params=()):
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def _publisher_id(self, publisher):
+        key = (publisher.name, publisher.location)
+        if key not in self._publisher_ids:
+            self.connection.execute("INSERT OR IGNORE INTO publishers (publisherName, location) VALUES (?, ?)", key)
+            self._publisher_ids[key] = self._scalar(
+                "SELECT publisherId FROM publishers WHERE publisherName = ? AND location = ?", key)
+        return self._publisher_ids[key]
+
+    def _genre_id(self, name):
+        if name not in self._genre_ids:
+            self.connection.execute("INSERT OR IGNORE INTO genres (name) VALUES (?)", (name,))
+            self._genre_ids[name] = self._scalar("SELECT genreId FROM genres WHERE name = ?", (name,))
+        return self._genre_ids[name]
+
+    def _insert_book(self, book):
+        # Returns True if the book was inserted, False if its bookId was already there
+        book = as_book(book)
+        self.version += 1
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO books (bookId, title, aiMetric, aiMetricValue, releaseYear, author, publisherId,"
+            " pages, sales) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (book.book_id, book.title, book.ai_metric_text, book.ai_metric_rank, book.release_year_text, book.author,
+             self._publisher_id(book.publisher), book.pages, json.dumps(book.sales_json)))
+        if cursor.rowcount == 0:
+            return False
+        self._note_id("books", book.book_id)
+        self.connection.executemany(
+            "INSERT INTO book_genres (bookSeq, position, genreId) VALUES (?, ?, ?)",
+            [(cursor.lastrowid, position, self._genre_id(name)) for position, name in enumerate(book.genres)])
+        return True
+
+    def _review_rows(self, reviews):
+        for review in map(as_review, reviews):
+            self._note_id("reviews", review.review_id)
+            yield review.review_id, review.book_id, review.author, review.date, review.text
+
+    def _insert_reviews(self, reviews):
+        # INSERT OR IGNORE skips reviewIds that are already stored, so importing the same data twice is harmless
+        self.version += 1
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO reviews (reviewId, bookId, reviewAuthor, reviewDate, reviewText)"
+            " VALUES (?, ?, ?, ?, ?)", self._review_rows(reviews))
+
+    def _forget_cached_ids(self):
+        # After a rollback the rows behind these cached ids may be gone
+        self.version += 1
+        self._publisher_ids.clear()
+        self._genre_ids.clear()
+        self._max_ids.clear()
+
+    def _transaction(self):
+        return nullcontext() if self._in_batch else self.connection
+
+    @contextmanager
+    def batch(self):
+        """
+        Group many add_book/add_review calls into one transaction (one commit at the end, or none on error).
+        """
+        self._in_batch = True
+        try:
+            with self.connection:
+                yield self
+        except BaseException:
+            self._forget_cached_ids()
+            raise
+        finally:
+            self._in_batch = False
+
+    # Function to add one book
+    def add_book(self, book):
+        """
+        Insert a book (a Book or a dict in the JSON schema) and commit (unless inside batch()). Returns the Book.
+        """
+        book = as_book(book)
+        with self._transaction():
+            self._insert_book(book)
+        self._sales = None
+        return book
+
+    # Function to add one review
+    def add_review(self, review):
+        """
+        Insert a review (a Review or a dict in the JSON schema) and commit (unless inside batch()). Returns the Review.
+        Raises KeyError if the review points at a bookId that isn't in the database.
+        """
+        review = as_review(review)
+        if not self.has_book(review.book_id):
+            raise KeyError(f"Unknown bookId: {review.book_id}")
+        with self._transaction():
+            self._insert_reviews([review])
+        return review
+
+    # Function to migrate a JSON data file (and its change log) into the database
+    def import_json(self, filename, log=None, progress=None):
+        """
+        Stream the books and reviews of a JSON data file into the database in batches, in one transaction.
+        Entries from `log` (a book_journal.AppendLog) are applied afterwards. Records whose bookId/reviewId
+        is already stored are skipped, so an import can be repeated. Returns (books added, reviews added).
+        """
+        books_before, reviews_before = self.book_count(), self.review_total()
+        self._sales = None
+        try:
+            self._import_events(filename, log, progress)
+        except BaseException:
+            self._forget_cached_ids()
+            raise
+        return self.book_count() - books_before, self.review_total() - reviews_before
+
+    def _import_events(self, filename, log, progress):
+        pending_reviews = []
+        with self.connection:  # One transaction: a failed import leaves the database as it was
+            events = iter_events(filename)
+            if log is not None:
+                events = chain(events, (("books" if op == "book" else "reviews", record) for op, record in log.entries()))
+            for count, (kind, item) in enumerate(events, start=1):
+                if kind == "books":
+                    self._insert_book(item)
+                else:
+                    pending_reviews.append(item)
+                    if len(pending_reviews) >= IMPORT_BATCH:
+                        self._insert_reviews(pending_reviews)
+                        pending_reviews.clear()
+                if progress is not None and count % IMPORT_BATCH == 0:
+                    progress("records", count)
+            self._insert_reviews(pending_reviews)
+
+    # Function to write the database back out in the JSON file layout
+    def export_data(self):
+        """
+        Return {"books": [...], "reviews": [...]} in insertion order, ready for json.dump.
+        """
+        return {"books": list(self.iter_books()), "reviews": list(self.iter_reviews())}
+
+    # Lookup helpers (same names and results as Catalog)
+    def book_count(self):
+        return self._scalar("SELECT count(*) FROM books")
+
+    def review_total(self):
+        return self._scalar("SELECT count(*) FROM reviews")
+
+    def iter_books(self, offset=0, limit=None):
+        rows = self.connection.execute(BOOK_SELECT + " ORDER BY b.seq LIMIT ? OFFSET ?",
+                                       (limit if limit is not None else -1, offset))
+        for row in rows:
+            yield _book_from_row(row)
+
+    def iter_reviews(self, offset=0, limit=None):
+        rows = self.connection.execute(REVIEW_SELECT + " ORDER BY r.seq LIMIT ? OFFSET ?",
+                                       (limit if limit is not None else -1, offset))
+        for row in rows:
+            yield _review_from_row(row)
+
+    def has_book(self, book_id):
+        return self.connection.execute("SELECT 1 FROM books WHERE bookId = ?", (normalize_id(book_id),)).fetchone() \
+            is not None
+
+    def has_review(self, review_id):
+        return self.connection.execute("SELECT 1 FROM reviews WHERE reviewId = ?", (normalize_id(review_id),)) \
+            .fetchone() is not None
+
+    def get_book(self, book_id):
+        row = self.connection.execute(BOOK_SELECT + " WHERE b.bookId = ?", (normalize_id(book_id),)).fetchone()
+        return _book_from_row(row) if row is not None else None
+
+    def title_for(self, book_id, default="Unknown Book"):
+        row = self.connection.execute("SELECT title FROM books WHERE bookId = ?", (normalize_id(book_id),)).fetchone()
+        return row[0] if row is not None else default
+
+    def reviews_for(self, book_id):
+        rows = self.connection.execute(REVIEW_SELECT + " WHERE r.bookId = ? ORDER BY r.seq", (normalize_id(book_id),))
+        return [_review_from_row(row) for row in rows]
+
+    def review_count(self, book_id):
+        return self._scalar("SELECT count(*) FROM reviews WHERE bookId = ?", (normalize_id(book_id),))
+
+    @cached_query
+    def books_with_reviews(self):
+        """
+        Return (book, review count) pairs for every book with at least one review, in the order the books were added.
+        """
+        rows = self.connection.execute(REVIEWED_SELECT + " ORDER BY b.seq")
+        return [(_book_from_row(row[:-1]), row[-1]) for row in rows]
+
+    @cached_query
+    def most_reviewed(self, n):
+        """
+        Return the top `n` (book, review count) pairs, most reviews first (ties: book added earlier comes first).
+        """
+        rows = self.connection.execute(REVIEWED_SELECT + " ORDER BY rc.n DESC, b.seq LIMIT ?", (n,))
+        return [(_book_from_row(row[:-1]), row[-1]) for row in rows]
+
+    @cached_query
+    def books_by_year(self, year):
+        """
+        Return the books released in `year` (string or int), in the order they were added.
+        """
+        rows = self.connection.execute(BOOK_SELECT + " WHERE b.releaseYear = ? ORDER BY b.seq", (normalize_year(year),))
+        return [_book_from_row(row) for row in rows]
+
+    @cached_query
+    def books_with_ai_metric_below(self, threshold):
+        """
+        Return the books whose aiMetric is lower than `threshold`, lowest aiMetric first.
+        """
+        rows = self.connection.execute(BOOK_SELECT + " WHERE b.aiMetricValue < ? ORDER BY b.aiMetricValue, b.seq",
+                                       (threshold,))
+        return [_book_from_row(row) for row in rows]
+
+    @cached_query
+    def search(self, text, limit=SEARCH_LIMIT):
+        """
+        Full-text search over book titles and review text. Returns (book, matching review or None) pairs,
+        best matches first. Each word of `text` must appear (prefix matches count: "quant" finds "Quantum").
+        """
+        words = [word.replace('"', '') for word in text.split()]
+        words = [word for word in words if word]
+        if not words:
+            return []
+        if self.has_fts:
+            query = " ".join(f'"{word}"*' for word in words)
+            book_rows = self.connection.execute(
+                BOOK_SELECT + " JOIN books_fts f ON f.rowid = b.seq WHERE books_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (query, limit)).fetchall()
+            review_rows = self.connection.execute(
+                REVIEW_SELECT + " JOIN reviews_fts f ON f.rowid = r.seq WHERE reviews_fts MATCH ?"
+                " ORDER BY f.rank LIMIT ?", (query, limit)).fetchall()
+        else:
+            title_filter = " AND ".join("b.title LIKE ?" for _ in words)
+            text_filter = " AND ".join("r.reviewText LIKE ?" for _ in words)
+            patterns = [f"%{word}%" for word in words]
+            book_rows = self.connection.execute(BOOK_SELECT + f" WHERE {title_filter} ORDER BY b.seq LIMIT ?",
+                                                (*patterns, limit)).fetchall()
+            review_rows = self.connection.execute(REVIEW_SELECT + f" WHERE {text_filter} ORDER BY r.seq LIMIT ?",
+                                                  (*patterns, limit)).fetchall()
+        results = [(_book_from_row(row), None) for row in book_rows]
+        for row in review_rows:
+            review = _review_from_row(row)
+            results.append((self.get_book(review.book_id), review))
+        return results[:limit]
+
+    # Reviews joined to their books (same meaning as Catalog.joined_reviews / orphaned_reviews / review_groups)
+    def joined_reviews(self, order="added", offset=0, limit=None):
+        check_order(order)
+        rows = self.connection.execute(JOINED_SELECT + f" ORDER BY {JOIN_ORDERS[order]} LIMIT ? OFFSET ?",
+                                       (limit if limit is not None else -1, offset))
+        return map(_joined_from_row, rows)
+
+    def orphaned_reviews(self):
+        rows = self.connection.execute(REVIEW_SELECT + " WHERE NOT EXISTS (SELECT 1 FROM books b WHERE b.bookId ="
+                                       " r.bookId) ORDER BY r.seq")
+        return [_review_from_row(row) for row in rows]
+
+    def review_groups(self, by="book"):
+        return group_rows(self.joined_reviews(by), by)
+
+    # Facet queries (same meaning as Catalog.books_matching / Catalog.facet_counts)
+    def _facet_where(self, filters):
+        clauses, params = [], []
+        for facet, values in (filters or {}).items():
+            if facet not in FACET_FILTERS:
+                raise KeyError(f"Unknown facet: {facet} (expected one of {', '.join(FACETS)})")
+            for value in ([values] if isinstance(values, str) or not hasattr(values, "__iter__") else values):
+                clauses.append(FACET_FILTERS[facet])
+                params.append(normalize_year(value) if facet == "year" else facet_key(value))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @cached_query
+    def books_matching(self, filters):
+        """
+        Return the books that match every {facet: value or [values]} filter, in the order they were added.
+        """
+        where, params = self._facet_where(filters)
+        return [_book_from_row(row) for row in self.connection.execute(BOOK_SELECT + where + " ORDER BY b.seq", params)]
+
+    @cached_query
+    def facet_counts(self, facet, filters=None):
+        """
+        Return (value, number of books) pairs for one facet, most books first (ties: alphabetical).
+        """
+        if facet not in FACET_COUNTS:
+            raise KeyError(f"Unknown facet: {facet} (expected one of {', '.join(FACETS)})")
+        join, group, first, label = FACET_COUNTS[facet]
+        where, params = self._facet_where(filters)
+        if facet == "genre":
+            where += (" AND " if where else " WHERE ") + "trim(g.name) != ''"  # Blank genres aren't indexed by Catalog
+        rows = self.connection.execute(
+            f"SELECT trim({label}), n FROM (SELECT min({first}) AS first, count(DISTINCT b.seq) AS n, {group} AS k"
+            f" {BOOK_FROM} {join}{where} GROUP BY k) ORDER BY n DESC, k", params)
+        return [(value if value is not None else "", count) for value, count in rows]
+
+    def sales(self):
+        """
+        Return the SalesMatrix for the stored books (built once, reused until a book is added or imported).
+        """
+        if self._sales is None:
+            self._sales = SalesMatrix(self.iter_books())
+        return self._sales
+
+    def next_book_id(self):
+        return str(self._max_number("books", "bookId") + 1)
+
+    def next_review_id(self):
+        return str(self._max_number("reviews", "reviewId") + 1)
+
+    def _max_number(self, table, column):
+        # Ids are stored as text; only whole-number ids count toward the next id (same rule as Catalog)
+        if table not in self._max_ids:
+            self._max_ids[table] = self._scalar(f"SELECT coalesce(max(CAST({column} AS INTEGER)), 0) FROM {table}"
+                                                f" WHERE {column} != '' AND {column} NOT GLOB '*[^0-9]*'")
+        return self._max_ids[table]
+
+    def _note_id(self, table, value):
+        # Keep the cached highest id current as rows are inserted
+        number = id_number(value)
+        if table in self._max_ids and number is not None and number > self._max_ids[table]:
+            self._max_ids[table] = number
@@ -0,0 +1,204 @@
+# Explanation of this module
+# load_data used to call json.load on the whole data file, which reads the entire text into memory and builds every book
+# and review dict before the menu can appear. This module reads the same file format incrementally instead:
+# - the file is read in chunks, and only the current chunk is kept as text
+# - each item of the top-level "books" and "reviews" arrays is decoded on its own (json's raw_decode) and handed over
+#   one at a time as an event ("books", item) / ("reviews", item)
+# - a progress callback is called as items arrive
+# - reviews (usually the big part) can be left on disk: we remember the byte offset where the "reviews" array starts
+#   and only stream it in when something actually needs reviews (see Catalog.set_review_loader). The file's size and
+#   modification time are remembered too; if the file was rewritten in the meantime the offset isn't trusted and the
+#   reviews are found by reading the file from the start instead
+# Only the standard library is used, so there is nothing extra to install.
+
+import io
+import json
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024  # Characters read from the file at a time
+PROGRESS_EVERY = 10_000  # Items between progress callbacks
+ARRAY_KEYS = ("books", "reviews")
+WHITESPACE = re.compile(r"[ \t\r\n]*")  # Skipping whitespace with one regex match is much faster than a Python loop
+
+
+class _JsonStream:
+    """
+    A small pull parser over a text stream. It only understands enough structure to walk a top-level
+    object and step through arrays; every individual value is decoded by the standard json module.
+    """
+
+    def __init__(self, text_stream, start_bytes=0, chunk_size=CHUNK_SIZE):
+        self.stream = text_stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.dropped_bytes = start_bytes  # Bytes of the file before the current buffer
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        # Drop what we've already consumed, then read the next chunk
+        if self.pos:
+            self.dropped_bytes += len(self.buf[:self.pos].encode("utf-8"))
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(self.chunk_size)
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def byte_offset(self):
+        """
+        Byte position in the file of the next unread character.
+        """
+        return self.dropped_bytes + len(self.buf[:self.pos].encode("utf-8"))
+
+    def peek(self):
+        # Skip whitespace and return the next character ("" at end of file) without consuming it
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expected {char!r} but found {found!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """
+        Decode the next complete JSON value. If the buffer ends in the middle of it, read more and retry.
+        A value that ends exactly at the end of the buffer (e.g. a number) is only accepted at end of file,
+        because more digits might still be coming.
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def array_items(self):
+        # Yield each item of the array starting at the current position
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError(f"Expected ',' or ']' but found {sep!r}", self.buf, self.pos - 1)
+
+
+def _open_text(filename, offset=0):
+    raw = open(filename, "rb")
+    raw.seek(offset)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")  # newline="" keeps "\r\n" so byte offsets stay exact
+
+
+def iter_events(filename, stop_before=None, on_array=None):
+    """
+    Stream ("books", item) and ("reviews", item) events from a data file with the layout
+    {"books": [...], "reviews": [...]}. Other top-level keys are skipped.
+    If `stop_before` names an array key, streaming stops when that array is reached and
+    `on_array(key, byte_offset)` is called with the byte offset where the array starts. We only stop early
+    once every other array has been seen (save_data writes books before reviews, so that's the normal case);
+    otherwise the array is streamed like any other so nothing after it is lost.
+    """
+    seen = set()
+    with _open_text(filename) as text:
+        stream = _JsonStream(text)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key in ARRAY_KEYS:
+                seen.add(key)
+                if key == stop_before and seen.issuperset(ARRAY_KEYS):
+                    stream.peek()  # Move to the "[" so the offset points at the array itself
+                    if on_array is not None:
+                        on_array(key, stream.byte_offset())
+                    return
+                for item in stream.array_items():
+                    yield key, item
+            else:
+                stream.value()  # Not something we store; decode and drop it
+            sep = stream.peek()
+            stream.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError(f"Expected ',' or '}}' but found {sep!r}", stream.buf, stream.pos - 1)
+
+
+def iter_array_at(filename, offset):
+    """
+    Stream the items of the JSON array that starts at byte `offset` (as reported by iter_events).
+    """
+    with _open_text(filename, offset) as text:
+        yield from _JsonStream(text, start_bytes=offset).array_items()
+
+
+def _file_stamp(filename):
+    # Size and modification time; if either differs, the file was rewritten
+    info = os.stat(filename)
+    return info.st_size, info.st_mtime_ns
+
+
+def _counted(events, counts, progress):
+    # Count events as they pass and report progress every PROGRESS_EVERY items of a kind
+    for kind, item in events:
+        counts[kind] += 1
+        if progress is not None and counts[kind] % PROGRESS_EVERY == 0:
+            progress(kind, counts[kind])
+        yield kind, item
+
+
+def stream_load(catalog, filename, lazy_reviews=False, progress=None):
+    """
+    Load a data file into `catalog` one item at a time.
+    - progress(kind, count) is called every PROGRESS_EVERY books/reviews, if given
+    - with lazy_reviews=True, the reviews array is not read now; the catalog is given a loader that
+      streams it in the first time reviews are needed
+    Returns (number of books, number of reviews loaded now).
+    """
+    counts = {"books": 0, "reviews": 0}
+    review_offset = []
+
+    def note_offset(key, offset):
+        review_offset.append(offset)
+
+    stop = "reviews" if lazy_reviews else None
+    stamp = _file_stamp(filename) if lazy_reviews else None  # Taken before reading, so a write during the load counts
+    catalog.load_events(_counted(iter_events(filename, stop_before=stop, on_array=note_offset), counts, progress))
+    loaded = (counts["books"], counts["reviews"])
+    if review_offset:
+        offset = review_offset[0]
+
+        def load_reviews():
+            counts["reviews"] = 0  # A failed attempt may be retried
+            if _file_stamp(filename) == stamp:
+                events = (("reviews", item) for item in iter_array_at(filename, offset))
+            else:  # The file changed since the books were read, so the saved offset may point anywhere
+                events = (event for event in iter_events(filename) if event[0] == "reviews")
+            return (item for _, item in _counted(events, counts, progress))
+
+        catalog.set_review_loader(load_reviews)
+    return loaded
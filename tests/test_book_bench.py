@@ -0,0 +1,49 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import book_bench
+from book_catalog import Catalog
+from book_stream import stream_load
+
+
+def test_generate_is_deterministic_and_loadable(tmp_path):
+    first, second, other = tmp_path / "a.json", tmp_path / "b.json", tmp_path / "c.json"
+    n_books, n_reviews = book_bench.generate(str(first), books=40, reviews_per_book=2, seed=7)
+    book_bench.generate(str(second), books=40, reviews_per_book=2, seed=7)
+    book_bench.generate(str(other), books=40, reviews_per_book=2, seed=8)
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other.read_bytes()
+
+    data = json.loads(first.read_text(encoding="utf-8"))
+    assert (len(data["books"]), len(data["reviews"])) == (n_books, n_reviews) == (40, n_reviews)
+    assert [b["bookId"] for b in data["books"]] == [str(n) for n in range(1, 41)]
+    assert {r["bookId"] for r in data["reviews"]} <= {b["bookId"] for b in data["books"]}
+    catalog = Catalog()
+    assert stream_load(catalog, str(first)) == (40, n_reviews)
+
+
+def test_no_reviews(tmp_path):
+    path = tmp_path / "a.json"
+    assert book_bench.generate(str(path), books=3, reviews_per_book=0) == (3, 0)
+    assert json.loads(path.read_text(encoding="utf-8"))["reviews"] == []
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {"timings": {"big": 1.0, "tiny": 0.0001, "faster": 1.0}}
+    results = {"timings": {"big": 1.5, "tiny": 0.001, "faster": 0.5, "new": 0.3}}
+    rows = {name: (before, regressed) for name, _, before, _, regressed in book_bench.compare(results, baseline)}
+    assert rows == {"big": (1.0, True), "tiny": (0.0001, False), "faster": (1.0, False), "new": (None, False)}
+    assert all(not row[4] for row in book_bench.compare(results, None))
+
+
+def test_run_records_then_compares_a_local_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["run", "--books", "30", "--rounds", "1", "--repeat", "1", "--workdir", str(tmp_path),
+            "--baseline", str(baseline)]
+    assert book_bench.main(args) in (0, 1)
+    assert "No baseline at" in capsys.readouterr().out
+    assert book_bench.main(args + ["--save-baseline"]) == 0
+    recorded = json.loads(baseline.read_text(encoding="utf-8"))
+    assert recorded["meta"]["books"] == 30 and "load_data" in recorded["timings"]
+    book_bench.main(args)
+    assert "No baseline at" not in capsys.readouterr().out
@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from book_cache import QueryCache, cached_query
+from book_catalog import Catalog
+
+
+def book(book_id, year="2023", ai="50"):
+    return {"bookId": book_id, "title": f"Book {book_id}", "aiMetric": ai, "releaseYear": year, "author": "A",
+            "genres": ["Drama"], "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+class Counter:
+    # Minimal catalog: a version number, a query cache, and one cached query that counts its real calls
+    def __init__(self):
+        self.version = 0
+        self.query_cache = QueryCache(max_entries=2)
+        self.calls = 0
+
+    @cached_query
+    def query(self, value, filters=None):
+        self.calls += 1
+        return [value, self.version]
+
+
+def test_repeat_query_is_a_hit():
+    c = Counter()
+    assert c.query(1) == [1, 0]
+    assert c.query(1) == [1, 0]
+    assert c.calls == 1
+    assert c.query_cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_version_change_invalidates_everything():
+    c = Counter()
+    c.query(1)
+    c.query(2)
+    c.version += 1
+    assert c.query(1) == [1, 1]
+    assert c.calls == 3
+    assert len(c.query_cache) == 1  # the old version's entries were dropped, not just bypassed
+
+
+def test_lru_eviction():
+    c = Counter()
+    c.query(1)
+    c.query(2)
+    c.query(1)  # 1 is now the most recently used
+    c.query(3)  # evicts 2
+    calls = c.calls
+    c.query(1)
+    assert c.calls == calls
+    c.query(2)
+    assert c.calls == calls + 1
+
+
+def test_unhashable_arguments_and_result_copies():
+    c = Counter()
+    first = c.query(1, filters={"genre": ["a", "b"]})
+    first.append("changed")
+    assert c.query(1, filters={"genre": ["a", "b"]}) == [1, 0]  # callers get their own list
+    assert c.calls == 1
+
+
+def test_catalog_adds_invalidate_cached_queries():
+    catalog = Catalog([book("1"), book("2", year="2020")])
+    assert [b.book_id for b in catalog.books_by_year(2023)] == ["1"]
+    catalog.add_book(book("3"))
+    assert [b.book_id for b in catalog.books_by_year(2023)] == ["1", "3"]
+    assert catalog.books_with_reviews() == []
+    catalog.add_review({"reviewId": "1", "reviewAuthor": "R", "reviewDate": "2024-01-01", "reviewText": "x",
+                        "bookId": "2"})
+    assert [(b.book_id, n) for b, n in catalog.books_with_reviews()] == [("2", 1)]
+    catalog.load([book("4")], [])
+    assert [b.book_id for b in catalog.books_by_year("2023")] == ["4"]  # a reload starts a new version too
@@ -0,0 +1,165 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from book_catalog import Catalog
+from book_records import id_number
+
+
+def book(book_id, year="2023", ai_metric="50"):
+    return {"bookId": book_id, "title": f"Book {book_id}", "aiMetric": ai_metric, "releaseYear": year, "author": "A",
+            "genres": [], "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+def review(review_id, book_id):
+    return {"reviewId": review_id, "reviewAuthor": "R", "reviewDate": "2024-01-01", "reviewText": "Good",
+            "bookId": book_id}
+
+
+BOOKS = [book("1"), book("2", "2020", "100"), book("3", "N/A", "0"), book("abc", "2020", "101")]
+REVIEWS = [review("1", "2"), review("2", "1"), review("3", "2"), review("9", "404")]
+
+
+def next_id(ids):
+    return str(max([0] + [n for n in map(id_number, ids) if n is not None]) + 1)
+
+
+def check_id_index(catalog):
+    # Every id lookup must agree with a scan of the lists
+    for b in catalog.books:
+        assert catalog.has_book(b.book_id) and catalog.get_book(b.book_id) is b
+        assert catalog.title_for(b.book_id) == b.title
+        assert catalog.reviews_for(b.book_id) == [r for r in catalog.reviews if r.book_id == b.book_id]
+    for r in catalog.reviews:
+        assert catalog.has_review(r.review_id)
+    assert catalog.next_book_id() == next_id(b.book_id for b in catalog.books)
+    assert catalog.next_review_id() == next_id(r.review_id for r in catalog.reviews)
+    assert catalog.book_count() == len(catalog.books) and catalog.review_total() == len(catalog.reviews)
+
+
+def test_id_index_after_add_book_add_review_and_load():
+    catalog = Catalog(BOOKS, REVIEWS)
+    check_id_index(catalog)
+    assert (catalog.next_book_id(), catalog.next_review_id()) == ("4", "10")
+    assert [r.review_id for r in catalog.reviews_for("404")] == ["9"] and catalog.title_for("404") == "Unknown Book"
+
+    catalog.add_book(book("17"))
+    catalog.add_book(book(" 5 "))  # Ids are normalized before they are indexed
+    catalog.add_review(review("10", "17"))
+    catalog.add_review(review("x", "5"))
+    check_id_index(catalog)
+    assert catalog.get_book("5").book_id == "5" and catalog.has_review("x")
+    assert (catalog.next_book_id(), catalog.next_review_id()) == ("18", "11")
+
+    catalog.load([book("2")], [review("1", "2")])
+    check_id_index(catalog)
+    assert not catalog.has_book("17") and not catalog.has_review("10") and catalog.get_book("17") is None
+    assert (catalog.next_book_id(), catalog.next_review_id()) == ("3", "2")
+
+
+def test_rejected_review_changes_nothing():
+    catalog = Catalog(BOOKS, REVIEWS)
+    with pytest.raises(KeyError):
+        catalog.add_review(review("50", "404"))
+    assert not catalog.has_review("50") and catalog.next_review_id() == "10"
+    check_id_index(catalog)
+
+
+def test_load_accepts_the_catalogs_own_lists():
+    catalog = Catalog(BOOKS, REVIEWS)
+    books, reviews = catalog.books, catalog.reviews
+    catalog.load(catalog.books, catalog.reviews)
+    assert catalog.books is books and len(books) == len(BOOKS) and len(reviews) == len(REVIEWS)
+    check_id_index(catalog)
+
+
+def check_year_and_ai_indexes(catalog):
+    # books_by_year and books_with_ai_metric_below must agree with a scan of catalog.books
+    for year in {b.release_year_text for b in catalog.books} | {"1999"}:
+        assert catalog.books_by_year(year) == [b for b in catalog.books if b.release_year_text == year]
+    by_rank = sorted(range(len(catalog.books)), key=lambda seq: (catalog.books[seq].ai_metric_rank, seq))
+    for threshold in (-1, 0, 1, 50, 99, 100, 101, 102):
+        expected = [catalog.books[seq] for seq in by_rank if catalog.books[seq].ai_metric_rank < threshold]
+        assert catalog.books_with_ai_metric_below(threshold) == expected
+
+
+def ai_ids(catalog, threshold):
+    return [b.book_id for b in catalog.books_with_ai_metric_below(threshold)]
+
+
+def test_ai_metric_boundaries():
+    catalog = Catalog(BOOKS + [book("5", ai_metric="N/A"), book("6", ai_metric="100")])
+    check_year_and_ai_indexes(catalog)
+    assert ai_ids(catalog, 0) == []
+    assert ai_ids(catalog, 1) == ["3"]
+    assert ai_ids(catalog, 100) == ["3", "1"]
+    assert ai_ids(catalog, 101) == ["3", "1", "2", "6"]  # Equal aiMetrics keep the order they were added in
+    assert ai_ids(catalog, 102) == ["3", "1", "2", "6", "abc", "5"]  # "N/A" sorts with 101, after every real value
+
+
+def test_year_and_ai_indexes_after_add_book_and_load():
+    catalog = Catalog(BOOKS, REVIEWS)
+    check_year_and_ai_indexes(catalog)
+    assert [b.book_id for b in catalog.books_by_year(2020)] == ["2", "abc"]
+    assert [b.book_id for b in catalog.books_by_year("N/A")] == ["3"]
+
+    catalog.add_book(book("7", "2020", "0"))
+    catalog.add_book(book("8", "2021", "101"))
+    with catalog.batch():  # Batched books skip the sorted insert; the index is rebuilt at the end
+        catalog.add_book(book("9", "2020", "100"))
+        catalog.add_book(book("10", "", "-3"))
+    check_year_and_ai_indexes(catalog)
+    assert [b.book_id for b in catalog.books_by_year("2020")] == ["2", "abc", "7", "9"]
+    assert ai_ids(catalog, 1) == ["10", "3", "7"]
+
+    catalog.load([book("1", "2020", "100")], [])
+    check_year_and_ai_indexes(catalog)
+    assert catalog.books_by_year(2021) == [] and ai_ids(catalog, 101) == ["1"]
+
+
+def check_review_counts(catalog):
+    # Review counts, books_with_reviews and most_reviewed must agree with a scan of catalog.reviews
+    counts = {}
+    for r in catalog.reviews:
+        counts[r.book_id] = counts.get(r.book_id, 0) + 1
+    for b in catalog.books:
+        assert catalog.review_count(b.book_id) == counts.get(b.book_id, 0)
+    reviewed = [(b, counts[b.book_id]) for b in catalog.books if b.book_id in counts]  # Unknown books left out
+    assert catalog.books_with_reviews() == reviewed
+    ranked = sorted(reviewed, key=lambda pair: -pair[1])  # Stable: ties keep the order the books were added in
+    for n in (0, 1, 2, len(catalog.books) + 1):
+        assert catalog.most_reviewed(n) == ranked[:n]
+
+
+def counted(pairs):
+    return [(b.book_id, n) for b, n in pairs]
+
+
+def test_review_counts_after_add_review_and_load():
+    catalog = Catalog(BOOKS, REVIEWS)
+    check_review_counts(catalog)
+    assert counted(catalog.books_with_reviews()) == [("1", 1), ("2", 2)]
+    assert catalog.review_count("404") == 1  # Counted, but never listed: the book isn't in the catalog
+
+    catalog.add_review(review("10", "3"))
+    catalog.add_review(review("11", "1"))
+    catalog.add_review(review("12", "1"))
+    check_review_counts(catalog)
+    assert counted(catalog.most_reviewed(2)) == [("1", 3), ("2", 2)]
+
+    catalog.add_book(book("404"))  # The orphaned review now counts for a listed book
+    check_review_counts(catalog)
+    assert counted(catalog.books_with_reviews())[-1] == ("404", 1)
+
+    catalog.load(BOOKS, [review("1", "abc")])
+    check_review_counts(catalog)
+    assert counted(catalog.most_reviewed(5)) == [("abc", 1)] and catalog.review_count("1") == 0
+
+
+def test_review_counts_with_lazy_and_replayed_reviews():
+    catalog = Catalog(BOOKS)
+    catalog.set_review_loader(lambda: iter(REVIEWS))
+    catalog.merge_reviews([review("3", "2"), review("20", "3")])  # "3" is also on disk; it must count once
+    assert not catalog.reviews_loaded
+    assert counted(catalog.most_reviewed(3)) == [("2", 2), ("1", 1), ("3", 1)]
+    assert catalog.reviews_loaded
+    check_review_counts(catalog)
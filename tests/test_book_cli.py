@@ -0,0 +1,122 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+import book_assgt as app
+from book_journal import AppendLog, log_path_for
+
+
+def book(book_id, title, year="2023", ai_metric="50"):
+    return {"bookId": book_id, "title": title, "aiMetric": ai_metric, "releaseYear": year, "author": "A",
+            "genres": ["Drama"], "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+def review(review_id, book_id, date="2024-01-01"):
+    return {"reviewId": review_id, "reviewAuthor": "R", "reviewDate": date, "reviewText": "Good", "bookId": book_id}
+
+
+BOOKS = [book("1", "First"), book("2", "Second", "2020", "90"), book("3", "Third", ai_metric="N/A")]
+REVIEWS = [review("1", "2", "2024-05-01"), review("2", "1", "2024-01-01"), review("3", "2", "2024-03-01")]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # The commands read and write book_assgt.DATA_FILE, a path relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / app.DATA_FILE).write_text(json.dumps({"books": BOOKS, "reviews": REVIEWS}))
+    monkeypatch.setattr(app, "change_log", AppendLog(log_path_for(app.DATA_FILE)))
+    monkeypatch.setattr(app, "catalog", app.catalog)  # --db swaps in a SqliteCatalog; put the JSON catalog back after
+    return tmp_path
+
+
+def run(capsys, *argv):
+    code = app.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def saved(data_dir):
+    return json.loads((data_dir / app.DATA_FILE).read_text())
+
+
+def test_query_commands(data_dir, capsys):
+    code, out, err = run(capsys, "query", "year", "2023")
+    assert code == 0 and out.splitlines()[-2:] == ["1. First", "2. Third"]
+    assert "Data loaded successfully" in err and "Data loaded" not in out  # Status goes to stderr
+
+    assert run(capsys, "query", "ai-lt", "100")[1].splitlines()[-2:] == ["1. First (AI Metric: 50)",
+                                                                        "2. Second (AI Metric: 90)"]
+    assert run(capsys, "query", "with-reviews")[1].splitlines()[-2:] == ["1. First — 1 review(s)",
+                                                                        "2. Second — 2 review(s)"]
+    assert "Invalid year" in run(capsys, "query", "year", "soon")[1]
+
+
+def test_import_reports_skipped_lines(data_dir, capsys):
+    feed = data_dir / "new_books.jsonl"
+    feed.write_text("\n".join([
+        json.dumps({"title": "Fourth", "releaseYear": "2023"}),  # No bookId: gets the next one
+        "{not json",
+        json.dumps({"title": "  "}),
+        "",
+        json.dumps(book("1", "Duplicate")),
+        json.dumps(["not", "an", "object"]),
+        json.dumps(book("9", "Ninth")),
+    ]) + "\n")
+    code, out, _ = run(capsys, "books", "import", str(feed))
+    assert code == 0
+    assert "Imported 2 books" in out and "skipped 4" in out
+    assert [line.strip() for line in out.splitlines() if line.strip().startswith("skipped line")] == [
+        "skipped line 2: invalid JSON (Expecting property name enclosed in double quotes)",
+        "skipped line 3: missing title",
+        "skipped line 5: duplicate bookId 1",
+        "skipped line 6: not a JSON object",
+    ]
+    assert [b["bookId"] for b in saved(data_dir)["books"]] == ["1", "2", "3", "4", "9"]
+
+    feed = data_dir / "new_reviews.jsonl"
+    feed.write_text(json.dumps({"bookId": "9", "reviewText": "Fine"}) + "\n" + json.dumps(review("1", "9")) + "\n"
+                    + json.dumps(review("7", "404")) + "\n")
+    code, out, _ = run(capsys, "reviews", "import", str(feed))
+    assert code == 0 and "Imported 1 reviews" in out and "skipped 2" in out
+    assert "line 2: duplicate reviewId 1" in out and "line 3: unknown bookId 404" in out
+    assert saved(data_dir)["reviews"][-1]["reviewId"] == "4"
+
+
+def test_import_of_a_missing_file(data_dir, capsys):
+    code, out, _ = run(capsys, "books", "import", str(data_dir / "nowhere.jsonl"))
+    assert code == 1 and "not found" in out
+    assert saved(data_dir)["books"] == BOOKS
+
+
+def test_dump(data_dir, capsys):
+    _, out, err = run(capsys, "--dump", "books", "--format", "jsonl", "--offset", "1", "--limit", "1")
+    assert [json.loads(line) for line in out.splitlines()] == [BOOKS[1]]  # Only data on stdout
+    assert "Data loaded successfully" in err
+
+    _, out, _ = run(capsys, "--dump", "reviews", "--format", "jsonl", "--order", "date")
+    assert [json.loads(line)["reviewId"] for line in out.splitlines()] == ["2", "3", "1"]
+
+    _, out, _ = run(capsys, "--dump", "books")
+    assert "Title: Third" in out and out.count("ID: ") == 3
+
+
+def test_database_mode_gives_the_same_output(data_dir, capsys):
+    commands = (["query", "year", "2023"], ["query", "ai-lt", "100"], ["query", "with-reviews"],
+                ["--dump", "reviews", "--format", "jsonl", "--order", "book"])
+    expected = [run(capsys, *command)[1] for command in commands]
+    json_catalog = app.catalog
+    for command, out in zip(commands, expected):
+        try:
+            assert run(capsys, "--db", "data.db", *command)[1] == out
+        finally:
+            app.catalog.close()
+            app.catalog = json_catalog
+
+
+def test_bad_arguments(data_dir, capsys):
+    for argv in (["--dump", "books", "query", "year", "2023"], ["--dump", "books", "--limit", "-1"],
+                 ["query", "colour"], ["books", "export", "x.jsonl"]):
+        with pytest.raises(SystemExit) as exit_info:
+            app.main(argv)
+        assert exit_info.value.code == 2
+    capsys.readouterr()
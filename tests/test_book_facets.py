@@ -0,0 +1,37 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from book_catalog import Catalog
+
+
+def book(book_id, genres, location="UK", year="2023"):
+    return {"bookId": book_id, "title": f"Book {book_id}", "aiMetric": "50", "releaseYear": year, "author": "A",
+            "genres": genres, "publisher": {"publisherName": "P", "location": location}, "pages": 100, "sales": []}
+
+
+BOOKS = [book("1", ["Drama"]), book("2", ["Drama", "Thriller"], "USA"), book("3", ["thriller "], year="2020")]
+
+
+def ids(books):
+    return [b.book_id for b in books]
+
+
+def test_filters_and_counts():
+    catalog = Catalog(BOOKS)
+    assert ids(catalog.books_matching({"genre": "Thriller"})) == ["2", "3"]
+    assert ids(catalog.books_matching({"genre": ["drama", "thriller"]})) == ["2"]
+    assert ids(catalog.books_matching({"genre": "Drama", "location": "UK"})) == ["1"]
+    assert catalog.facet_counts("genre") == [("Drama", 2), ("Thriller", 2)]
+    assert catalog.facet_counts("genre", {"year": 2020}) == [("Thriller", 1)]
+
+
+def test_books_added_after_a_query_are_found():
+    catalog = Catalog(BOOKS)
+    assert ids(catalog.books_matching({"genre": "Thriller"})) == ["2", "3"]  # builds the cached bitsets
+    for n in range(4, 40):
+        catalog.add_book(book(str(n), ["Thriller"] if n % 3 else ["Drama"]))
+    fresh = Catalog(catalog.books)
+    for filters in ({"genre": "Thriller"}, {"genre": "Drama"}, {"genre": "Drama", "location": "USA"}):
+        assert ids(catalog.books_matching(filters)) == ids(fresh.books_matching(filters))
+    assert catalog.facet_counts("genre") == fresh.facet_counts("genre")
+    catalog.add_book(book("40", ["Drama"], "USA"))
+    assert ids(catalog.books_matching({"genre": "Drama", "location": "USA"})) == ["2", "40"]
@@ -0,0 +1,87 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+from book_catalog import Catalog
+from book_sqlite import SqliteCatalog
+
+
+def book(book_id, title, author="Author"):
+    return {"bookId": book_id, "title": title, "aiMetric": "50", "releaseYear": "2023", "author": author,
+            "genres": [], "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+def review(review_id, book_id, date):
+    return {"reviewId": review_id, "reviewAuthor": "R", "reviewDate": date, "reviewText": "text", "bookId": book_id}
+
+
+BOOKS = [book("1", "One", "Ann"), book("2", "Two", "Bob")]
+REVIEWS = [review("r1", "2", "2024-03-01"), review("r2", "1", "2024-01-01"), review("r3", "9", "2023-06-01"),
+           review("r4", "1", "2024-02-01")]
+
+
+def ids(rows):
+    return [row[0].review_id for row in rows]
+
+
+def test_orders():
+    catalog = Catalog(BOOKS, REVIEWS)
+    assert ids(catalog.joined_reviews()) == ["r1", "r2", "r3", "r4"]
+    assert ids(catalog.joined_reviews("book")) == ["r2", "r4", "r1", "r3"]  # books in added order, orphans last
+    assert ids(catalog.joined_reviews("date")) == ["r3", "r2", "r4", "r1"]
+    assert ids(catalog.joined_reviews("book", offset=1, limit=2)) == ["r4", "r1"]
+    with pytest.raises(ValueError):
+        catalog.joined_reviews("title")
+
+
+def test_rows_carry_title_and_author():
+    rows = {row[0].review_id: row[1:] for row in Catalog(BOOKS, REVIEWS).joined_reviews()}
+    assert rows == {"r1": ("Two", "Bob"), "r2": ("One", "Ann"), "r3": ("Unknown Book", ""), "r4": ("One", "Ann")}
+
+
+def test_groups():
+    catalog = Catalog(BOOKS, REVIEWS)
+    assert [(key, ids(rows)) for key, rows in catalog.review_groups("book")] == \
+        [("1", ["r2", "r4"]), ("2", ["r1"]), ("9", ["r3"])]
+    assert [key for key, _ in catalog.review_groups("date")] == ["2023-06-01", "2024-01-01", "2024-02-01", "2024-03-01"]
+
+
+def test_join_stays_current_after_adds():
+    catalog = Catalog(BOOKS, REVIEWS)
+    assert ids(catalog.joined_reviews("date")) == ["r3", "r2", "r4", "r1"]  # builds the join and the date order
+    catalog.add_review(review("r5", "2", "2020-01-01"))
+    assert ids(catalog.joined_reviews("date"))[0] == "r5"
+    assert ids(catalog.joined_reviews("book")) == ["r2", "r4", "r1", "r5", "r3"]
+
+
+def test_orphans_are_adopted_by_a_later_book():
+    catalog = Catalog(BOOKS, REVIEWS)
+    assert [r.review_id for r in catalog.orphaned_reviews()] == ["r3"]
+    catalog.merge_book(book("9", "Nine", "Cy"))  # e.g. replayed from the change log
+    assert catalog.orphaned_reviews() == []
+    assert [row[1:] for row in catalog.joined_reviews() if row[0].review_id == "r3"] == [("Nine", "Cy")]
+    assert ids(catalog.joined_reviews("book")) == ["r2", "r4", "r1", "r3"]
+
+
+def test_reload_drops_the_old_join():
+    catalog = Catalog(BOOKS, REVIEWS)
+    list(catalog.joined_reviews())
+    catalog.load(BOOKS, REVIEWS[:1])
+    assert ids(catalog.joined_reviews()) == ["r1"] and catalog.orphaned_reviews() == []
+
+
+def test_sqlite_backend_agrees(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": BOOKS, "reviews": REVIEWS}))
+    db = SqliteCatalog(str(tmp_path / "data.db"))
+    db.import_json(str(path))
+    catalog = Catalog(BOOKS, REVIEWS)
+
+    def rows(c, order):
+        return [(row[0].review_id, row[1], row[2]) for row in c.joined_reviews(order)]
+
+    for order in ("added", "book", "date"):
+        assert rows(db, order) == rows(catalog, order)
+    assert [r.review_id for r in db.orphaned_reviews()] == ["r3"]
+    assert [key for key, _ in db.review_groups("book")] == ["1", "2", "9"]
+    db.close()
@@ -0,0 +1,104 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+import book_assgt as app
+from book_journal import AppendLog, atomic_write_json, log_path_for
+
+BOOK_1 = {"bookId": "1", "title": "First", "aiMetric": "10", "releaseYear": "2023", "author": "A", "genres": [],
+          "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+BOOK_2 = dict(BOOK_1, bookId="2", title="Second")
+REVIEW_1 = {"reviewId": "1", "reviewAuthor": "R", "reviewDate": "2024-01-01", "reviewText": "Good", "bookId": "2"}
+
+
+def test_append_log_round_trip(tmp_path):
+    log = AppendLog(str(tmp_path / "data.log.jsonl"))
+    assert list(log.entries()) == [] and log.count == 0
+    assert log.append("book", BOOK_1) == 1
+    assert log.append_many([("book", BOOK_2), ("review", REVIEW_1)]) == 3
+    assert list(AppendLog(log.path).entries()) == [("book", BOOK_1), ("book", BOOK_2), ("review", REVIEW_1)]
+    log.clear()
+    assert not os.path.exists(log.path) and log.count == 0
+
+
+def test_torn_and_corrupt_lines_are_skipped(tmp_path):
+    path = tmp_path / "data.log.jsonl"
+    path.write_text('{"op":"book","data":{"bookId":"1"}}\nnot json\n{"op":"book","data":{"bookId":"2"}}\n{"op":"bo')
+    log = AppendLog(str(path))
+    assert [record["bookId"] for _, record in log.entries()] == ["1", "2"]
+    log.append("review", REVIEW_1)  # the torn line is terminated first, so this entry survives
+    assert [op for op, _ in AppendLog(str(path)).entries()] == ["book", "book", "review"]
+
+
+def test_atomic_write_json_replaces_the_file(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    atomic_write_json(str(path), {"books": [], "reviews": []})
+    assert json.loads(path.read_text()) == {"books": [], "reviews": []}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]  # no temp file left behind
+
+
+def test_atomic_write_json_keeps_the_file_mode(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("old")
+    os.chmod(path, 0o644)
+    atomic_write_json(str(path), {"books": []})
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+    new_path = tmp_path / "new.json"
+    umask = os.umask(0o022)
+    try:
+        atomic_write_json(str(new_path), {"books": []})
+    finally:
+        os.umask(umask)
+    assert os.stat(new_path).st_mode & 0o777 == 0o644  # a new file gets what open() would have given it
+
+
+def test_atomic_write_json_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"books": []}')
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"books": [object()]})
+    assert path.read_text() == '{"books": []}'
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    # book_assgt works on its global catalog; load_data() below replaces whatever an earlier test left in it
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": [BOOK_1], "reviews": []}))
+    return str(path)
+
+
+def test_changes_are_replayed_on_load(data_file):
+    app.load_data(data_file)
+    app.catalog.add_book(BOOK_2)
+    app.record_change("book", BOOK_2, data_file)
+    app.catalog.add_review(REVIEW_1)
+    app.record_change("review", REVIEW_1, data_file)
+    assert json.load(open(data_file))["books"] == [BOOK_1]  # the data file itself wasn't rewritten
+
+    app.load_data(data_file)
+    assert app.catalog.book_count() == 2 and app.catalog.review_total() == 1
+    app.replay_change_log(data_file)  # replaying again adds nothing
+    assert app.catalog.book_count() == 2 and app.catalog.review_total() == 1
+
+
+def test_lazy_load_replays_reviews_after_the_file(data_file):
+    app.record_change("book", BOOK_2, data_file)
+    app.record_change("review", REVIEW_1, data_file)
+    app.load_data(data_file, lazy_reviews=True)
+    assert [r.review_id for r in app.catalog.reviews_for("2")] == ["1"]
+
+
+def test_compaction_folds_the_log_into_the_data_file(data_file, monkeypatch):
+    monkeypatch.setattr(app, "COMPACT_EVERY", 2)
+    app.load_data(data_file)
+    app.catalog.add_book(BOOK_2)
+    app.record_change("book", BOOK_2, data_file)
+    assert os.path.exists(log_path_for(data_file))
+    app.catalog.add_review(REVIEW_1)
+    app.record_change("review", REVIEW_1, data_file)  # second change: compacts
+    assert not os.path.exists(log_path_for(data_file))
+    assert json.load(open(data_file)) == {"books": [BOOK_1, BOOK_2], "reviews": [REVIEW_1]}
@@ -0,0 +1,71 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import gc
+import json
+from book_records import Book, Review, Publisher, MISSING, as_book, record_to_json
+
+BOOK = {
+    "bookId": "1",
+    "title": "The Quantum Garden",
+    "aiMetric": "88",
+    "releaseYear": "2023",
+    "author": "Alice Johnson",
+    "genres": ["Science Fiction", "Thriller"],
+    "publisher": {"publisherName": "Penguin", "location": "UK"},
+    "pages": 320,
+    "sales": [1000, 1500, 2000],
+}
+REVIEW = {"reviewId": "1", "reviewAuthor": "Jane Developer", "reviewDate": "2024-05-12",
+          "reviewText": "Fascinating.", "bookId": "1"}
+
+
+def test_book_parses_typed_fields_and_round_trips():
+    book = Book.from_dict(BOOK)
+    assert book.ai_metric == 88 and book.release_year == 2023 and book.pages == 320
+    assert book.genres == ("Science Fiction", "Thriller")
+    assert book.sales == (1000, 1500, 2000)
+    assert book._raw is None  # the usual case keeps no copy of the original
+    assert book.to_dict() == BOOK
+    assert list(book.to_dict()) == list(BOOK)  # same key order as the file
+
+
+def test_book_keeps_values_the_typed_fields_cant_reproduce():
+    odd = dict(BOOK, bookId=7, aiMetric="abc", releaseYear=" 2023", pages=320.0, sales=[1, True, "x"], extra={"a": 1})
+    del odd["author"]
+    book = Book.from_dict(odd)
+    assert book.book_id == "7"
+    assert book.ai_metric is None and book.ai_metric_text == "abc"
+    assert book.release_year == 2023 and book.release_year_text == " 2023"
+    assert book._raw["author"] is MISSING
+    out = book.to_dict()
+    assert out == odd
+    assert type(out["pages"]) is float and out["sales"][1] is True
+
+
+def test_review_round_trip_and_interning():
+    first, second = Review.from_dict(REVIEW), Review.from_dict(dict(REVIEW, reviewId="2"))
+    assert first.to_dict() == REVIEW
+    assert first.author is second.author  # reviewer names are stored once
+    assert first == Review.from_dict(dict(REVIEW))
+    assert first != second
+
+
+def test_publishers_are_shared():
+    a, b = Book.from_dict(BOOK), Book.from_dict(dict(BOOK, bookId="2"))
+    assert a.publisher is b.publisher
+    assert a.publisher is Publisher.shared("Penguin", "UK")
+
+
+def test_unused_publishers_are_not_kept():
+    book = Book.from_dict(dict(BOOK, publisher={"publisherName": "Gone Press", "location": "Nowhere"}))
+    assert ("Gone Press", "Nowhere") in Publisher._shared
+    del book
+    gc.collect()
+    assert ("Gone Press", "Nowhere") not in Publisher._shared
+
+
+def test_records_serialize_through_json_default():
+    book = as_book(BOOK)
+    assert as_book(book) is book
+    text = json.dumps({"books": [book], "reviews": [Review.from_dict(REVIEW)]}, default=record_to_json)
+    assert json.loads(text) == {"books": [BOOK], "reviews": [REVIEW]}
@@ -0,0 +1,94 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import io
+import json
+import pytest
+from book_catalog import Catalog
+from book_render import format_book, format_jsonl, render
+from book_sqlite import SqliteCatalog
+
+
+def book(n):
+    return {"bookId": str(n), "title": f"Book {n}", "aiMetric": "50", "releaseYear": "2023", "author": "A",
+            "genres": ["Drama"], "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": [n]}
+
+
+BOOKS = [book(n) for n in range(1, 8)]
+
+
+class Stream(io.StringIO):
+    # Records every write() and flush() so the tests can see how the output was chunked
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def titles(stream):
+    return [json.loads(line)["title"] for line in stream.getvalue().splitlines()]
+
+
+def show(records, **kwargs):
+    stream = Stream()
+    shown = render(records, format_jsonl, stream, **kwargs)
+    return shown, titles(stream)
+
+
+def test_offset_and_limit():
+    assert show(BOOKS, offset=2, limit=3) == (3, ["Book 3", "Book 4", "Book 5"])
+    assert show(BOOKS, offset=5, limit=10) == (2, ["Book 6", "Book 7"])  # The limit runs past the end
+    assert show(BOOKS, offset=7) == (0, [])
+    assert show(BOOKS, offset=50, limit=2) == (0, [])
+    assert show(iter(BOOKS), offset=6) == (1, ["Book 7"])  # Any iterator works, not only lists
+
+
+def test_limit_zero_writes_nothing():
+    stream = Stream()
+    assert render(BOOKS, format_book, stream, limit=0) == 0
+    assert stream.writes == [] and stream.getvalue() == ""
+
+
+def test_chunks():
+    stream = Stream()
+    assert render(BOOKS, format_jsonl, stream, chunk_size=3) == 7
+    assert [chunk.count("\n") for chunk in stream.writes] == [3, 3, 1]
+
+
+def test_pages_stop_and_continue():
+    answers = []
+
+    def ask_more(shown):
+        answers.append(shown)
+        return shown < 4
+
+    stream = Stream()
+    assert render(BOOKS, format_jsonl, stream, page_size=2, ask_more=ask_more) == 4
+    assert answers == [2, 4] and titles(stream) == ["Book 1", "Book 2", "Book 3", "Book 4"]
+
+
+@pytest.mark.parametrize("offset, expected_asks, shown", [(0, [3, 6], 7), (1, [3], 6), (4, [], 3)])
+def test_last_partial_page_is_shown_without_asking_again(offset, expected_asks, shown):
+    answers = []
+    stream = Stream()
+    assert render(BOOKS, format_jsonl, stream, offset=offset, page_size=3,
+                  ask_more=lambda n: answers.append(n) or True) == shown
+    assert answers == expected_asks  # No prompt after the last record, even when it ends a full page
+    assert len(titles(stream)) == shown
+
+
+def test_catalog_slices_agree_with_the_database(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": BOOKS, "reviews": []}))
+    db = SqliteCatalog(str(tmp_path / "data.db"))
+    db.import_json(str(path))
+    catalog = Catalog(BOOKS)
+    for offset, limit in ((0, None), (0, 0), (3, 2), (6, 5), (10, None), (10, 0)):
+        assert show(db.iter_books(offset, limit)) == show(catalog.iter_books(offset, limit))
+    db.close()
@@ -0,0 +1,89 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import math
+import pytest
+from book_catalog import Catalog
+from book_records import Book
+from book_sales import SalesMatrix
+
+
+def book(book_id, year, genres, sales=None):
+    data = {"bookId": book_id, "title": f"Book {book_id}", "aiMetric": "50", "releaseYear": year, "author": "A",
+            "genres": genres, "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100}
+    if sales is not None:
+        data["sales"] = sales
+    return data
+
+
+BOOKS = [
+    book("1", "2020", ["Drama", "Thriller"], [100, 200, 300]),
+    book("2", "2021", ["drama "], [50, "n/a", 70]),  # A figure that isn't a number
+    book("3", "2021", ["Thriller"], "lots"),  # sales isn't a list at all
+    book("4", "N/A", ["Drama"], [1000]),  # No usable release year
+    book("5", "2022", []),  # No sales key
+    book("6", "2019", ["Poetry"], ["40", None, 10]),
+]
+
+
+def matrix():
+    return SalesMatrix(Book.from_dict(data) for data in BOOKS)
+
+
+def test_per_book_figures_skip_bad_cells():
+    sales = matrix()
+    assert (sales.rows, sales.width) == (6, 3)
+    assert list(sales.totals()) == [600, 120, 0, 1000, 0, 50]
+    assert list(sales.counts()) == [3, 2, 0, 1, 0, 2]
+    assert list(sales.row(1)) == [50, 0, 70] and list(sales.column(0)) == [100, 50, 0, 1000, 0, 40]
+    means = sales.means()
+    assert [means[i] for i in (0, 1, 3, 5)] == [200, 60, 1000, 25]
+    assert math.isnan(means[2]) and math.isnan(means[4])
+
+
+def test_growth():
+    sales = matrix()
+    assert sales.growth_rates(0) == [1.0, 0.5]
+    assert sales.growth_rates(1) == [None, None]  # The missing middle year breaks both steps
+    assert sales.growth_rates(2) == []
+    growth = sales.average_growth()
+    assert growth[0] == pytest.approx(3 ** 0.5 - 1)
+    assert growth[1] == pytest.approx(1.4 ** 0.5 - 1)  # First and last figures are real, so the gap is spanned
+    assert growth[5] == pytest.approx(0.25 ** 0.5 - 1)
+    assert all(math.isnan(growth[i]) for i in (2, 3, 4))
+
+
+def test_catalog_rollups():
+    sales = matrix()
+    assert sales.grand_total() == 1770
+    assert sales.mean_per_book() == 1770 / 4  # Books without any figure don't count
+    assert sales.column_totals() == [1190, 200, 380]
+    assert [(b.book_id, total) for b, total in sales.top_sellers(3)] == [("4", 1000), ("1", 600), ("2", 120)]
+
+
+def test_by_genre():
+    by_genre = matrix().by_genre()
+    assert by_genre == {"Drama": 1720, "Thriller": 600, "Poetry": 50}  # "drama " folds into the first spelling
+    assert list(by_genre) == ["Drama", "Thriller", "Poetry"]
+    assert SalesMatrix([Book.from_dict(book("1", "2020", ["Drama", "DRAMA"], [5]))]).by_genre() == {"Drama": 5}
+
+
+def test_by_year():
+    by_year = matrix().by_year()
+    assert by_year == {2019: 40, 2020: 100, 2021: 260, 2022: 300, 2023: 70}  # Book 4 has no year to place its sales
+    assert list(by_year) == sorted(by_year)
+
+
+def test_no_books_and_no_figures():
+    for books in ([], [Book.from_dict(book("1", "2020", ["Drama"], []))]):
+        sales = SalesMatrix(books)
+        assert sales.width == 0 and sales.grand_total() == 0 and sales.mean_per_book() == 0.0
+        assert sales.by_year() == {} and sales.top_sellers(3) == [(b, 0) for b in books]
+
+
+def test_catalog_rebuilds_the_matrix_after_add_book():
+    catalog = Catalog(BOOKS)
+    first = catalog.sales()
+    assert catalog.sales() is first
+    catalog.add_book(book("7", "2023", ["Drama"], [5]))
+    assert catalog.sales() is not first
+    assert catalog.sales().grand_total() == 1775 and catalog.sales().by_genre()["Drama"] == 1725
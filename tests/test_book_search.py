@@ -0,0 +1,94 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from book_catalog import Catalog
+from book_records import Book, Review
+from book_search import BOOK, REVIEW, SearchIndex, tokenize
+
+
+def book(book_id, title, author="Author", genres=()):
+    return {"bookId": book_id, "title": title, "aiMetric": "50", "releaseYear": "2023", "author": author,
+            "genres": list(genres), "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+def review(review_id, book_id, text):
+    return {"reviewId": review_id, "reviewAuthor": "R", "reviewDate": "2024-01-01", "reviewText": text,
+            "bookId": book_id}
+
+
+def ranked(index, query, limit=10):
+    return [(kind, record.book_id if kind == BOOK else record.review_id)
+            for _, kind, record in index.search(query, limit)]
+
+
+def test_tokenize_edge_cases():
+    assert tokenize("AI-generated, Quantum!") == ["ai", "generated", "quantum"]
+    assert tokenize("THE Garden of the gods") == ["garden", "gods"]  # case folded, stopwords dropped
+    assert tokenize("snake_case 2023's") == ["snake", "case", "2023", "s"]
+    assert tokenize("Café Zoë") == ["café", "zoë"]
+    assert tokenize(["Science Fiction", "Thriller"]) == ["science", "fiction", "thriller"]
+    assert tokenize("") == tokenize(None) == tokenize("...!?") == tokenize("the and of") == []
+
+
+def test_ranking_order():
+    index = SearchIndex()
+    for data in (book("1", "Garden Stories"), book("2", "Quiet Garden Garden"), book("3", "Mars", "Garden Smith"),
+                 book("4", "Unrelated")):
+        index.add_book(Book.from_dict(data))
+    index.add_review(Review.from_dict(review("r1", "4", "a garden of roses")))
+    index.add_review(Review.from_dict(review("r2", "4", "roses")))
+    # A repeated title word beats a single one, a title beats an author, an author beats review text
+    assert ranked(index, "garden") == [(BOOK, "2"), (BOOK, "1"), (BOOK, "3"), (REVIEW, "r1")]
+    # The review with both words comes first, and "roses" is in fewer documents than "garden", so one "roses" outranks
+    # one title "garden"
+    assert ranked(index, "garden roses") == [(REVIEW, "r1"), (BOOK, "2"), (REVIEW, "r2"), (BOOK, "1"), (BOOK, "3")]
+    assert ranked(index, "garden", limit=2) == [(BOOK, "2"), (BOOK, "1")]
+    scores = [score for score, _, _ in index.search("garden")]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_ties_go_to_the_older_document():
+    index = SearchIndex()
+    for n in range(1, 6):
+        index.add_book(Book.from_dict(book(str(n), "Same Title")))
+    assert ranked(index, "same title", limit=3) == [(BOOK, "1"), (BOOK, "2"), (BOOK, "3")]
+
+
+def test_empty_and_unknown_queries():
+    index = SearchIndex()
+    assert index.search("garden") == []
+    index.add_book(Book.from_dict(book("1", "Garden")))
+    assert index.search("") == index.search("   ") == index.search("!!") == index.search("the") == []
+    assert index.search("nowhere") == []
+    assert ranked(index, "GARDEN, nowhere") == [(BOOK, "1")]  # One known word is enough
+
+
+def test_catalog_index_stays_current_after_adds():
+    catalog = Catalog([book("1", "Old Garden")], [review("r1", "1", "lovely"), review("r3", "9", "lovely, nobody's")])
+    assert not catalog.search_ready
+    assert [(b.book_id, r) for b, r in catalog.search("garden")] == [("1", None)]
+    assert catalog.search_ready  # built once on the first search
+
+    catalog.add_book(book("2", "New Garden Garden"))
+    catalog.add_review(review("r2", "2", "lovely garden"))
+    assert [b.book_id for b, r in catalog.search("garden") if r is None] == ["2", "1"]
+    assert [(b and b.book_id, r.review_id) for b, r in catalog.search("lovely")] == \
+        [("1", "r1"), ("2", "r2"), (None, "r3")]
+
+
+@pytest.mark.parametrize("query", ["garden", "lovely garden", "new"])
+def test_incremental_index_matches_a_rebuilt_one(query):
+    books = [book(str(n), f"Garden {n}" if n % 2 else f"New {n}") for n in range(1, 20)]
+    reviews = [review(f"r{n}", str(n), "lovely garden" if n % 3 else "new") for n in range(1, 20)]
+    catalog = Catalog(books[:5], reviews[:5])
+    catalog.search("garden")
+    for data in books[5:]:
+        catalog.add_book(data)
+    for data in reviews[5:]:
+        catalog.add_review(data)
+    fresh = Catalog(books, reviews)
+
+    def rows(c):
+        return [(b and b.book_id, r and r.review_id) for b, r in c.search(query, limit=50)]
+
+    assert rows(catalog) == rows(fresh)
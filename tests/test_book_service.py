@@ -0,0 +1,173 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import contextlib
+import json
+import signal
+import pytest
+import book_assgt as app
+import book_service
+from book_journal import AppendLog, log_path_for
+from book_service import ReviewService
+
+BOOK = {"bookId": "1", "title": "First", "aiMetric": "10", "releaseYear": "2023", "author": "A", "genres": [],
+        "publisher": {"publisherName": "P", "location": "UK"}, "pages": 100, "sales": []}
+
+
+def review(book_id="1", review_id=None, text="Good"):
+    data = {"reviewAuthor": "R", "reviewDate": "2024-01-01", "reviewText": text, "bookId": book_id}
+    if review_id is not None:
+        data["reviewId"] = review_id
+    return data
+
+
+@pytest.fixture
+def data_file(tmp_path, capsys, monkeypatch):
+    # The service works on book_assgt's global catalog; load_data() replaces whatever an earlier test left in it
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": [BOOK], "reviews": [review(review_id="1")]}))
+    monkeypatch.setattr(app, "change_log", AppendLog(log_path_for(str(path))))  # As book_service.main() does
+    app.load_data(str(path))
+    capsys.readouterr()
+    return str(path)
+
+
+def logged(data_file):
+    return [record for _, record in AppendLog(log_path_for(data_file)).entries()]
+
+
+@contextlib.asynccontextmanager
+async def running(service):
+    # The writer task and a TCP server on a free port, like serve() without the signal handling
+    service._writer = asyncio.create_task(service._write_batches())
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    try:
+        yield server.sockets[0].getsockname()[1]
+    finally:
+        server.close()
+        await server.wait_closed()
+        service._writer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await service._writer
+
+
+async def call(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return await book_service._http(reader, writer, method, path, payload)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def test_a_review_is_logged_before_the_201(data_file):
+    service = ReviewService(data_file, batch_delay=0)
+
+    async def scenario():
+        async with running(service) as port:
+            status, body = await call(port, "POST", "/reviews", review(text="Loved it"))
+            assert status == 201 and body["reviewId"] == "2" and body["reviewText"] == "Loved it"
+            assert logged(data_file) == [body]  # On disk by the time the client hears back
+            status, body = await call(port, "GET", "/books/1/reviews")
+            assert status == 200 and [r["reviewId"] for r in body] == ["1", "2"]
+
+    asyncio.run(scenario())
+    assert (service.accepted, service.rejected, service.batches) == (1, 0, 1)
+
+
+def test_validation_and_rejection(data_file):
+    service = ReviewService(data_file, batch_delay=0)
+
+    async def scenario():
+        async with running(service) as port:
+            assert await call(port, "POST", "/reviews", review(book_id="404")) == \
+                (422, {"error": "unknown bookId 404"})
+            assert await call(port, "POST", "/reviews", review(review_id="1")) == \
+                (422, {"error": "duplicate reviewId 1"})
+            assert (await call(port, "POST", "/reviews", "not a review"))[0] == 422
+            status, body = await call(port, "POST", "/reviews", [review(review_id="x"), review(review_id="x"),
+                                                                   review(book_id="404"), review(), review()])
+            assert status == 200
+            assert [r["reviewId"] for r in body["accepted"]] == ["x", "2", "3"]  # Ids handed out once per batch too
+            assert [r["index"] for r in body["rejected"]] == [1, 2]
+            assert (await call(port, "POST", "/books", BOOK))[0] == 405
+            assert (await call(port, "GET", "/nowhere"))[0] == 404
+            assert (await call(port, "GET", "/books?limit=-1"))[0] == 400
+
+    asyncio.run(scenario())
+    assert service.rejected == 5
+    assert [r["reviewId"] for r in logged(data_file)] == ["x", "2", "3"]
+
+
+def test_concurrent_submissions_share_batches(data_file):
+    service = ReviewService(data_file, batch_size=16, batch_delay=0.01)
+
+    async def scenario():
+        async with running(service) as port:
+            return await asyncio.gather(*(call(port, "POST", "/reviews", review(text=f"r{n}")) for n in range(40)))
+
+    results = asyncio.run(scenario())
+    assert {status for status, _ in results} == {201}
+    ids = [body["reviewId"] for _, body in results]
+    assert len(set(ids)) == 40
+    assert service.accepted == 40 and 3 <= service.batches < 40  # At most 16 per batch, far fewer than 40 commits
+    assert sorted(r["reviewId"] for r in logged(data_file)) == sorted(ids)
+    assert app.catalog.review_total() == 41
+
+
+def test_a_failed_log_write_leaves_the_catalog_alone(data_file, monkeypatch):
+    service = ReviewService(data_file, batch_delay=0)
+
+    def broken(self, entries):
+        raise ValueError("log is broken")
+
+    monkeypatch.setattr(AppendLog, "append_many", broken)
+
+    async def scenario():
+        async with running(service) as port:
+            return await call(port, "POST", "/reviews", review())
+
+    status, body = asyncio.run(scenario())
+    assert status == 500 and "log is broken" in body["error"]
+    assert app.catalog.review_total() == 1 and service.accepted == 0
+
+
+def test_log_os_error_falls_back_to_a_full_save(data_file, monkeypatch, capsys):
+    service = ReviewService(data_file, batch_delay=0)
+
+    def full_disk(self, entries):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(AppendLog, "append_many", full_disk)
+
+    async def scenario():
+        async with running(service) as port:
+            return await call(port, "POST", "/reviews", review())
+
+    assert asyncio.run(scenario())[0] == 201
+    assert [r["reviewId"] for r in json.loads(open(data_file).read())["reviews"]] == ["1", "2"]
+    assert "Saving the full data file instead" in capsys.readouterr().out
+
+
+def test_shutdown_commits_the_batch_the_writer_was_holding(data_file, tmp_path):
+    socket_path = str(tmp_path / "service.sock")
+    service = ReviewService(data_file, batch_delay=30)  # The writer holds the first review until it is cancelled
+
+    async def scenario():
+        serving = asyncio.create_task(service.serve(unix_path=socket_path))
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        posted = asyncio.create_task(book_service._http(reader, writer, "POST", "/reviews", review()))
+        while not service._batch:
+            await asyncio.sleep(0.01)
+        os.kill(os.getpid(), signal.SIGINT)
+        result = await posted  # Answered from _drain, after the writer task has stopped
+        writer.close()
+        await writer.wait_closed()
+        await serving
+        return result
+
+    status, body = asyncio.run(scenario())
+    assert status == 201 and body["reviewId"] == "2"
+    assert [r["reviewId"] for r in json.loads(open(data_file).read())["reviews"]] == ["1", "2"]  # Folded on exit
@@ -0,0 +1,101 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+from book_catalog import Catalog, SEARCH_LIMIT
+from book_records import record_to_json
+from book_sqlite import SqliteCatalog
+
+GENRES = (["Drama"], ["Thriller", "Drama"], ["science fiction "], [], ["Thriller"])
+PUBLISHERS = ({"publisherName": "Bright Future Press", "location": "USA"}, {"publisherName": "Oak", "location": "UK"},
+              {"publisherName": "bright future press ", "location": "usa"})
+AI_METRICS = ("0", "100", "101", "N/A", "42", "99", "", "7")
+
+
+def book(n):
+    return {"bookId": str(n), "title": f"Garden Book {n}", "aiMetric": AI_METRICS[n % len(AI_METRICS)],
+            "releaseYear": str(2019 + n % 4), "author": f"Author {n % 3}", "genres": GENRES[n % len(GENRES)],
+            "publisher": PUBLISHERS[n % len(PUBLISHERS)], "pages": 100 + n,
+            "sales": [1000 * n, 500 * n + 1][:n % 3] + (["n/a"] if n == 5 else [])}
+
+
+def review(n, book_id):
+    return {"reviewId": str(n), "reviewAuthor": "R", "reviewDate": f"2024-0{1 + n % 9}-01", "reviewText": f"note {n}",
+            "bookId": book_id}
+
+
+BOOKS = [book(n) for n in range(1, 15)]
+REVIEWS = [review(1, "3"), review(2, "1"), review(3, "3"), review(4, "99"), review(5, "7"), review(6, "1"),
+           review(7, "3")]
+
+
+@pytest.fixture
+def backends(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"books": BOOKS, "reviews": REVIEWS}))
+    db = SqliteCatalog(str(tmp_path / "data.db"))
+    assert db.import_json(str(path)) == (len(BOOKS), len(REVIEWS))
+    yield db, Catalog(BOOKS, REVIEWS)
+    db.close()
+
+
+def ids(books):
+    return [b.book_id for b in books]
+
+
+def counted(pairs):
+    return [(b.book_id, n) for b, n in pairs]
+
+
+def test_year_and_ai_metric_queries_agree(backends):
+    db, catalog = backends
+    for year in (2019, "2020", "2021", 2022, 1999, "N/A"):
+        assert ids(db.books_by_year(year)) == ids(catalog.books_by_year(year))
+    assert ids(catalog.books_by_year(2020)) == ["1", "5", "9", "13"]
+    for threshold in (0, 1, 42, 100, 101, 102):
+        assert ids(db.books_with_ai_metric_below(threshold)) == ids(catalog.books_with_ai_metric_below(threshold))
+    assert ids(catalog.books_with_ai_metric_below(1)) == ["8"]  # aiMetric 0
+    assert len(catalog.books_with_ai_metric_below(101)) == 8  # 101, "N/A" and "" are all left out of 0-100 thresholds
+    assert len(catalog.books_with_ai_metric_below(102)) == len(BOOKS)
+
+
+def test_review_queries_agree(backends):
+    db, catalog = backends
+    assert counted(db.books_with_reviews()) == counted(catalog.books_with_reviews()) == [("1", 2), ("3", 3), ("7", 1)]
+    for n in (1, 2, 3, 10):
+        assert counted(db.most_reviewed(n)) == counted(catalog.most_reviewed(n))
+    assert [r.review_id for r in db.orphaned_reviews()] == [r.review_id for r in catalog.orphaned_reviews()] == ["4"]
+    for order in ("added", "book", "date"):
+        assert [(r.review_id, title, author) for r, title, author in db.joined_reviews(order)] == \
+            [(r.review_id, title, author) for r, title, author in catalog.joined_reviews(order)]
+
+
+def test_facets_agree(backends):
+    db, catalog = backends
+    for filters in ({"genre": "Drama"}, {"genre": ["drama", "thriller"]}, {"publisher": "BRIGHT FUTURE PRESS"},
+                    {"location": "usa", "year": 2022}, {"genre": "Science Fiction", "location": "UK"}, {}):
+        assert ids(db.books_matching(filters)) == ids(catalog.books_matching(filters))
+    for facet in ("genre", "publisher", "location", "year"):
+        assert db.facet_counts(facet) == catalog.facet_counts(facet)
+        assert db.facet_counts(facet, {"genre": "Thriller"}) == catalog.facet_counts(facet, {"genre": "Thriller"})
+    with pytest.raises(KeyError):
+        db.facet_counts("colour")
+
+
+def test_sales_and_export_agree(backends):
+    db, catalog = backends
+    mine, theirs = db.sales(), catalog.sales()
+    assert mine.grand_total() == theirs.grand_total()
+    assert mine.by_year() == theirs.by_year()
+    assert mine.by_genre() == theirs.by_genre()
+    assert [(b.book_id, total) for b, total in mine.top_sellers(5)] == \
+        [(b.book_id, total) for b, total in theirs.top_sellers(5)]
+    assert json.loads(json.dumps(db.export_data(), default=record_to_json)) == {"books": BOOKS, "reviews": REVIEWS}
+    assert (db.next_book_id(), db.next_review_id()) == (catalog.next_book_id(), catalog.next_review_id()) == ("15", "8")
+
+
+def test_search_default_limit_is_the_same(backends):
+    db, catalog = backends
+    assert len(db.search("garden")) == len(catalog.search("garden")) == SEARCH_LIMIT < len(BOOKS)
+    assert len(db.search("garden", limit=50)) == len(catalog.search("garden", limit=50)) == len(BOOKS)
+    assert db.search("   ") == catalog.search("") == []
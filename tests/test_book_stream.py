@@ -0,0 +1,112 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import io
+import json
+import pytest
+from book_catalog import Catalog
+from book_stream import _JsonStream, iter_events, iter_array_at, stream_load
+
+DATA = {
+    "meta": {"ignored": [1, 2, {"x": "]"}]},
+    "books": [{"bookId": "1", "title": "Ünïcode ☃", "sales": [1, 2]}, {"bookId": "2", "title": "B"}],
+    "reviews": [{"reviewId": "1", "bookId": "1", "reviewText": "say \"hi\", then ]"},
+                {"reviewId": "2", "bookId": "2", "reviewText": "ok"}],
+}
+
+
+def write(tmp_path, data, indent=2):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data, indent=indent, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_iter_events_yields_every_item_in_order(tmp_path):
+    path = write(tmp_path, DATA)
+    events = list(iter_events(path))
+    assert events == [("books", b) for b in DATA["books"]] + [("reviews", r) for r in DATA["reviews"]]
+
+
+def test_compact_file_and_empty_arrays(tmp_path):
+    assert list(iter_events(write(tmp_path, {"books": [], "reviews": []}, indent=None))) == []
+    assert list(iter_events(write(tmp_path, {}, indent=None))) == []
+    path = write(tmp_path, DATA, indent=None)
+    assert len(list(iter_events(path))) == 4
+
+
+def test_values_split_across_chunks():
+    # A 3-character chunk size splits every string, number and object across reads
+    text = json.dumps([{"n": 12345, "s": "a ] b"}, 678, "x"])
+    stream = _JsonStream(io.StringIO(text), chunk_size=3)
+    assert list(stream.array_items()) == json.loads(text)
+
+
+def test_stop_before_reviews_reports_their_offset(tmp_path):
+    path = write(tmp_path, DATA)
+    offsets = []
+    books = list(iter_events(path, stop_before="reviews", on_array=lambda key, offset: offsets.append(offset)))
+    assert [kind for kind, _ in books] == ["books", "books"]
+    assert list(iter_array_at(path, offsets[0])) == DATA["reviews"]  # byte offset is exact despite non-ASCII text
+
+
+def test_reviews_before_books_are_not_deferred(tmp_path):
+    path = write(tmp_path, {"reviews": DATA["reviews"], "books": DATA["books"]})
+    offsets = []
+    events = list(iter_events(path, stop_before="reviews", on_array=lambda key, offset: offsets.append(offset)))
+    assert offsets == [] and len(events) == 4
+
+
+def test_stream_load_lazy_reviews(tmp_path):
+    path = write(tmp_path, DATA)
+    catalog = Catalog()
+    assert stream_load(catalog, path, lazy_reviews=True) == (2, 0)
+    assert not catalog.reviews_loaded
+    assert catalog.book_count() == 2
+    assert catalog.review_total() == 2  # first use reads them
+    assert catalog.reviews_loaded
+    assert [r.review_id for r in catalog.reviews_for("1")] == ["1"]
+
+
+def test_lazy_reviews_survive_the_file_being_rewritten(tmp_path):
+    path = write(tmp_path, DATA)
+    catalog = Catalog()
+    stream_load(catalog, path, lazy_reviews=True)
+    extra = {"reviewId": "3", "bookId": "2", "reviewText": "new"}
+    write(tmp_path, dict(DATA, reviews=DATA["reviews"] + [extra]), indent=4)  # the saved byte offset is now wrong
+    assert [r.review_id for r in catalog.reviews_for("2")] == ["2", "3"]
+
+
+def test_failed_lazy_load_adds_nothing_and_can_be_retried(tmp_path):
+    path = write(tmp_path, DATA)
+    catalog = Catalog()
+    stream_load(catalog, path, lazy_reviews=True)
+    with open(path, "w") as file:
+        file.write('{"books": [], "reviews": [{"reviewId": "1"} {"reviewId": "2"}]}')
+    with pytest.raises(json.JSONDecodeError):
+        catalog.ensure_reviews()
+    assert not catalog.reviews_loaded and catalog.reviews == []
+    write(tmp_path, DATA)
+    assert catalog.review_total() == 2
+
+
+def test_logged_reviews_queued_behind_lazy_ones_are_not_duplicated(tmp_path):
+    path = write(tmp_path, DATA)
+    catalog = Catalog()
+    stream_load(catalog, path, lazy_reviews=True)
+    catalog.merge_reviews([DATA["reviews"][1], {"reviewId": "3", "bookId": "1", "reviewText": "logged"}])
+    catalog.ensure_reviews()
+    assert [r.review_id for r in catalog.reviews] == ["1", "2", "3"]
+
+
+def test_progress_callback(tmp_path, monkeypatch):
+    import book_stream
+    monkeypatch.setattr(book_stream, "PROGRESS_EVERY", 1)
+    seen = []
+    stream_load(Catalog(), write(tmp_path, DATA), progress=lambda kind, count: seen.append((kind, count)))
+    assert seen == [("books", 1), ("books", 2), ("reviews", 1), ("reviews", 2)]
+
+
+def test_malformed_file_raises_decode_error(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('{"books": [{"bookId": "1"} {"bookId": "2"}]}')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_events(str(path)))